@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from core.exceptions import RiskCheckError
+from utils.logger import BotLogger
+
+
+@dataclass(slots=True)
+class BalanceSnapshot:
+    balances: Dict[str, float]
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+
+@dataclass(slots=True)
+class Reservation:
+    client_key: int
+    asset: str
+    amount: float
+    touched_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass(slots=True)
+class _ClientState:
+    client: object
+    snapshot: Optional[BalanceSnapshot] = None
+    stale: bool = False
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    reserve_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class BalanceService:
+    """Cached per-account balances with locally tracked reservations for open orders.
+
+    Balances are refreshed in the background and served from cache while younger than
+    ``ttl_sec``. Capital committed to resting orders is reserved on placement and released
+    on cancel or fill, so concurrent pairs sharing an account see what is actually free.
+    A reservation with no placement or fill for ``reservation_ttl_sec`` is assumed to belong
+    to an order that ended without the bot seeing it (failed cancel, venue-side expiry) and
+    is dropped.
+    """
+
+    def __init__(
+        self,
+        ttl_sec: float = 5.0,
+        refresh_interval_sec: float = 2.0,
+        logger: BotLogger | None = None,
+        reservation_ttl_sec: float = 300.0,
+    ):
+        self.ttl_sec = max(0.0, ttl_sec)
+        self.refresh_interval = max(0.1, refresh_interval_sec)
+        self.reservation_ttl = max(0.0, reservation_ttl_sec)
+        self.logger = logger or BotLogger(__name__)
+        self._clients: Dict[int, _ClientState] = {}
+        self._reservations: Dict[str, Reservation] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.metrics = {"fetches": 0, "cache_hits": 0, "refresh_failures": 0, "expired_reservations": 0}
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def close(self) -> None:
+        task = self._task
+        self._task = None
+        if task:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+    async def get_balances(self, client, max_age: Optional[float] = None) -> Dict[str, float]:
+        """Return the cached balances for ``client``, fetching once if missing, stale or too old."""
+        state = self._state(client)
+        limit = self.ttl_sec if max_age is None else max_age
+        snapshot = state.snapshot
+        if snapshot and not state.stale and snapshot.age <= limit:
+            self.metrics["cache_hits"] += 1
+            return snapshot.balances
+        async with state.lock:
+            # Another caller may have refreshed while we waited for the lock.
+            snapshot = state.snapshot
+            if snapshot and not state.stale and snapshot.age <= limit:
+                self.metrics["cache_hits"] += 1
+                return snapshot.balances
+            return await self._fetch(state)
+
+    def reserved(self, client, asset: str = "USDC") -> float:
+        self._expire_reservations()
+        key = id(client)
+        return sum(r.amount for r in self._reservations.values() if r.client_key == key and r.asset == asset)
+
+    async def available(self, client, asset: str = "USDC") -> float:
+        balances = await self.get_balances(client)
+        return float(balances.get(asset, 0)) - self.reserved(client, asset)
+
+    async def reserve(self, client, key: str, amount: float, asset: str = "USDC") -> float:
+        """Atomically check free balance and reserve ``amount`` under ``key``; returns what was free."""
+        async with self._state(client).reserve_lock:
+            available = await self.available(client, asset)
+            if available < amount:
+                raise RiskCheckError("insufficient balance")
+            self._reservations[key] = Reservation(client_key=id(client), asset=asset, amount=amount)
+            return available
+
+    def rekey(self, old_key: str, new_key: str) -> None:
+        if old_key == new_key:
+            return
+        reservation = self._reservations.pop(old_key, None)
+        if reservation:
+            self._reservations[new_key] = reservation
+
+    def release(self, key: str) -> None:
+        """Drop ``key``'s reservation (order cancelled or rejected); no funds moved."""
+        self._reservations.pop(key, None)
+
+    def consume(self, key: str, amount: float, final: bool = False) -> None:
+        """Release ``amount`` of ``key``'s reservation for a fill, or all of it when ``final``."""
+        reservation = self._reservations.get(key)
+        if not reservation:
+            return
+        if final or amount >= reservation.amount - 1e-12:
+            self._reservations.pop(key, None)
+        else:
+            reservation.amount -= amount
+            reservation.touched_at = time.monotonic()
+        # The fill moved real funds, so the cached balance is out of date until refetched.
+        state = self._clients.get(reservation.client_key)
+        if state:
+            state.stale = True
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "accounts": len(self._clients),
+            "reservations": len(self._reservations),
+            "reserved_total": round(sum(r.amount for r in self._reservations.values()), 6),
+            **self.metrics,
+        }
+
+    def _expire_reservations(self) -> None:
+        if self.reservation_ttl <= 0:
+            return
+        cutoff = time.monotonic() - self.reservation_ttl
+        expired = [key for key, reservation in self._reservations.items() if reservation.touched_at < cutoff]
+        for key in expired:
+            reservation = self._reservations.pop(key)
+            self.metrics["expired_reservations"] += 1
+            self.logger.warn(
+                "balance reservation expired",
+                key=key,
+                asset=reservation.asset,
+                amount=reservation.amount,
+            )
+
+    def _state(self, client) -> _ClientState:
+        key = id(client)
+        state = self._clients.get(key)
+        if state is None:
+            state = _ClientState(client=client)
+            self._clients[key] = state
+        return state
+
+    async def _fetch(self, state: _ClientState) -> Dict[str, float]:
+        balances = await state.client.get_balances()
+        self.metrics["fetches"] += 1
+        state.snapshot = BalanceSnapshot(balances=dict(balances or {}), fetched_at=time.monotonic())
+        state.stale = False
+        return state.snapshot.balances
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            self._expire_reservations()
+            for state in list(self._clients.values()):
+                try:
+                    async with state.lock:
+                        await self._fetch(state)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    self.metrics["refresh_failures"] += 1
+                    self.logger.warn(
+                        "balance refresh failed",
+                        exchange=state.client.__class__.__name__,
+                        error=str(exc),
+                    )
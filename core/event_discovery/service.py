@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import asyncio
 from contextlib import suppress
-from typing import Awaitable, Callable, Iterable, List, Optional
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
 
 import aiohttp
 
@@ -15,6 +15,7 @@ from .polymarket_discovery import PolymarketDiscovery
 from .registry import EventDiscoveryRegistry
 from utils.logger import BotLogger
 from utils.config_loader import EventDiscoveryConfig
+from utils.http_session import SessionFactory
 
 
 Fetcher = Callable[[], Awaitable[List[DiscoveredEvent]]]
@@ -34,6 +35,7 @@ class EventDiscoveryService:
         polymarket_fetcher: Fetcher | None = None,
         opinion_fetcher: Fetcher | None = None,
         proxy: str | None = None,
+        session_factory: SessionFactory | None = None,
     ):
         self.config = config
         self.registry = registry
@@ -46,6 +48,8 @@ class EventDiscoveryService:
         self._polymarket_fetcher = polymarket_fetcher
         self._opinion_fetcher = opinion_fetcher
         self.proxy = proxy
+        self.session_factory = session_factory
+        self._venue_sessions: Dict[str, aiohttp.ClientSession] = {}
 
     async def start(self) -> None:
         if not self.config.enabled:
@@ -63,7 +67,7 @@ class EventDiscoveryService:
             self._task.cancel()
             with suppress(asyncio.CancelledError):  # type: ignore[name-defined]
                 await self._task
-        if self._session:
+        if self._session and not self.session_factory:
             await self._session.close()
 
     async def _run_loop(self) -> None:
@@ -80,7 +84,7 @@ class EventDiscoveryService:
     async def run_once(self) -> None:
         if not self.config.enabled:
             return
-        if not self._session or self._session.closed:
+        if not self.session_factory and (not self._session or self._session.closed):
             self._session = aiohttp.ClientSession()
         polymarket_events = await self._fetch_polymarket()
         opinion_events = await self._fetch_opinion()
@@ -101,17 +105,27 @@ class EventDiscoveryService:
     async def _fetch_polymarket(self) -> List[DiscoveredEvent]:
         if self._polymarket_fetcher:
             return await self._polymarket_fetcher()
-        assert self._session
-        discovery = PolymarketDiscovery(session=self._session, proxy=self.proxy)
+        session = await self._venue_session("Polymarket")
+        discovery = PolymarketDiscovery(session=session, proxy=self.proxy)
         return await discovery.discover()
 
     async def _fetch_opinion(self) -> List[DiscoveredEvent]:
         if self._opinion_fetcher:
             return await self._opinion_fetcher()
-        assert self._session
-        discovery = OpinionDiscovery(session=self._session, api_key=self.opinion_api_key or "", proxy=self.proxy)
+        session = await self._venue_session("Opinion")
+        discovery = OpinionDiscovery(session=session, api_key=self.opinion_api_key or "", proxy=self.proxy)
         return await discovery.discover()
 
+    async def _venue_session(self, venue: str) -> aiohttp.ClientSession:
+        if self.session_factory:
+            session = self._venue_sessions.get(venue)
+            if session is None or session.closed:
+                session = await self.session_factory.session(venue, self.proxy)
+                self._venue_sessions[venue] = session
+            return session
+        assert self._session
+        return self._session
+
 
 __all__ = ["EventDiscoveryService"]
 
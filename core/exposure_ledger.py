@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional
+
+from core.models import OrderSide
+from utils.logger import BotLogger
+
+
+@dataclass(slots=True)
+class OrderExposure:
+    order_id: str
+    event_id: str
+    market_id: str
+    size: Optional[float]
+    filled: float = 0.0
+
+    @property
+    def remaining(self) -> float:
+        if self.size is None:
+            return 0.0
+        return max(0.0, self.size - self.filled)
+
+
+class ExposureLedger:
+    """Single in-memory view of exposure shared by risk checks, positions and order tracking.
+
+    Every method is synchronous and never awaits, so updates are atomic on the event loop
+    without locks, and every query is a dict lookup. Three views are kept in step:
+
+    * ``committed`` per event: size counted against the risk limits (placed minus hedged or cancelled);
+    * ``net_position`` per event: signed filled size;
+    * per order and per market: size, filled and still-resting size.
+
+    ``rebuild`` restores positions and resting orders from the database after a restart,
+    recomputing positions from persisted fills where the flushed position rows lag behind.
+    """
+
+    def __init__(self, logger: BotLogger | None = None):
+        self.logger = logger or BotLogger(__name__)
+        self._orders: Dict[str, OrderExposure] = {}
+        self._committed: Dict[str, float] = {}
+        self._positions: Dict[str, float] = {}
+        self._last_prices: Dict[str, float] = {}
+        self._market_open: Dict[str, float] = {}
+        self._market_filled: Dict[str, float] = {}
+
+    async def rebuild(self, database, market_events: Optional[Mapping[str, str]] = None) -> None:
+        """Load positions and resting orders; orders on unmapped markets are keyed by market id."""
+        market_events = market_events or {}
+        if hasattr(database, "list_positions"):
+            for event_id, net in (await database.list_positions()).items():
+                self._positions[event_id] = net
+        recovered = 0
+        if hasattr(database, "fill_positions_by_market"):
+            # Position rows are flushed periodically and may lag; every fill is persisted, so the
+            # fills table wins for any event it covers. A partial sum would be worse than a stale
+            # row, so the rows are kept when some fills cannot be attributed to a market.
+            by_market = await database.fill_positions_by_market()
+            unresolved = by_market.pop(None, None)
+            if unresolved is not None:
+                self.logger.warn(
+                    "fills without a market; keeping stored positions",
+                    unresolved_net=unresolved,
+                )
+                by_market = {}
+            from_fills: Dict[str, float] = {}
+            for market_id, net in by_market.items():
+                event_id = market_events.get(market_id, market_id)
+                from_fills[event_id] = from_fills.get(event_id, 0.0) + net
+            for event_id, net in from_fills.items():
+                if abs(self._positions.get(event_id, 0.0) - net) > 1e-9:
+                    recovered += 1
+                self._positions[event_id] = net
+        if hasattr(database, "list_open_orders"):
+            for row in await database.list_open_orders():
+                market_id = str(row["market_id"])
+                event_id = market_events.get(market_id, market_id)
+                order_id = str(row["order_ref"])
+                self.track_order(order_id, event_id, market_id, float(row["size"]))
+                self.record_fill(order_id, float(row.get("filled_size") or 0.0))
+                self.commit(event_id, self._orders[order_id].remaining)
+        self.logger.info(
+            "exposure ledger rebuilt",
+            events=len(self._positions),
+            open_orders=len(self._orders),
+            recovered_positions=recovered,
+        )
+
+    # -- risk limits -------------------------------------------------------------------------
+
+    def committed(self, event_id: str) -> float:
+        return self._committed.get(event_id, 0.0)
+
+    def commitments(self) -> Dict[str, float]:
+        """Copy of the committed size per event."""
+        return dict(self._committed)
+
+    def commit(self, event_id: str, size: float) -> float:
+        value = self._committed.get(event_id, 0.0) + size
+        self._committed[event_id] = value
+        return value
+
+    def release(self, event_id: str, size: float) -> float:
+        value = max(0.0, self._committed.get(event_id, 0.0) - size)
+        self._committed[event_id] = value
+        return value
+
+    # -- orders ------------------------------------------------------------------------------
+
+    def track_order(self, order_id: str, event_id: str, market_id: str, size: Optional[float]) -> None:
+        previous = self._orders.get(order_id)
+        if previous:
+            self._adjust_open(previous.market_id, -previous.remaining)
+        order = OrderExposure(order_id=order_id, event_id=event_id, market_id=market_id, size=size)
+        if previous:
+            order.filled = previous.filled
+        self._orders[order_id] = order
+        self._adjust_open(market_id, order.remaining)
+
+    def order(self, order_id: str) -> Optional[OrderExposure]:
+        return self._orders.get(order_id)
+
+    def record_fill(self, order_id: str, size: float, market_id: Optional[str] = None) -> bool:
+        """Apply a fill to the order; returns True once the order is fully filled."""
+        order = self._orders.get(order_id)
+        if order is None:
+            # Fill for an order this process did not place (e.g. before a restart): track progress only.
+            order = OrderExposure(order_id=order_id, event_id=market_id or "", market_id=market_id or "", size=None)
+            self._orders[order_id] = order
+        before = order.remaining
+        order.filled += size
+        if order.size is not None and order.filled >= order.size - 1e-9:
+            order.filled = order.size
+        self._adjust_open(order.market_id, order.remaining - before)
+        if order.market_id:
+            self._market_filled[order.market_id] = self._market_filled.get(order.market_id, 0.0) + size
+        return order.size is not None and order.filled >= order.size
+
+    def remaining(self, order_id: str) -> float:
+        order = self._orders.get(order_id)
+        return order.remaining if order else 0.0
+
+    def close_order(self, order_id: str) -> float:
+        """Stop tracking a cancelled order; returns the size that was still resting."""
+        order = self._orders.pop(order_id, None)
+        if order is None:
+            return 0.0
+        remaining = order.remaining
+        self._adjust_open(order.market_id, -remaining)
+        return remaining
+
+    # -- positions ---------------------------------------------------------------------------
+
+    def apply_fill(self, event_id: str, size: float, price: float, side: OrderSide) -> float:
+        delta = size if side == OrderSide.BUY else -size
+        net = self._positions.get(event_id, 0.0) + delta
+        self._positions[event_id] = net
+        self._last_prices[event_id] = price
+        return net
+
+    def set_position(self, event_id: str, net: float) -> None:
+        self._positions[event_id] = net
+
+    def has_position(self, event_id: str) -> bool:
+        return event_id in self._positions
+
+    def net_position(self, event_id: str) -> float:
+        return self._positions.get(event_id, 0.0)
+
+    def last_price(self, event_id: str) -> Optional[float]:
+        return self._last_prices.get(event_id)
+
+    # -- markets / reporting -----------------------------------------------------------------
+
+    def market_exposure(self, market_id: str) -> Dict[str, float]:
+        return {
+            "open": self._market_open.get(market_id, 0.0),
+            "filled": self._market_filled.get(market_id, 0.0),
+        }
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "events": len(set(self._committed) | set(self._positions)),
+            "open_orders": sum(1 for order in self._orders.values() if order.remaining > 0),
+            "committed_total": round(sum(self._committed.values()), 6),
+            "gross_position": round(sum(abs(net) for net in self._positions.values()), 6),
+            "net_position": round(sum(self._positions.values()), 6),
+            "open_size": round(sum(self._market_open.values()), 6),
+        }
+
+    def _adjust_open(self, market_id: str, delta: float) -> None:
+        if not market_id or not delta:
+            return
+        value = self._market_open.get(market_id, 0.0) + delta
+        if value <= 1e-12:
+            self._market_open.pop(market_id, None)
+        else:
+            self._market_open[market_id] = value
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+from core.models import Fill
+from utils.logger import BotLogger
+
+DEFAULT_WINDOW_SEC = 6 * 3600
+DEFAULT_MAX_ENTRIES = 50_000
+
+FillExists = Callable[[Fill], Awaitable[bool]]
+
+
+class FillDedupeStore:
+    """Remember recently processed fill keys, bounded by age and count.
+
+    Keys live in an LRU ordered by last use and are dropped once their fill is older than
+    ``window_sec`` or the store exceeds ``max_entries``. The newest timestamp ever dropped (or
+    never loaded) is kept as a watermark: a key missing from memory whose fill is at or before
+    the watermark may still have been processed, so ``exists`` (an indexed DB lookup) decides.
+    Anything newer than the watermark is answered from memory alone.
+    """
+
+    def __init__(
+        self,
+        window_sec: float = DEFAULT_WINDOW_SEC,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        exists: Optional[FillExists] = None,
+        logger: BotLogger | None = None,
+    ):
+        self.window_sec = max(1.0, float(window_sec))
+        self.max_entries = max(1, int(max_entries))
+        self.exists = exists
+        self.logger = logger or BotLogger(__name__)
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._watermark = float("-inf")
+        self._lock = asyncio.Lock()
+        self.metrics: Dict[str, int] = {"duplicates": 0, "evicted": 0, "db_checks": 0, "db_hits": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def window_start(self) -> datetime:
+        return datetime.fromtimestamp(time.time() - self.window_sec, tz=timezone.utc)
+
+    def load(self, keys: Iterable[str], since: Optional[datetime] = None) -> None:
+        """Seed the store with keys persisted after ``since``; older ones are left to ``exists``."""
+        # Loaded keys carry no timestamp of their own; age them from now so they cover a full window.
+        loaded_at = time.time()
+        for key in keys:
+            self._entries[key] = loaded_at
+        if since is not None:
+            self._watermark = max(self._watermark, since.timestamp())
+        self._evict()
+
+    async def check_and_add(self, key: str, fill: Fill) -> bool:
+        """Record ``key`` and return True if it is new, False if it was already processed."""
+        fill_ts = fill.timestamp.timestamp() if fill.timestamp else time.time()
+        async with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.metrics["duplicates"] += 1
+                return False
+            if fill_ts <= self._watermark and self.exists is not None:
+                self.metrics["db_checks"] += 1
+                try:
+                    persisted = await self.exists(fill)
+                except Exception as exc:
+                    # Failing open risks a double-hedge; failing closed drops a real fill. The DB is
+                    # the source of truth for aged-out keys, so surface the error and keep the fill.
+                    self.logger.warn("fill dedupe lookup failed", key=key, error=str(exc))
+                    persisted = False
+                if persisted:
+                    self.metrics["db_hits"] += 1
+                    self.metrics["duplicates"] += 1
+                    return False
+            self._entries[key] = fill_ts
+            self._evict()
+            return True
+
+    def discard(self, key: str) -> None:
+        """Forget ``key`` so its fill is processed again when redelivered."""
+        self._entries.pop(key, None)
+
+    def _evict(self) -> None:
+        cutoff = time.time() - self.window_sec
+        entries = self._entries
+        while entries:
+            key, fill_ts = next(iter(entries.items()))
+            if len(entries) <= self.max_entries and fill_ts >= cutoff:
+                break
+            entries.popitem(last=False)
+            self._watermark = max(self._watermark, fill_ts)
+            self.metrics["evicted"] += 1
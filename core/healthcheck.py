@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from core.models import ExchangeName, OrderBook, OrderSide
 from core.spread_analyzer import SpreadAnalyzer
+from exchanges.orderbook_cache import OrderbookCache
 from exchanges.orderbook_manager import OrderbookManager
 from utils.config_loader import FeeConfig, MarketPairConfig
 from utils.logger import BotLogger
@@ -38,6 +40,11 @@ class HealthcheckService:
         clients_by_id: Dict[str, Any],
         fees: Dict[ExchangeName, FeeConfig],
         logger: BotLogger | None = None,
+        leg_timeout: Optional[float] = None,
+        max_concurrency: int = 8,
+        pair_timeout: Optional[float] = None,
+        orderbook_cache: Optional[OrderbookCache] = None,
+        cache_freshness: float = 0.0,
     ):
         self.spread_analyzer = spread_analyzer
         self.orderbook_manager = orderbook_manager
@@ -45,30 +52,56 @@ class HealthcheckService:
         self.clients_by_id = clients_by_id
         self.fees = fees
         self.logger = logger or BotLogger(__name__)
+        self.leg_timeout = leg_timeout
+        self.max_concurrency = max(1, max_concurrency)
+        self.pair_timeout = pair_timeout
+        self.orderbook_cache = orderbook_cache
+        self.cache_freshness = cache_freshness
+        self._client_slots: Dict[int, asyncio.Semaphore] = {}
 
     async def run(self, pairs: List[MarketPairConfig], size: float = 1.0) -> List[HealthcheckResult]:
-        results: List[HealthcheckResult] = []
-        for pair in pairs:
-            try:
-                result = await self._check_pair(pair, size=size)
-            except Exception as exc:  # pragma: no cover - defensive catch
-                self.logger.warn("healthcheck pair failure", pair_id=pair.event_id, error=str(exc))
-                result = HealthcheckResult(
-                    pair_id=pair.event_id,
-                    primary_exchange=pair.primary_exchange or ExchangeName.POLYMARKET,
-                    secondary_exchange=pair.secondary_exchange or ExchangeName.OPINION,
-                    primary_status="FAIL",
-                    secondary_status="FAIL",
-                    primary_top={"bid": None, "ask": None},
-                    secondary_top={"bid": None, "ask": None},
-                    spreads={},
-                    chosen_direction=None,
-                    net_total=None,
-                    error=str(exc),
-                    checked_at=datetime.now(tz=timezone.utc).isoformat(),
-                )
-            results.append(result)
-        return results
+        return [result async for result in self.stream(pairs, size=size)]
+
+    async def stream(self, pairs: List[MarketPairConfig], size: float = 1.0) -> AsyncIterator[HealthcheckResult]:
+        """Check pairs concurrently and yield results in pair order as soon as each is ready."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(pair: MarketPairConfig) -> HealthcheckResult:
+            async with semaphore:
+                return await self._check_pair_safe(pair, size)
+
+        tasks = [asyncio.create_task(bounded(pair)) for pair in pairs]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _check_pair_safe(self, pair: MarketPairConfig, size: float) -> HealthcheckResult:
+        try:
+            if self.pair_timeout:
+                return await asyncio.wait_for(self._check_pair(pair, size=size), self.pair_timeout)
+            return await self._check_pair(pair, size=size)
+        except asyncio.TimeoutError:
+            error = f"healthcheck timed out after {self.pair_timeout}s"
+        except Exception as exc:  # pragma: no cover - defensive catch
+            error = str(exc)
+        self.logger.warn("healthcheck pair failure", pair_id=pair.event_id, error=error)
+        return HealthcheckResult(
+            pair_id=pair.event_id,
+            primary_exchange=pair.primary_exchange or ExchangeName.POLYMARKET,
+            secondary_exchange=pair.secondary_exchange or ExchangeName.OPINION,
+            primary_status="FAIL",
+            secondary_status="FAIL",
+            primary_top={"bid": None, "ask": None},
+            secondary_top={"bid": None, "ask": None},
+            spreads={},
+            chosen_direction=None,
+            net_total=None,
+            error=error,
+            checked_at=datetime.now(tz=timezone.utc).isoformat(),
+        )
 
     async def _check_pair(self, pair: MarketPairConfig, size: float) -> HealthcheckResult:
         primary_exchange = pair.primary_exchange or ExchangeName.POLYMARKET
@@ -76,21 +109,22 @@ class HealthcheckService:
         primary_client = self._resolve_client(primary_exchange, pair.primary_account_id)
         secondary_client = self._resolve_client(secondary_exchange, pair.secondary_account_id)
 
-        primary_ob: Optional[OrderBook] = None
-        secondary_ob: Optional[OrderBook] = None
-        primary_status = "OK"
-        secondary_status = "OK"
-        error: Optional[str] = None
-        try:
-            primary_ob = await primary_client.get_orderbook(pair.primary_market_id)
-        except Exception as exc:
-            primary_status = "FAIL"
-            error = str(exc)
-        try:
-            secondary_ob = await secondary_client.get_orderbook(pair.secondary_market_id)
-        except Exception as exc:
-            secondary_status = "FAIL"
-            error = error or str(exc)
+        snapshot = await self.orderbook_manager.fetch_pair_snapshot(
+            _RateBoundClient(primary_client, self._client_slot(primary_client)),
+            pair.primary_market_id,
+            _RateBoundClient(secondary_client, self._client_slot(secondary_client)),
+            pair.secondary_market_id,
+            timeout=self.leg_timeout,
+            orderbook_cache=self.orderbook_cache,
+            primary_exchange=primary_exchange,
+            secondary_exchange=secondary_exchange,
+            max_age=self.cache_freshness,
+        )
+        primary_ob: Optional[OrderBook] = snapshot.primary.orderbook
+        secondary_ob: Optional[OrderBook] = snapshot.secondary.orderbook
+        primary_status = "FAIL" if snapshot.primary.error else "OK"
+        secondary_status = "FAIL" if snapshot.secondary.error else "OK"
+        error: Optional[str] = snapshot.error
 
         spreads: Dict[str, Dict[str, float]] = {}
         chosen_direction: Optional[str] = None
@@ -140,6 +174,16 @@ class HealthcheckService:
         best_ask = orderbook.asks[0].price if orderbook.asks else None
         return {"bid": best_bid, "ask": best_ask}
 
+    def _client_slot(self, client) -> asyncio.Semaphore:
+        # Keep no more requests in flight per account than its rate limiter's burst, so a wide
+        # fan-out queues here instead of stacking up inside the client's limiter.
+        slot = self._client_slots.get(id(client))
+        if slot is None:
+            limiter = getattr(client, "rate_limit", None)
+            slot = asyncio.Semaphore(max(1, getattr(limiter, "burst", self.max_concurrency)))
+            self._client_slots[id(client)] = slot
+        return slot
+
     def _resolve_client(self, exchange: ExchangeName, preferred_id: Optional[str]):
         if preferred_id and preferred_id in self.clients_by_id:
             return self.clients_by_id[preferred_id]
@@ -191,3 +235,13 @@ class HealthcheckService:
         return spreads
 
 
+class _RateBoundClient:
+    __slots__ = ("client", "slot")
+
+    def __init__(self, client, slot: asyncio.Semaphore):
+        self.client = client
+        self.slot = slot
+
+    async def get_orderbook(self, market_id: str) -> OrderBook:
+        async with self.slot:
+            return await self.client.get_orderbook(market_id)
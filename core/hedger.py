@@ -68,7 +68,8 @@ class Hedger:
         target_size = size * self.config.hedge_ratio
         weight_sum = sum(max(leg.weight, 0) for leg in legs) or len(legs)
         executed = []
-        tx_conn = await self.db.begin_transaction()
+        tx_conn = None
+        tx_open = False
         try:
             for leg in legs:
                 leg_weight = leg.weight if leg.weight > 0 else 1.0
@@ -84,7 +85,6 @@ class Hedger:
                         self.logger.warn("leg skipped", exchange=leg.exchange.value, error=str(exc))
                         continue
                     elif self.strategy == HedgeStrategy.SKIP_IF_TOO_EXPENSIVE:
-                        await self.db.rollback_transaction(tx_conn)
                         await self._handle_failure("hedge skipped due to strategy", {"error": str(exc)})
                         return None
                     else:
@@ -111,7 +111,12 @@ class Hedger:
                 pnl_estimate=pnl_estimate,
                 timestamp=datetime.now(tz=timezone.utc),
             )
+            # Only the trade row is transactional; the exchange calls above must not hold the
+            # shared writer, or concurrent hedges and fill bookkeeping would queue behind them.
+            tx_conn = await self.db.begin_transaction()
+            tx_open = True
             await self.db.save_trade(trade, tx_conn=tx_conn)
+            tx_open = False
             await self.db.commit_transaction(tx_conn)
             await self.notifier.send_message(
                 f"Hedged {total_hedge:.2f} units across {len(executed)} leg(s) at {weighted_price:.4f}. "
@@ -125,7 +130,8 @@ class Hedger:
             )
             return executed
         except Exception as exc:
-            await self.db.rollback_transaction(tx_conn)
+            if tx_open:
+                await self.db.rollback_transaction(tx_conn)
             await self._handle_failure("hedge failed", {"error": str(exc)})
             raise
 
@@ -136,7 +142,8 @@ class Hedger:
         leg_size: float,
         reference_price: float,
     ):
-        orderbook = await request.client.get_orderbook(request.market_id)
+        # Compacted once: the slippage check, any size reduction and the re-estimate share it.
+        orderbook = self.orderbooks.compact(await request.client.get_orderbook(request.market_id))
         target_size = leg_size
         avg_price, slippage = self.orderbooks.estimate_slippage(orderbook, side, target_size)
         max_slippage = self.config.max_slippage_market_hedge
@@ -144,7 +151,7 @@ class Hedger:
             if self.ultra_safe:
                 await self._handle_ultra_safe_skip(request, side, target_size, abs(slippage), max_slippage)
                 raise HedgingError("ultra-safe slippage guard triggered")
-            reduced_size = self._reduce_size(orderbook, side, target_size)
+            reduced_size = self.orderbooks.max_size_within_slippage(orderbook, side, max_slippage, target_size)
             if reduced_size <= 0:
                 raise HedgingError("insufficient liquidity within slippage constraints")
             self.logger.warn(
@@ -181,16 +188,6 @@ class Hedger:
     async def validate_slippage(self, expected_slippage: float, max_slippage: float) -> bool:
         return abs(expected_slippage) <= max_slippage
 
-    def _reduce_size(self, orderbook, side: OrderSide, size: float) -> float:
-        step = size * 0.1
-        current_size = size
-        while current_size > 0:
-            avg, slippage = self.orderbooks.estimate_slippage(orderbook, side, current_size)
-            if abs(slippage) <= self.config.max_slippage_market_hedge:
-                return current_size
-            current_size -= step
-        return 0.0
-
     async def _handle_failure(self, message: str, details: dict) -> None:
         await self.db.record_incident("ERROR", message, details)
         await self.notifier.send_message(f"[Hedge Failure] {message}: {details}")
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import asyncio
+import time
 import uuid
+from collections import deque
 from contextlib import suppress
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Dict, Optional, Tuple
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
 
 from core.exceptions import HedgingError, RiskCheckError
+from core.exposure_ledger import ExposureLedger
+from core.fill_dedupe import FillDedupeStore
 from core.models import (
     DoubleLimitState,
     ExchangeName,
@@ -28,6 +32,10 @@ from utils.config_loader import MarketPairConfig
 CANCEL_RETRY_ATTEMPTS = 3
 CANCEL_BACKOFF_BASE = 0.5
 CANCEL_FAILURE_ALERT_THRESHOLD = 3
+BOOKKEEPING_RETRY_ATTEMPTS = 3
+LATENCY_SAMPLES = 1000
+
+T = TypeVar("T")
 from utils.config_loader import MarketPairConfig
 
 
@@ -48,6 +56,8 @@ class OrderManager:
         mapper: Optional[MarketMapper] = None,
         double_limit_enabled: bool = False,
         cancel_after_ms: Optional[int] = None,
+        latency_first: bool = False,
+        ledger: Optional[ExposureLedger] = None,
     ):
         self.exchanges = exchanges
         self.db = database
@@ -63,26 +73,45 @@ class OrderManager:
         self.event_id = event_id
         self.market_map = market_map or {}
         self.mapper = mapper
-        self._fill_lock = asyncio.Lock()
-        self._processed_fills: set[str] = set()
+        exists = getattr(database, "fill_exists", None)
+        self._processed_fills = FillDedupeStore(
+            exists=(lambda fill: exists(fill.order_id, fill.timestamp)) if exists else None,
+            logger=self.logger,
+        )
+        # Dedupe key -> is_full for fills whose hedge step raised; a redelivery retries only that step.
+        self._hedge_retries: Dict[str, bool] = {}
         self._shutdown = asyncio.Event()
         self._fsms: Dict[str, OrderStateMachine] = {}
-        self._order_sizes: Dict[str, float] = {}
-        self._fill_progress: Dict[str, float] = {}
+        # Order size/fill progress lives in the ledger shared with the risk manager when it has one.
+        self.ledger = ledger or getattr(risk_manager, "ledger", None) or ExposureLedger(self.logger)
         self._order_exchanges: Dict[str, ExchangeName] = {}
         self.log_hooks = LogHooks()
         self._double_limit_locks: Dict[str, asyncio.Lock] = {}
+        # Double limits placed by this manager: order ref -> (record id, counter ref, counter exchange),
+        # and record id -> state, so a fill claims its counter order without a DB round trip.
+        self._double_limit_links: Dict[str, Tuple[str, str, ExchangeName]] = {}
+        self._double_limit_states: Dict[str, DoubleLimitState] = {}
         self._cancel_tasks: Dict[str, asyncio.Task] = {}
         self._cancel_after_ms = cancel_after_ms
         self.cancel_retry_attempts = CANCEL_RETRY_ATTEMPTS
         self._cancel_backoff_base = CANCEL_BACKOFF_BASE
         self._cancel_failure_count = 0
         self._cancel_alert_threshold = CANCEL_FAILURE_ALERT_THRESHOLD
+        # Latency-first: fill rows are written alongside the hedge instead of before it; FSM, position
+        # and sequence bookkeeping is replayed in order off the hot path.
+        self.latency_first = latency_first
+        self._bookkeeping: Optional[asyncio.Queue] = None
+        self._bookkeeping_task: Optional[asyncio.Task] = None
+        self.fill_to_hedge_ms: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
 
     def set_routing(self, primary: ExchangeName, secondary: ExchangeName) -> None:
         self.primary = primary
         self.secondary = secondary
 
+    def owns_order(self, order_id: str) -> bool:
+        """Whether ``order_id`` was placed by this manager."""
+        return order_id in self._order_exchanges
+
     async def place_primary_limit(
         self,
         exchange_name: ExchangeName,
@@ -95,25 +124,35 @@ class OrderManager:
         exchange = self.exchanges[exchange_name]
         async with self._locks[exchange_name]:
             await self.risk_manager.check_limits(self.event_id or market_id, size)
-            await self.risk_manager.check_balance(exchange, price * size)
             client_order_id = client_order_id or str(uuid.uuid4())
-            if self.dry_run:
-                order = self._build_dry_order(
-                    exchange_name, market_id, side, price, size, client_order_id
-                )
+            reserved = hasattr(self.risk_manager, "reserve_balance")
+            if reserved:
+                await self.risk_manager.reserve_balance(exchange, client_order_id, price * size)
             else:
-                order = await exchange.place_limit_order(
-                    market_id=market_id,
-                    side=side,
-                    price=price,
-                    size=size,
-                    client_order_id=client_order_id,
-                )
-            validate_order(order)
-            await self.db.save_order(order)
+                await self.risk_manager.check_balance(exchange, price * size)
+            try:
+                if self.dry_run:
+                    order = self._build_dry_order(
+                        exchange_name, market_id, side, price, size, client_order_id
+                    )
+                else:
+                    order = await exchange.place_limit_order(
+                        market_id=market_id,
+                        side=side,
+                        price=price,
+                        size=size,
+                        client_order_id=client_order_id,
+                    )
+                validate_order(order)
+            except Exception:
+                if reserved:
+                    self.risk_manager.release_balance(client_order_id)
+                raise
             order_key = order.order_id or order.client_order_id
-            self._order_sizes[order_key] = order.size
-            self._fill_progress.setdefault(order_key, 0.0)
+            if reserved:
+                self.risk_manager.rekey_reservation(client_order_id, order_key)
+            await self.db.save_order(order)
+            self.ledger.track_order(order_key, self.event_id or market_id, market_id, order.size)
             self._order_exchanges[order_key] = exchange_name
             fsm = OrderStateMachine(order_key, self.db, logger=self.logger)
             self._fsms[order_key] = fsm
@@ -162,31 +201,30 @@ class OrderManager:
         suffix = uuid.uuid4().hex
         primary_client_id = self._build_client_order_id(self.primary, suffix)
         secondary_client_id = self._build_client_order_id(self.secondary, suffix)
-        primary_order = await self.place_primary_limit(
-            self.primary,
-            primary_market,
-            side_a,
-            price_a,
-            size_a,
-            client_order_id=primary_client_id,
+        started = time.perf_counter()
+        # Both legs go out together; each still runs its own risk and balance checks under its venue lock.
+        primary_result, secondary_result = await asyncio.gather(
+            self._place_timed_leg(self.primary, primary_market, side_a, price_a, size_a, primary_client_id),
+            self._place_timed_leg(self.secondary, secondary_market, side_b, price_b, size_b, secondary_client_id),
+            return_exceptions=True,
         )
-        if primary_order is None:
-            raise RuntimeError("primary exchange did not return order for double limit placement")
-        try:
-            secondary_order = await self.place_primary_limit(
-                self.secondary,
-                secondary_market,
-                side_b,
-                price_b,
-                size_b,
-                client_order_id=secondary_client_id,
-            )
-        except Exception as exc:
-            await self._attempt_cancel(self.primary, primary_order)
-            raise
-        if secondary_order is None:
-            await self._attempt_cancel(self.primary, primary_order)
+        primary_order, primary_acked = _leg_outcome(primary_result)
+        secondary_order, secondary_acked = _leg_outcome(secondary_result)
+        if primary_order is None or secondary_order is None:
+            # Roll back whichever leg made it so we never rest a single unpaired quote.
+            if primary_order is not None:
+                await self._attempt_cancel(self.primary, primary_order)
+            if secondary_order is not None:
+                await self._attempt_cancel(self.secondary, secondary_order)
+            if isinstance(primary_result, BaseException):
+                raise primary_result
+            if isinstance(secondary_result, BaseException):
+                raise secondary_result
+            if primary_order is None:
+                raise RuntimeError("primary exchange did not return order for double limit placement")
             raise RuntimeError("secondary exchange did not return order for double limit placement")
+        placement_skew_ms = abs(primary_acked - secondary_acked) * 1000
+        time_to_quote_ms = (max(primary_acked, secondary_acked) - started) * 1000
 
         record_id = uuid.uuid4().hex
         primary_ref = primary_order.order_id or primary_order.client_order_id
@@ -203,6 +241,13 @@ class OrderManager:
             secondary_client_order_id=secondary_order.client_order_id,
         )
         self._double_limit_locks.setdefault(record_id, asyncio.Lock())
+        self._double_limit_states[record_id] = DoubleLimitState.ACTIVE
+        for ref in (primary_ref, primary_order.client_order_id):
+            if ref:
+                self._double_limit_links[ref] = (record_id, secondary_ref, self.secondary)
+        for ref in (secondary_ref, secondary_order.client_order_id):
+            if ref:
+                self._double_limit_links[ref] = (record_id, primary_ref, self.primary)
         await self._promote_order_to_double_limit(primary_ref)
         await self._promote_order_to_double_limit(secondary_ref)
         await self.log_hooks.emit(
@@ -213,6 +258,8 @@ class OrderManager:
                 "account": account,
                 "primary_order_id": primary_ref,
                 "secondary_order_id": secondary_ref,
+                "placement_skew_ms": placement_skew_ms,
+                "time_to_quote_ms": time_to_quote_ms,
             },
         )
         self.logger.info(
@@ -220,9 +267,30 @@ class OrderManager:
             record_id=record_id,
             account=account,
             pair_key=pair_key,
+            placement_skew_ms=round(placement_skew_ms, 3),
+            time_to_quote_ms=round(time_to_quote_ms, 3),
         )
         return primary_order.client_order_id, secondary_order.client_order_id
 
+    async def _place_timed_leg(
+        self,
+        exchange_name: ExchangeName,
+        market_id: str,
+        side: OrderSide,
+        price: float,
+        size: float,
+        client_order_id: str,
+    ) -> Tuple[Order | None, float]:
+        order = await self.place_primary_limit(
+            exchange_name,
+            market_id,
+            side,
+            price,
+            size,
+            client_order_id=client_order_id,
+        )
+        return order, time.perf_counter()
+
     async def track_fills(self, exchange_name: ExchangeName) -> None:
         raise RuntimeError("track_fills is handled by Reconciler.")
 
@@ -258,11 +326,155 @@ class OrderManager:
             return True
 
     async def handle_fill(self, exchange_name: ExchangeName, fill: Fill) -> Optional[str]:
-        validate_fill(fill)
-        if not await self._mark_fill_processed(fill):
+        results = await self.handle_fills(exchange_name, [fill])
+        return results[0] if results else None
+
+    async def handle_fills(self, exchange_name: ExchangeName, fills: List[Fill]) -> List[Optional[str]]:
+        """Handle a batch (e.g. one poll cycle): fills are persisted in one bulk write, then hedged in order.
+
+        Each fill is hedged on its own. A hedge step that raises is logged, recorded as an incident
+        and kept for retry, the rest of the batch is still hedged, and the first error is re-raised
+        at the end so the caller does not treat the batch as handled. Fills that were never reached
+        are forgotten, so a replay processes them.
+        """
+        received_at = time.perf_counter()
+        accepted: List[Fill] = []
+        retries: List[Fill] = []
+        for fill in fills:
+            validate_fill(fill)
+            if self._dedupe_key(fill) in self._hedge_retries:
+                retries.append(fill)
+            elif await self._mark_fill_processed(fill):
+                accepted.append(fill)
+        if not accepted and not retries:
+            return []
+        pending = retries + accepted
+        if self.latency_first:
+            return await self._alongside_persist(
+                accepted,
+                lambda: self._hedge_each(exchange_name, pending, received_at),
+            )
+        try:
+            await self._persist_fills(accepted)
+        except BaseException:
+            self._forget_fills(accepted)
+            raise
+        return await self._hedge_each(exchange_name, pending, received_at)
+
+    async def _hedge_each(
+        self,
+        exchange_name: ExchangeName,
+        fills: List[Fill],
+        received_at: float,
+    ) -> List[Optional[str]]:
+        results: List[Optional[str]] = []
+        error: Optional[Exception] = None
+        for index, fill in enumerate(fills):
+            try:
+                results.append(await self._process_fill(exchange_name, fill, received_at))
+            except Exception as exc:
+                error = error or exc
+                results.append(None)
+            except BaseException:
+                self._forget_fills(fills[index + 1 :])
+                raise
+        if error is not None:
+            raise error
+        return results
+
+    async def _persist_fills(self, fills: List[Fill]) -> None:
+        if len(fills) > 1 and hasattr(self.db, "save_fills_bulk"):
+            await self.db.save_fills_bulk(fills)
+        else:
+            for fill in fills:
+                await self.db.update_order_fill(fill.order_id, Decimal(str(fill.size)), fill)
+
+    async def _alongside_persist(self, fills: List[Fill], process: Callable[[], Awaitable[T]]) -> T:
+        """Run ``process`` (the hedge path) while the fill rows are written; return once both are done.
+
+        The fill only counts as handled, and the poll cursor only moves past it, once its row is
+        stored. A fill hedged but never stored cannot be replayed without hedging it twice.
+        """
+        persisted = asyncio.create_task(self._persist_fills_with_retry(fills))
+        try:
+            result = await process()
+        except BaseException:
+            await asyncio.gather(persisted, return_exceptions=True)
+            raise
+        await persisted
+        return result
+
+    async def _persist_fills_with_retry(self, fills: List[Fill]) -> None:
+        # Fill writes are idempotent per fill, so a retry after a partial failure cannot double-count.
+        for attempt in range(1, BOOKKEEPING_RETRY_ATTEMPTS + 1):
+            try:
+                await self._persist_fills(fills)
+                return
+            except Exception as exc:
+                if attempt == BOOKKEEPING_RETRY_ATTEMPTS:
+                    await self._record_bookkeeping_failure(
+                        "fill_persist",
+                        exc,
+                        attempt,
+                        order_ids=sorted({fill.order_id for fill in fills}),
+                    )
+                    raise
+                await asyncio.sleep(self._cancel_backoff_base * attempt)
+
+    async def _process_fill(
+        self,
+        exchange_name: ExchangeName,
+        fill: Fill,
+        received_at: Optional[float] = None,
+    ) -> Optional[str]:
+        """Book the fill, then counter-cancel and hedge it.
+
+        In latency-first mode the FSM, position and sequence writes follow via the bookkeeping
+        queue. A fill retried after its hedge step raised skips the bookkeeping it already did.
+        """
+        key = self._dedupe_key(fill)
+        if key in self._hedge_retries:
+            is_full = self._hedge_retries[key]
+        else:
+            is_full = self._advance_fill_progress(fill)
+            self._consume_reservation(fill, is_full)
+            if self.latency_first:
+                self._defer("record_fill", lambda: self._record_fill(exchange_name, fill, is_full))
+            else:
+                await self._record_fill(exchange_name, fill, is_full)
+        try:
+            stage, payload = await self._cancel_and_hedge(exchange_name, fill, received_at)
+        except Exception as exc:
+            self._hedge_retries[key] = is_full
+            await self._record_incident(
+                "hedge_step_failure",
+                "hedge step failed; fill kept for retry",
+                order_id=fill.order_id,
+                exchange=exchange_name.value,
+                error=str(exc),
+            )
+            raise
+        self._hedge_retries.pop(key, None)
+        if self.latency_first:
+            self._defer("sequence_event", lambda: self._record_sequence_event(fill.order_id, stage, payload))
+        else:
+            await self._record_sequence_event(fill.order_id, stage, payload)
+        if stage != "hedge":
             return None
+        if is_full:
+            await self._clear_cancel_task(fill.order_id)
+        return self._fill_key(fill)
+
+    def _advance_fill_progress(self, fill: Fill) -> bool:
+        return self.ledger.record_fill(fill.order_id, fill.size, fill.market_id)
+
+    def _consume_reservation(self, fill: Fill, is_full: bool) -> None:
+        consume = getattr(self.risk_manager, "consume_balance", None)
+        if consume:
+            consume(fill.order_id, fill.size * fill.price, final=is_full)
+
+    async def _record_fill(self, exchange_name: ExchangeName, fill: Fill, is_full: bool) -> None:
         event_id = self.event_id or fill.market_id
-        await self.db.update_order_fill(fill.order_id, Decimal(str(fill.size)), fill)
         fsm = self._get_or_create_fsm(fill.order_id)
         await self.log_hooks.emit(
             "fill_consumed",
@@ -274,11 +486,7 @@ class OrderManager:
                 "price": fill.price,
             },
         )
-        progress = self._fill_progress.get(fill.order_id, 0.0) + fill.size
-        target = self._order_sizes.get(fill.order_id)
-        is_full = target is not None and progress >= target - 1e-9
         event = OrderFSMEvent.FILL_FULL if is_full else OrderFSMEvent.FILL_PARTIAL
-        self._fill_progress[fill.order_id] = target if is_full and target is not None else progress
         await fsm.transition(
             event,
             payload=fill,
@@ -297,14 +505,56 @@ class OrderManager:
             },
         )
 
-        counter_order_id: Optional[str] = None
-        counter_exchange: Optional[ExchangeName] = None
-        double_record_id: Optional[str] = None
-        if self.double_limit_enabled:
-            counter = await self._prepare_double_limit_cancel(exchange_name, fill)
-            if counter:
-                counter_order_id, counter_exchange, double_record_id = counter
+    async def _cancel_and_hedge(
+        self,
+        exchange_name: ExchangeName,
+        fill: Fill,
+        received_at: Optional[float] = None,
+    ) -> Tuple[str, Dict[str, object]]:
+        """Cancel the double-limit counter order and hedge concurrently; return one sequence record.
+
+        The counter order is claimed (double limit moved to TRIGGERED) before either call goes out,
+        so the opposite leg filling at the same time cannot cancel this one back. Both outcomes are
+        recorded even when one side raises; a hedge error is re-raised after its record.
+        """
+        counter = await self._prepare_double_limit_cancel(exchange_name, fill) if self.double_limit_enabled else None
+        cancel_result, hedge_result = await asyncio.gather(
+            self._cancel_counter_order(fill, counter),
+            self._submit_hedge(exchange_name, fill, received_at),
+            return_exceptions=True,
+        )
+        if isinstance(cancel_result, BaseException):
+            error = cancel_result
+            if not isinstance(error, Exception):
+                raise error
+            self.logger.error("counter cancel failed", order_id=fill.order_id, error=str(error))
+            counter_order_id, counter_exchange, double_record_id = counter or (None, None, None)
+            cancel_result = {
+                "attempted": bool(counter_order_id and counter_exchange),
+                "order_id": counter_order_id,
+                "exchange": counter_exchange.value if counter_exchange else None,
+                "double_limit_id": double_record_id,
+                "success": False,
+                "error": str(error),
+            }
+        if isinstance(hedge_result, BaseException):
+            await self._record_sequence_event(
+                fill.order_id,
+                "hedge",
+                {"status": "error", "error": str(hedge_result), "cancel": cancel_result},
+            )
+            raise hedge_result
+        if hedge_result is None:
+            return "cancel_result", cancel_result
+        hedge_result["cancel"] = cancel_result
+        return "hedge", hedge_result
 
+    async def _cancel_counter_order(
+        self,
+        fill: Fill,
+        counter: Optional[Tuple[str, ExchangeName, str]],
+    ) -> Dict[str, object]:
+        counter_order_id, counter_exchange, double_record_id = counter or (None, None, None)
         cancel_summary = {
             "attempted": bool(counter_order_id and counter_exchange),
             "order_id": counter_order_id,
@@ -326,13 +576,20 @@ class OrderManager:
             )
         else:
             cancel_summary["skipped"] = True
-        await self._record_sequence_event(fill.order_id, "cancel_result", cancel_summary)
+        return cancel_summary
 
+    async def _submit_hedge(
+        self,
+        exchange_name: ExchangeName,
+        fill: Fill,
+        received_at: Optional[float] = None,
+    ) -> Optional[Dict[str, object]]:
+        event_id = self.event_id or fill.market_id
         hedge_side = OrderSide.SELL if fill.side == OrderSide.BUY else OrderSide.BUY
         hedge_exchange_name = self.secondary if exchange_name == self.primary else self.primary
         if hedge_exchange_name is None:
             self.logger.warn("hedge exchange not configured")
-            return
+            return None
         hedge_exchange = self.exchanges[hedge_exchange_name]
         hedge_market_id = self._resolve_market_id(exchange_name, hedge_exchange_name, fill.market_id)
         hedge_payload = {
@@ -341,6 +598,18 @@ class OrderManager:
             "size": fill.size,
             "side": hedge_side.value,
         }
+        if received_at is not None:
+            latency_ms = (time.perf_counter() - received_at) * 1000
+            self.fill_to_hedge_ms.append(latency_ms)
+            hedge_payload["fill_to_hedge_ms"] = round(latency_ms, 3)
+            await self.log_hooks.emit(
+                "fill_to_hedge",
+                {
+                    "order_id": fill.order_id,
+                    "fill_to_hedge_ms": latency_ms,
+                    "latency_first": self.latency_first,
+                },
+            )
         try:
             result = await self.hedger.hedge(
                 legs=[
@@ -383,10 +652,79 @@ class OrderManager:
                     "error": str(exc),
                 }
             )
-        await self._record_sequence_event(fill.order_id, "hedge", hedge_payload)
-        if is_full:
-            await self._clear_cancel_task(fill.order_id)
-        return self._fill_key(fill)
+        return hedge_payload
+
+    def latency_snapshot(self) -> Dict[str, object]:
+        """Fill-to-hedge-submission latency over the most recent fills."""
+        samples = sorted(self.fill_to_hedge_ms)
+        if not samples:
+            return {"count": 0, "latency_first": self.latency_first}
+        return {
+            "count": len(samples),
+            "latency_first": self.latency_first,
+            "p50_ms": round(samples[len(samples) // 2], 3),
+            "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 3),
+            "max_ms": round(samples[-1], 3),
+        }
+
+    def _defer(self, name: str, job: Callable[[], Awaitable[None]]) -> None:
+        """Queue bookkeeping to run after the hedge; jobs run one at a time in submission order.
+
+        Only state that can be rebuilt is deferred: positions are recomputed from the fills table
+        on startup, FSM and sequence records are audit trail, and the running process claims double
+        limits from memory, so the TRIGGERED row is only read after a restart.
+        """
+        if self._bookkeeping is None:
+            self._bookkeeping = asyncio.Queue()
+        if self._bookkeeping_task is None or self._bookkeeping_task.done():
+            self._bookkeeping_task = asyncio.create_task(self._bookkeeping_loop())
+        self._bookkeeping.put_nowait((name, job))
+
+    async def _bookkeeping_loop(self) -> None:
+        queue = self._bookkeeping
+        while True:
+            name, job = await queue.get()
+            try:
+                for attempt in range(1, BOOKKEEPING_RETRY_ATTEMPTS + 1):
+                    try:
+                        await job()
+                        break
+                    except Exception as exc:
+                        if attempt == BOOKKEEPING_RETRY_ATTEMPTS:
+                            await self._record_bookkeeping_failure(name, exc, attempt)
+                        else:
+                            await asyncio.sleep(self._cancel_backoff_base * attempt)
+            finally:
+                queue.task_done()
+
+    async def _record_bookkeeping_failure(self, job: str, exc: Exception, attempts: int, **details) -> None:
+        await self._record_incident(
+            "bookkeeping_failure",
+            "deferred bookkeeping failed",
+            job=job,
+            error=str(exc),
+            attempts=attempts,
+            **details,
+        )
+
+    async def _record_incident(self, incident: str, log_message: str, **details) -> None:
+        self.logger.error(log_message, **details)
+        if hasattr(self.db, "record_incident"):
+            try:
+                await self.db.record_incident("ERROR", incident, details)
+            except Exception as incident_exc:
+                self.logger.error("incident not recorded", incident=incident, error=str(incident_exc))
+
+    async def drain_bookkeeping(self) -> None:
+        """Wait until every deferred bookkeeping job has run, then stop the worker."""
+        if self._bookkeeping is not None:
+            await self._bookkeeping.join()
+        task = self._bookkeeping_task
+        self._bookkeeping_task = None
+        if task:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
 
     @staticmethod
     def normalize_fill(exchange_name: ExchangeName, message) -> Fill | None:
@@ -430,14 +768,18 @@ class OrderManager:
         )
 
     async def _mark_fill_processed(self, fill: Fill) -> bool:
-        key = f"{fill.order_id}:{fill.size}:{fill.timestamp.isoformat()}"
-        async with self._fill_lock:
-            if key in self._processed_fills:
-                return False
-            self._processed_fills.add(key)
-            if len(self._processed_fills) > 10000:
-                self._processed_fills.clear()
-            return True
+        return await self._processed_fills.check_and_add(self._dedupe_key(fill), fill)
+
+    def _forget_fills(self, fills: List[Fill]) -> None:
+        """Un-mark fills that were accepted but never reached, so a replay handles them."""
+        for fill in fills:
+            key = self._dedupe_key(fill)
+            if key not in self._hedge_retries:
+                self._processed_fills.discard(key)
+
+    @staticmethod
+    def _dedupe_key(fill: Fill) -> str:
+        return f"{fill.order_id}:{fill.size}:{fill.timestamp.isoformat()}"
 
     def stop(self) -> None:
         self._shutdown.set()
@@ -613,6 +955,46 @@ class OrderManager:
         self,
         exchange_name: ExchangeName,
         fill: Fill,
+    ) -> Optional[Tuple[str, ExchangeName, str]]:
+        """Claim the counter order of a double limit this fill belongs to, if it is still ACTIVE.
+
+        Double limits placed by this manager are claimed from memory: the check and the claim run
+        without an await in between, so the opposite leg cannot claim it too. The TRIGGERED row
+        write follows via the bookkeeping queue in latency-first mode. Unknown orders (e.g. placed
+        before a restart) fall back to the stored row.
+        """
+        link = self._double_limit_links.get(fill.order_id)
+        if link is None:
+            return await self._claim_double_limit_from_db(exchange_name, fill)
+        record_id, counter_order_id, counter_exchange = link
+        if self._double_limit_states.get(record_id) != DoubleLimitState.ACTIVE:
+            return None
+        self._double_limit_states[record_id] = DoubleLimitState.TRIGGERED
+        self.logger.debug(
+            "double limit trigger",
+            record_id=record_id,
+            fill_exchange=exchange_name.value,
+            trigger_order=fill.order_id,
+        )
+
+        async def write_trigger() -> None:
+            await self.db.update_double_limit_state(
+                record_id,
+                DoubleLimitState.TRIGGERED,
+                triggered_order_id=fill.order_id,
+                cancelled_order_id=counter_order_id,
+            )
+
+        if self.latency_first:
+            self._defer("double_limit_trigger", write_trigger)
+        else:
+            await write_trigger()
+        return counter_order_id, counter_exchange, record_id
+
+    async def _claim_double_limit_from_db(
+        self,
+        exchange_name: ExchangeName,
+        fill: Fill,
     ) -> Optional[Tuple[str, ExchangeName, str]]:
         record = await self.db.get_double_limit_by_order(fill.order_id)
         if not record or not record.get("id"):
@@ -792,13 +1174,14 @@ class OrderManager:
 
     async def _after_cancel(self, order_id: str) -> None:
         await self._clear_cancel_task(order_id)
-        remaining = self._remaining_unfilled(order_id)
+        if hasattr(self.risk_manager, "release_balance"):
+            self.risk_manager.release_balance(order_id)
+        remaining = self.ledger.close_order(order_id)
         if remaining > 0 and self.event_id and hasattr(self.risk_manager, "decrement"):
             await self.risk_manager.decrement(self.event_id, remaining)
 
-    def _remaining_unfilled(self, order_id: str) -> float:
-        size = self._order_sizes.get(order_id, 0.0)
-        filled = self._fill_progress.get(order_id, 0.0)
-        remaining = max(0.0, size - filled)
-        return remaining
 
+def _leg_outcome(result) -> Tuple[Order | None, float]:
+    if isinstance(result, BaseException):
+        return None, 0.0
+    return result
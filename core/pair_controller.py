@@ -2,19 +2,24 @@ from __future__ import annotations
 
 import asyncio
 import json
+import time
 from contextlib import suppress
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from core.models import AccountCredentials, ExchangeName
 from core.order_manager import OrderManager
-from core.spread_analyzer import SpreadAnalyzer
+from core.spread_analyzer import PairQuote, ScanOpportunity, SpreadAnalyzer
+from exchanges.orderbook_cache import OrderbookCache
 from exchanges.orderbook_manager import OrderbookManager
 from utils.account_pool import AccountPool
 from utils.config_loader import FeeConfig, MarketPairConfig, Settings
 from utils.google_sheets import SheetPairSpec
 from utils.logger import BotLogger
 
+# Cadence of the polling pair loop and of the controller's batch scan.
+PAIR_TICK_SEC = 1.0
+
 
 @dataclass(slots=True)
 class PairRuntime:
@@ -26,6 +31,9 @@ class PairRuntime:
     source: str
     size_override: Optional[float]
     fingerprint: str
+    book_keys: Tuple[Tuple[ExchangeName, str], ...] = ()
+    streamed: Tuple[str, ...] = ()
+    wake: Optional[asyncio.Event] = None
 
 
 class PairController:
@@ -46,6 +54,8 @@ class PairController:
         notifier,
         account_pools: Dict[ExchangeName, List[AccountCredentials]],
         clients_by_id: Dict[str, object],
+        orderbook_cache: Optional[OrderbookCache] = None,
+        market_feed=None,
     ):
         self.settings = settings
         self.db = db
@@ -60,9 +70,24 @@ class PairController:
         self.notifier = notifier
         self.account_pools = account_pools
         self.clients_by_id = clients_by_id
+        self.orderbook_cache = orderbook_cache
+        self.market_feed = market_feed
         self._pairs: Dict[str, PairRuntime] = {}
         self._lock = asyncio.Lock()
         self._account_rr: Dict[ExchangeName, int] = {}
+        # (exchange, market_id) -> runtimes trading that market, rebuilt whenever the pair set changes.
+        self._routes: Dict[Tuple[ExchangeName, str], List[PairRuntime]] = {}
+        # Last scheduled fill task per order id; a new fill for the order waits on it.
+        self._order_tails: Dict[str, asyncio.Task] = {}
+        self._fill_tasks: Set[asyncio.Task] = set()
+        # With ``batch_scan`` in polling mode, the shared cache is screened for every pair in one
+        # scan per tick and only the pairs worth a full evaluation are woken.
+        self._batch_scan = (
+            bool(orderbook_cache)
+            and settings.market_data.batch_scan
+            and not settings.market_data.event_driven
+        )
+        self._scan_task: Optional[asyncio.Task] = None
 
     def list_order_managers(self) -> Iterable[OrderManager]:
         return (runtime.order_manager for runtime in self._pairs.values())
@@ -93,6 +118,71 @@ class PairController:
             ],
         }
 
+    async def scan_opportunities(self) -> List[ScanOpportunity]:
+        """Rank every running pair by its current net edge, using only fresh cached books."""
+        if not self.orderbook_cache:
+            return []
+        async with self._lock:
+            runtimes = list(self._pairs.values())
+        quotes, _ = self._pair_quotes(runtimes)
+        return self.spread_analyzer.scan(quotes, min_spread=self.settings.market_hedge_mode.min_spread_for_entry)
+
+    async def scan_tick(self) -> List[str]:
+        """Wake the pairs worth a full evaluation; returns their ids, best edge first.
+
+        The scan prices both directions at top of book with maker fees, as the per-pair
+        evaluation does, and depth can only lower the edge, so a pair it drops would not trade.
+        Pairs without fresh cached books are woken too and fall back to their own fetch.
+        """
+        async with self._lock:
+            runtimes = list(self._pairs.values())
+        quotes, unquoted = self._pair_quotes(runtimes)
+        ranked = self.spread_analyzer.scan(quotes, min_spread=self.settings.market_hedge_mode.min_spread_for_entry)
+        by_id = {runtime.pair_id: runtime for runtime in runtimes}
+        woken = [entry.pair_id for entry in ranked] + [runtime.pair_id for runtime in unquoted]
+        for pair_id in woken:
+            wake = by_id[pair_id].wake
+            if wake is not None:
+                wake.set()
+        return woken
+
+    def _pair_quotes(self, runtimes: Iterable[PairRuntime]) -> Tuple[List[PairQuote], List[PairRuntime]]:
+        assert self.orderbook_cache is not None
+        max_age = self.orderbook_cache.stale_after
+        quotes: List[PairQuote] = []
+        unquoted: List[PairRuntime] = []
+        for runtime in runtimes:
+            cfg = runtime.config
+            primary_exchange = cfg.primary_exchange or self.settings.exchanges.primary
+            secondary_exchange = cfg.secondary_exchange or self.settings.exchanges.secondary
+            primary = self.orderbook_cache.get(primary_exchange, cfg.primary_market_id)
+            secondary = self.orderbook_cache.get(secondary_exchange, cfg.secondary_market_id)
+            if not primary or not secondary or primary.age > max_age or secondary.age > max_age:
+                unquoted.append(runtime)
+                continue
+            quotes.append(
+                PairQuote(
+                    pair_id=runtime.pair_id,
+                    primary_bid=_best_price(primary.orderbook.bids),
+                    primary_ask=_best_price(primary.orderbook.asks),
+                    secondary_bid=_best_price(secondary.orderbook.bids),
+                    secondary_ask=_best_price(secondary.orderbook.asks),
+                    size=_pair_size(cfg, self.settings, runtime.size_override),
+                    primary_fee=self.settings.fees.get(primary_exchange, FeeConfig()).maker,
+                    secondary_fee=self.settings.fees.get(secondary_exchange, FeeConfig()).maker,
+                    forced_direction=cfg.strategy_direction,
+                )
+            )
+        return quotes, unquoted
+
+    async def _scan_loop(self) -> None:
+        while not self.stop_event.is_set():
+            try:
+                await self.scan_tick()
+            except Exception as exc:  # pragma: no cover - defensive logging
+                self.logger.warn("pair scan failed", error=str(exc))
+            await asyncio.sleep(PAIR_TICK_SEC)
+
     async def start_pair(
         self,
         pair_cfg: MarketPairConfig,
@@ -113,6 +203,9 @@ class PairController:
                 self.logger.error("failed to start pair", pair_id=pair_id, error=str(exc))
                 return
             self._pairs[pair_id] = runtime
+            self._reindex()
+            if self._batch_scan and self._scan_task is None:
+                self._scan_task = asyncio.create_task(self._scan_loop())
 
     async def _spawn_pair(
         self,
@@ -152,9 +245,32 @@ class PairController:
             mapper=self.mapper,
             double_limit_enabled=self.settings.double_limit_enabled,
             cancel_after_ms=self.settings.market_hedge_mode.cancel_unfilled_after_ms,
+            latency_first=self.settings.market_hedge_mode.latency_first_hedging,
+            ledger=getattr(self.risk_manager, "ledger", None),
         )
         order_manager.set_routing(primary_exchange, secondary_exchange)
+        streamed: Tuple[str, ...] = ()
+        if self.market_feed:
+            streamed = tuple(
+                market_id
+                for exchange, market_id in (
+                    (primary_exchange, pair_cfg.primary_market_id),
+                    (secondary_exchange, pair_cfg.secondary_market_id),
+                )
+                if exchange == ExchangeName.POLYMARKET
+            )
+            await self.market_feed.subscribe(streamed)
+        # Registered only once nothing above can fail, so a failed spawn leaves no refresher behind.
+        book_keys: Tuple[Tuple[ExchangeName, str], ...] = ()
+        if self.orderbook_cache:
+            book_keys = (
+                (primary_exchange, pair_cfg.primary_market_id),
+                (secondary_exchange, pair_cfg.secondary_market_id),
+            )
+            self.orderbook_cache.register(primary_exchange, pair_cfg.primary_market_id, primary_client)
+            self.orderbook_cache.register(secondary_exchange, pair_cfg.secondary_market_id, secondary_client)
         pair_stop_event = asyncio.Event()
+        wake = asyncio.Event() if self._batch_scan else None
         task = asyncio.create_task(
             run_pair_loop(
                 pair_cfg=pair_cfg,
@@ -169,6 +285,8 @@ class PairController:
                 size_override=size_override,
                 fees=self.settings.fees,
                 logger=self.logger,
+                orderbook_cache=self.orderbook_cache,
+                wake=wake,
             )
         )
         return PairRuntime(
@@ -180,6 +298,9 @@ class PairController:
             source=source,
             size_override=size_override,
             fingerprint=fingerprint or _fingerprint(pair_cfg, size_override),
+            book_keys=book_keys,
+            streamed=streamed,
+            wake=wake,
         )
 
     def _resolve_account(self, exchange: ExchangeName, preferred_id: Optional[str]) -> AccountCredentials:
@@ -226,29 +347,126 @@ class PairController:
     async def stop_pair(self, pair_id: str, reason: str | None = None) -> None:
         async with self._lock:
             runtime = self._pairs.pop(pair_id, None)
+            self._reindex()
         if not runtime:
             return
         runtime.stop_event.set()
         with suppress(asyncio.CancelledError):
             await runtime.task
         await runtime.order_manager.cancel_all_open_orders()
+        await runtime.order_manager.drain_bookkeeping()
         runtime.order_manager.stop()
+        if self.market_feed and runtime.streamed:
+            await self.market_feed.unsubscribe(runtime.streamed)
+        if self.orderbook_cache:
+            for exchange, market_id in runtime.book_keys:
+                await self.orderbook_cache.release(exchange, market_id)
         if reason:
             await self._notify(f"Pair {pair_id} stopped: {reason}")
 
     async def shutdown(self) -> None:
         async with self._lock:
             pair_ids = list(self._pairs.keys())
+        await self.drain_fills()
         for pair_id in pair_ids:
             await self.stop_pair(pair_id, reason="shutdown")
+        if self._scan_task:
+            self._scan_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._scan_task
+            self._scan_task = None
 
-    async def dispatch_fill(self, fill) -> None:
-        async with self._lock:
-            runtimes = list(self._pairs.values())
+    async def dispatch_fill(self, fill) -> Optional[asyncio.Task]:
+        """Schedule ``fill`` on its pair and return the task; fills of one order run in arrival order."""
+        runtime = self._route(fill)
+        if runtime is None:
+            return None
+        manager = runtime.order_manager
+        return self._schedule([fill.order_id], lambda: manager.handle_fill(fill.exchange, fill))
+
+    async def dispatch_fills(self, fills) -> List[asyncio.Task]:
+        """Route a batch of fills, handing each order manager its share in one call; returns the tasks."""
+        groups: Dict[Tuple[int, ExchangeName], Tuple[OrderManager, list]] = {}
+        for fill in fills:
+            runtime = self._route(fill)
+            if runtime is None:
+                continue
+            manager = runtime.order_manager
+            groups.setdefault((id(manager), fill.exchange), (manager, []))[1].append(fill)
+        return [
+            self._schedule(
+                [fill.order_id for fill in batch],
+                lambda manager=manager, exchange=exchange, batch=batch: manager.handle_fills(exchange, batch),
+            )
+            for (_, exchange), (manager, batch) in groups.items()
+        ]
+
+    async def drain_fills(self) -> None:
+        """Wait for every scheduled fill to finish handling."""
+        while self._fill_tasks:
+            await asyncio.gather(*list(self._fill_tasks), return_exceptions=True)
+
+    def _schedule(self, order_ids: List[str], work: Callable[[], Awaitable[None]]) -> asyncio.Task:
+        previous = {self._order_tails[order_id] for order_id in order_ids if order_id in self._order_tails}
+        task = asyncio.create_task(self._run_fill_work(previous, work))
+        for order_id in order_ids:
+            self._order_tails[order_id] = task
+        self._fill_tasks.add(task)
+        task.add_done_callback(lambda done, ids=tuple(order_ids): self._fill_done(done, ids))
+        return task
+
+    async def _run_fill_work(self, previous: Set[asyncio.Task], work: Callable[[], Awaitable[None]]) -> None:
+        if previous:
+            await asyncio.gather(*previous, return_exceptions=True)
+        try:
+            await work()
+        except Exception as exc:
+            # Logged here and re-raised so whoever awaits the task (the poller) sees the failure.
+            self.logger.error("fill handling failed", error=str(exc))
+            raise
+
+    def _fill_done(self, task: asyncio.Task, order_ids: Tuple[str, ...]) -> None:
+        self._fill_tasks.discard(task)
+        if not task.cancelled():
+            task.exception()  # retrieved here for websocket fills nobody awaits
+        for order_id in order_ids:
+            if self._order_tails.get(order_id) is task:
+                del self._order_tails[order_id]
+
+    def _route(self, fill) -> Optional[PairRuntime]:
+        """The pair a fill belongs to; a market shared by several pairs goes to the order's owner."""
+        runtimes = self._routes.get((fill.exchange, fill.market_id))
+        if not runtimes:
+            return None
+        if len(runtimes) == 1:
+            return runtimes[0]
         for runtime in runtimes:
-            if fill.market_id in runtime.order_manager.market_map.values():
-                await runtime.order_manager.handle_fill(fill.exchange, fill)
-                break
+            owns_order = getattr(runtime.order_manager, "owns_order", None)
+            if owns_order and owns_order(fill.order_id):
+                return runtime
+        self.logger.warn(
+            "no pair owns fill on shared market; routing to first pair",
+            exchange=fill.exchange.value,
+            market_id=fill.market_id,
+            order_id=fill.order_id,
+            pair_id=runtimes[0].pair_id,
+        )
+        return runtimes[0]
+
+    def _reindex(self) -> None:
+        routes: Dict[Tuple[ExchangeName, str], List[PairRuntime]] = {}
+        for runtime in self._pairs.values():
+            for exchange, market_id in runtime.order_manager.market_map.items():
+                routes.setdefault((exchange, market_id), []).append(runtime)
+        for (exchange, market_id), runtimes in routes.items():
+            if len(runtimes) > 1:
+                self.logger.warn(
+                    "market shared by several pairs; fills routed by order owner",
+                    exchange=exchange.value,
+                    market_id=market_id,
+                    pairs=[runtime.pair_id for runtime in runtimes],
+                )
+        self._routes = routes
 
     async def sync_sheet_pairs(self, specs: Dict[str, SheetPairSpec]) -> None:
         async with self._lock:
@@ -304,36 +522,50 @@ async def run_pair_loop(
     size_override: Optional[float],
     fees: Dict[ExchangeName, FeeConfig],
     logger: BotLogger,
+    orderbook_cache: Optional[OrderbookCache] = None,
+    wake: Optional[asyncio.Event] = None,
 ) -> None:
     min_spread = settings.market_hedge_mode.min_spread_for_entry
-    size_limit = (
-        size_override
-        or pair_cfg.max_position_size_per_market
-        or settings.market_hedge_mode.max_position_size_per_market
-        or 10.0
-    )
-    size = max(0.01, size_limit)
+    size = _pair_size(pair_cfg, settings, size_override)
     primary_exchange = pair_cfg.primary_exchange or settings.exchanges.primary
     secondary_exchange = pair_cfg.secondary_exchange or settings.exchanges.secondary
     primary_fees = fees.get(primary_exchange, FeeConfig())
     secondary_fees = fees.get(secondary_exchange, FeeConfig())
 
+    leg_timeout = settings.market_data.leg_fetch_timeout_sec or None
+    max_leg_skew = settings.market_data.max_leg_skew_ms / 1000 if settings.market_data.max_leg_skew_ms > 0 else None
+    # A book the refresher has not touched for a few intervals is refetched over REST instead.
+    cache_max_age = orderbook_cache.stale_after if orderbook_cache else None
+
     async def evaluate_once():
-        primary_book = await primary_client.get_orderbook(pair_cfg.primary_market_id)
-        secondary_book = await secondary_client.get_orderbook(pair_cfg.secondary_market_id)
-        scenario = await spread_analyzer.evaluate_opportunity(
+        snapshot = await orderbook_manager.fetch_pair_snapshot(
+            primary_client,
+            pair_cfg.primary_market_id,
+            secondary_client,
+            pair_cfg.secondary_market_id,
+            timeout=leg_timeout,
+            orderbook_cache=orderbook_cache,
+            primary_exchange=primary_exchange,
+            secondary_exchange=secondary_exchange,
+            max_age=cache_max_age,
+        )
+        if not snapshot.ok:
+            raise RuntimeError(f"orderbook snapshot incomplete: {snapshot.error}")
+        scenario = await spread_analyzer.evaluate_snapshot(
+            snapshot,
             primary_exchange=primary_exchange,
             secondary_exchange=secondary_exchange,
-            primary_book=primary_book,
-            secondary_book=secondary_book,
             primary_fees=primary_fees,
             secondary_fees=secondary_fees,
             size=size,
             forced_direction=pair_cfg.strategy_direction,
+            max_leg_skew=max_leg_skew,
         )
         if not scenario:
             return
-        min_total = min_spread * size
+        # Depth-aware scenarios carry the size the books can actually absorb at an edge.
+        order_size = scenario.get("size", size)
+        min_total = min_spread * order_size
         if scenario["net_total"] < min_total:
             return
         primary_leg = scenario["legs"].get(primary_exchange)
@@ -345,9 +577,9 @@ async def run_pair_loop(
                 account=pair_cfg.event_id,
                 pair=pair_cfg,
                 price_a=primary_leg["price"],
-                size_a=size,
+                size_a=order_size,
                 price_b=secondary_leg["price"],
-                size_b=size,
+                size_b=order_size,
                 side_a=primary_leg["side"],
                 side_b=secondary_leg["side"],
             )
@@ -357,10 +589,13 @@ async def run_pair_loop(
             pair_cfg.primary_market_id,
             primary_leg["side"],
             primary_leg["price"],
-            size,
+            order_size,
         )
 
-    while not stop_event.is_set() and not pair_stop_event.is_set():
+    def stopped() -> bool:
+        return stop_event.is_set() or pair_stop_event.is_set()
+
+    async def guarded_evaluate() -> None:
         try:
             await evaluate_once()
         except Exception as exc:  # pragma: no cover - defensive logging
@@ -371,7 +606,64 @@ async def run_pair_loop(
                 exc_type=exc.__class__.__name__,
             )
             await asyncio.sleep(5)
-        await asyncio.sleep(1)
+
+    if wake is not None:
+        # Polling with a batch scan: the controller sets ``wake`` when this pair passes the screen.
+        wake.set()
+        while not stopped():
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=PAIR_TICK_SEC)
+            except asyncio.TimeoutError:
+                continue
+            wake.clear()
+            await guarded_evaluate()
+            await asyncio.sleep(PAIR_TICK_SEC)
+        return
+
+    if not (settings.market_data.event_driven and orderbook_cache):
+        while not stopped():
+            await guarded_evaluate()
+            await asyncio.sleep(PAIR_TICK_SEC)
+        return
+
+    # Event-driven: re-evaluate only when either leg's top of book moves, no more often than
+    # min_evaluation_interval_ms. Changes landing during the throttle window fold into one pass.
+    min_gap = max(0.0, settings.market_data.min_evaluation_interval_ms / 1000)
+    keys = (
+        (primary_exchange, pair_cfg.primary_market_id),
+        (secondary_exchange, pair_cfg.secondary_market_id),
+    )
+    book_changed = orderbook_cache.watch(keys)
+    book_changed.set()
+    last_eval = 0.0
+    try:
+        while not stopped():
+            try:
+                await asyncio.wait_for(book_changed.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                continue
+            wait = min_gap - (time.monotonic() - last_eval)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            book_changed.clear()
+            last_eval = time.monotonic()
+            await guarded_evaluate()
+    finally:
+        orderbook_cache.unwatch(keys, book_changed)
+
+
+def _pair_size(pair_cfg: MarketPairConfig, settings: Settings, size_override: Optional[float]) -> float:
+    size_limit = (
+        size_override
+        or pair_cfg.max_position_size_per_market
+        or settings.market_hedge_mode.max_position_size_per_market
+        or 10.0
+    )
+    return max(0.01, size_limit)
+
+
+def _best_price(levels) -> Optional[float]:
+    return levels[0].price if levels else None
 
 
 def _fingerprint(pair_cfg: MarketPairConfig, size_override: Optional[float]) -> str:
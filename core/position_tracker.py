@@ -1,24 +1,60 @@
 from __future__ import annotations
 
-from typing import Dict
+import asyncio
+from contextlib import suppress
+from typing import Dict, Optional
 
+from core.exposure_ledger import ExposureLedger
 from core.models import OrderSide
 from utils.logger import BotLogger
 
 
 class PositionTracker:
-    """Tracks net positions across events."""
+    """Tracks net positions across events.
 
-    def __init__(self, database, logger: BotLogger | None = None):
+    The ledger is authoritative for reads; position rows are written behind it. Fills only
+    mark their event dirty and a background loop flushes each dirty event once per
+    ``flush_interval_sec``, so a burst of partial fills costs one row write. ``close`` stops the
+    loop, lets an in-flight flush finish and flushes what is left. With ``flush_interval_sec <= 0`` every fill is written through immediately.
+    """
+
+    def __init__(
+        self,
+        database,
+        logger: BotLogger | None = None,
+        ledger: Optional[ExposureLedger] = None,
+        flush_interval_sec: float = 0.0,
+    ):
         self.db = database
         self.logger = logger or BotLogger(__name__)
-        self._cache: Dict[str, float] = {}
+        self.ledger = ledger or ExposureLedger(self.logger)
+        self.flush_interval = max(0.0, flush_interval_sec)
+        self._dirty: Dict[str, int] = {}
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+        self.metrics = {"fills": 0, "rows_written": 0, "flushes": 0, "flush_failures": 0}
+
+    def start(self) -> None:
+        if self.flush_interval > 0 and self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        task = self._task
+        self._task = None
+        if task:
+            # Stop the loop rather than cancel it, so a write in flight is not cut off.
+            self._stopping.set()
+            await task
+        await self.flush()
 
     async def add_fill(self, event_id: str, size: float, price: float, side: OrderSide) -> None:
-        delta = size if side == OrderSide.BUY else -size
-        net = self._cache.get(event_id, 0.0) + delta
-        self._cache[event_id] = net
-        await self.db.upsert_position(event_id, net, price)
+        net = self.ledger.apply_fill(event_id, size, price, side)
+        self.metrics["fills"] += 1
+        self._dirty[event_id] = self._dirty.get(event_id, 0) + 1
+        if self.flush_interval <= 0:
+            await self.flush()
         self.logger.debug(
             "position updated",
             event_id=event_id,
@@ -26,15 +62,60 @@ class PositionTracker:
             price=price,
         )
 
+    async def flush(self) -> int:
+        """Write the current position of every dirty event; returns the number of rows written."""
+        async with self._flush_lock:
+            if not self._dirty:
+                return 0
+            batch = self._dirty
+            self._dirty = {}
+            rows = [
+                (event_id, self.ledger.net_position(event_id), self.ledger.last_price(event_id))
+                for event_id in batch
+            ]
+            try:
+                if len(rows) > 1 and hasattr(self.db, "upsert_positions_bulk"):
+                    await self.db.upsert_positions_bulk(rows)
+                else:
+                    for row in rows:
+                        await self.db.upsert_position(*row)
+            except BaseException as exc:
+                # Keep the events dirty, also when cancelled mid-write; the ledger already holds
+                # their latest values.
+                for event_id, count in batch.items():
+                    self._dirty[event_id] = self._dirty.get(event_id, 0) + count
+                if not isinstance(exc, Exception):
+                    raise
+                self.metrics["flush_failures"] += 1
+                self.logger.warn("position flush failed", events=len(rows), error=str(exc))
+                return 0
+            self.metrics["flushes"] += 1
+            self.metrics["rows_written"] += len(rows)
+            if self.flush_interval > 0:
+                self.logger.debug(
+                    "positions flushed",
+                    events=len(rows),
+                    fills=sum(batch.values()),
+                )
+            return len(rows)
+
+    def pending(self) -> int:
+        return len(self._dirty)
+
     async def get_net_position(self, event_id: str) -> float:
-        if event_id in self._cache:
-            return self._cache[event_id]
+        if self.ledger.has_position(event_id):
+            return self.ledger.net_position(event_id)
         position = await self.db.get_position(event_id)
         value = position.net_position if position else 0.0
-        self._cache[event_id] = value
+        self.ledger.set_position(event_id, value)
         return value
 
     async def get_unhedged(self, event_id: str) -> float:
         net = await self.get_net_position(event_id)
         return net
 
+    async def _flush_loop(self) -> None:
+        while not self._stopping.is_set():
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.flush_interval)
+            await self.flush()
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+from typing import Optional
+
+from core.balance_service import BalanceService
 from core.exceptions import RiskCheckError
+from core.exposure_ledger import ExposureLedger
 from utils.config_loader import MarketHedgeConfig
 from utils.logger import BotLogger
 
@@ -8,14 +12,28 @@ from utils.logger import BotLogger
 class RiskManager:
     """Performs pre-trade risk validation."""
 
-    def __init__(self, config: MarketHedgeConfig, logger: BotLogger | None = None):
+    def __init__(
+        self,
+        config: MarketHedgeConfig,
+        logger: BotLogger | None = None,
+        balance_service: Optional[BalanceService] = None,
+        ledger: Optional[ExposureLedger] = None,
+    ):
         self.config = config
         self.logger = logger or BotLogger(__name__)
-        self._event_limits: dict[str, float] = {}
+        self.balance_service = balance_service
+        self.ledger = ledger or ExposureLedger(self.logger)
+
+    @property
+    def _event_limits(self) -> dict[str, float]:
+        return self.ledger.commitments()
 
     async def check_balance(self, exchange, required: float, asset: str = "USDC") -> None:
-        balances = await exchange.get_balances()
-        available = float(balances.get(asset, 0))
+        if self.balance_service:
+            available = await self.balance_service.available(exchange, asset)
+        else:
+            balances = await exchange.get_balances()
+            available = float(balances.get(asset, 0))
         if available < required:
             self.logger.warn(
                 "balance check failed",
@@ -26,13 +44,43 @@ class RiskManager:
             )
             raise RiskCheckError("insufficient balance")
 
+    async def reserve_balance(self, exchange, key: str, required: float, asset: str = "USDC") -> None:
+        """Check free balance and hold ``required`` for an order being placed under ``key``."""
+        if not self.balance_service:
+            await self.check_balance(exchange, required, asset)
+            return
+        try:
+            await self.balance_service.reserve(exchange, key, required, asset)
+        except RiskCheckError:
+            self.logger.warn(
+                "balance check failed",
+                required=required,
+                available=await self.balance_service.available(exchange, asset),
+                reserved=self.balance_service.reserved(exchange, asset),
+                asset=asset,
+                exchange=exchange.__class__.__name__,
+            )
+            raise
+
+    def rekey_reservation(self, old_key: str, new_key: str) -> None:
+        if self.balance_service:
+            self.balance_service.rekey(old_key, new_key)
+
+    def release_balance(self, key: str) -> None:
+        if self.balance_service:
+            self.balance_service.release(key)
+
+    def consume_balance(self, key: str, amount: float, final: bool = False) -> None:
+        if self.balance_service:
+            self.balance_service.consume(key, amount, final)
+
     async def check_limits(self, event_id: str, size: float) -> None:
-        current = self._event_limits.get(event_id, 0.0)
+        current = self.ledger.committed(event_id)
         if size > self.config.max_position_size_per_market:
             raise RiskCheckError("size exceeds per-market limit")
         if current + size > self.config.max_position_size_per_event:
             raise RiskCheckError("size exceeds per-event limit")
-        self._event_limits[event_id] = current + size
+        self.ledger.commit(event_id, size)
 
     async def check_slippage(self, slippage: float, max_slippage: float) -> None:
         if slippage > max_slippage:
@@ -41,8 +89,6 @@ class RiskManager:
     async def decrement(self, event_id: str, size: float) -> None:
         if size <= 0:
             return
-        current = self._event_limits.get(event_id, 0.0)
-        new_value = max(0.0, current - size)
-        self._event_limits[event_id] = new_value
+        new_value = self.ledger.release(event_id, size)
         self.logger.debug("exposure decremented", event_id=event_id, size=size, remaining=new_value)
 
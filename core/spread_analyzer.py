@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from core.models import ExchangeName, OrderBook, OrderSide, StrategyDirection
-from exchanges.orderbook_manager import OrderbookManager
+from exchanges.orderbook_manager import OrderbookManager, PairSnapshot
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+PRIMARY_BUY = "primary_buy_secondary_sell"
+SECONDARY_BUY = "secondary_buy_primary_sell"
 
 
 @dataclass(slots=True)
@@ -14,11 +25,39 @@ class FeeQuote:
     taker: float = 0.0
 
 
+@dataclass(slots=True)
+class PairQuote:
+    """Top of book for one pair, the input row of ``SpreadAnalyzer.scan``."""
+
+    pair_id: str
+    primary_bid: Optional[float]
+    primary_ask: Optional[float]
+    secondary_bid: Optional[float]
+    secondary_ask: Optional[float]
+    size: float
+    primary_fee: float = 0.0
+    secondary_fee: float = 0.0
+    forced_direction: Optional[StrategyDirection] = None
+
+
+@dataclass(slots=True)
+class ScanOpportunity:
+    pair_id: str
+    direction: str
+    net_per_unit: float
+    net_total: float
+    buy_price: float
+    sell_price: float
+
+
 class SpreadAnalyzer:
     """Evaluates cross-exchange spreads."""
 
-    def __init__(self):
+    def __init__(self, depth_aware: bool = False, min_size: float = 0.0):
         self.orderbooks = OrderbookManager()
+        self.depth_aware = depth_aware
+        # Depth-aware sizes below this are dust not worth quoting (``min_quote_size``).
+        self.min_size = max(0.0, min_size)
         self.last_sample: Optional[Dict[str, Any]] = None
 
     async def compute_spread(self, primary: OrderBook, secondary: OrderBook) -> float:
@@ -55,7 +94,14 @@ class SpreadAnalyzer:
         secondary_fees: Any,
         size: float,
         forced_direction: Optional[StrategyDirection] = None,
+        depth_aware: Optional[bool] = None,
     ) -> Optional[Dict[str, Any]]:
+        """Pick the better direction for ``size``.
+
+        Top-of-book mode prices both legs at level 0. Depth-aware mode walks both books and
+        returns the size (at most ``size``) that maximises net profit after maker fees, with leg
+        VWAPs and the worst level price needed to fill that size; the scenario then carries ``size``.
+        """
         best_primary_ask = await self.orderbooks.best_ask(primary_book)
         best_primary_bid = await self.orderbooks.best_bid(primary_book)
         best_secondary_ask = await self.orderbooks.best_ask(secondary_book)
@@ -119,6 +165,11 @@ class SpreadAnalyzer:
 
         if forced_direction:
             scenarios = [s for s in scenarios if _matches_direction(s["direction"], forced_direction)]
+        if self.depth_aware if depth_aware is None else depth_aware:
+            books = {primary_exchange: primary_book, secondary_exchange: secondary_book}
+            fees = {primary_exchange: primary_maker_fee, secondary_exchange: secondary_maker_fee}
+            sized = (self._size_by_depth(entry, books, fees, size) for entry in scenarios)
+            scenarios = [entry for entry in sized if entry]
         if not scenarios:
             self.last_sample = {
                 "timestamp": datetime.now(tz=timezone.utc).isoformat(),
@@ -140,6 +191,130 @@ class SpreadAnalyzer:
         }
         return scenario
 
+    def _size_by_depth(
+        self,
+        scenario: Dict[str, Any],
+        books: Dict[ExchangeName, OrderBook],
+        fees: Dict[ExchangeName, float],
+        max_size: float,
+    ) -> Optional[Dict[str, Any]]:
+        buy_exchange = next(ex for ex, leg in scenario["legs"].items() if leg["side"] == OrderSide.BUY)
+        sell_exchange = next(ex for ex, leg in scenario["legs"].items() if leg["side"] == OrderSide.SELL)
+        buy_book, sell_book = books[buy_exchange], books[sell_exchange]
+        buy_fee, sell_fee = fees[buy_exchange], fees[sell_exchange]
+
+        # Merge-walk asks we lift against bids we hit; marginal edge only shrinks, so stop at the
+        # first unprofitable pair of levels.
+        asks, bids = buy_book.asks, sell_book.bids
+        i = j = 0
+        ask_left = asks[0].size if asks else 0.0
+        bid_left = bids[0].size if bids else 0.0
+        filled = 0.0
+        buy_limit = sell_limit = 0.0
+        while i < len(asks) and j < len(bids) and filled < max_size:
+            if bids[j].price * (1.0 - sell_fee) - asks[i].price * (1.0 + buy_fee) <= 0:
+                break
+            step = min(ask_left, bid_left, max_size - filled)
+            buy_limit, sell_limit = asks[i].price, bids[j].price
+            filled += step
+            ask_left -= step
+            bid_left -= step
+            if ask_left <= 0:
+                i += 1
+                ask_left = asks[i].size if i < len(asks) else 0.0
+            if bid_left <= 0:
+                j += 1
+                bid_left = bids[j].size if j < len(bids) else 0.0
+        # A pair limit below the minimum still trades at the pair limit, as top-of-book sizing would.
+        if filled <= 0 or filled < min(self.min_size, max_size) - 1e-12:
+            return None
+
+        buy_vwap, _ = self.orderbooks.estimate_slippage(buy_book, OrderSide.BUY, filled)
+        sell_vwap, _ = self.orderbooks.estimate_slippage(sell_book, OrderSide.SELL, filled)
+        net_per, net_total = self.compute_net_spread(
+            buy_price=buy_vwap,
+            sell_price=sell_vwap,
+            size=filled,
+            buy_fee=buy_fee,
+            sell_fee=sell_fee,
+        )
+        return {
+            "direction": scenario["direction"],
+            "net_per_unit": net_per,
+            "net_total": net_total,
+            "size": filled,
+            "legs": {
+                buy_exchange: {
+                    "side": OrderSide.BUY,
+                    "price": buy_limit,
+                    "vwap": buy_vwap,
+                },
+                sell_exchange: {
+                    "side": OrderSide.SELL,
+                    "price": sell_limit,
+                    "vwap": sell_vwap,
+                },
+            },
+        }
+
+    async def evaluate_snapshot(
+        self,
+        snapshot: PairSnapshot,
+        primary_exchange: ExchangeName,
+        secondary_exchange: ExchangeName,
+        primary_fees: Any,
+        secondary_fees: Any,
+        size: float,
+        forced_direction: Optional[StrategyDirection] = None,
+        max_leg_skew: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Like ``evaluate_opportunity`` but rejects incomplete snapshots or legs too far apart in time."""
+        if not snapshot.ok:
+            return None
+        skew = snapshot.skew
+        if max_leg_skew is not None and skew is not None and skew > max_leg_skew:
+            self.last_sample = {
+                "timestamp": datetime.now(tz=timezone.utc).isoformat(),
+                "scenario": None,
+                "rejected": "leg_skew",
+                "leg_skew_ms": round(skew * 1000, 1),
+            }
+            return None
+        return await self.evaluate_opportunity(
+            primary_exchange=primary_exchange,
+            secondary_exchange=secondary_exchange,
+            primary_book=snapshot.primary.orderbook,
+            secondary_book=snapshot.secondary.orderbook,
+            primary_fees=primary_fees,
+            secondary_fees=secondary_fees,
+            size=size,
+            forced_direction=forced_direction,
+        )
+
+    def scan(self, quotes: Sequence[PairQuote], min_spread: float = 0.0) -> List[ScanOpportunity]:
+        """Evaluate both directions for every pair at once and rank the actionable ones.
+
+        Uses the same maker-fee net spread as ``evaluate_opportunity``; pairs whose best
+        ``net_per_unit`` is below ``min_spread`` are dropped. Vectorised when NumPy is installed.
+        """
+        if not quotes:
+            return []
+        rows = _scan_numpy(quotes) if NUMPY_AVAILABLE else _scan_python(quotes)
+        opportunities = [
+            ScanOpportunity(
+                pair_id=quote.pair_id,
+                direction=direction,
+                net_per_unit=net_per,
+                net_total=net_per * quote.size,
+                buy_price=buy,
+                sell_price=sell,
+            )
+            for quote, (direction, net_per, buy, sell) in zip(quotes, rows)
+            if direction is not None and net_per >= min_spread
+        ]
+        opportunities.sort(key=lambda entry: entry.net_total, reverse=True)
+        return opportunities
+
     def _fee_value(self, fees: Any, attr: str) -> float:
         if fees is None:
             return 0.0
@@ -157,3 +332,58 @@ def _matches_direction(direction: str, forced: "StrategyDirection") -> bool:
         return direction == "secondary_buy_primary_sell"
     return True
 
+
+def _direction_allowed(forced: Optional[StrategyDirection], direction: str) -> bool:
+    return not forced or _matches_direction(direction, forced)
+
+
+def _scan_python(quotes: Sequence[PairQuote]) -> List[tuple]:
+    rows = []
+    for quote in quotes:
+        best = (None, -math.inf, 0.0, 0.0)
+        legs = (
+            (PRIMARY_BUY, quote.primary_ask, quote.primary_fee, quote.secondary_bid, quote.secondary_fee),
+            (SECONDARY_BUY, quote.secondary_ask, quote.secondary_fee, quote.primary_bid, quote.primary_fee),
+        )
+        for direction, buy, buy_fee, sell, sell_fee in legs:
+            if buy is None or sell is None or not _direction_allowed(quote.forced_direction, direction):
+                continue
+            net_per = sell * (1.0 - sell_fee) - buy * (1.0 + buy_fee)
+            # strict ">" keeps the first direction on ties, like max() in evaluate_opportunity
+            if net_per > best[1]:
+                best = (direction, net_per, buy, sell)
+        rows.append(best)
+    return rows
+
+
+def _scan_numpy(quotes: Sequence[PairQuote]) -> List[tuple]:
+    def column(attr: str):
+        return np.array([_nan_if_none(getattr(quote, attr)) for quote in quotes], dtype=float)
+
+    primary_bid, primary_ask = column("primary_bid"), column("primary_ask")
+    secondary_bid, secondary_ask = column("secondary_bid"), column("secondary_ask")
+    primary_fee, secondary_fee = column("primary_fee"), column("secondary_fee")
+    allow_a = np.array([_direction_allowed(q.forced_direction, PRIMARY_BUY) for q in quotes], dtype=bool)
+    allow_b = np.array([_direction_allowed(q.forced_direction, SECONDARY_BUY) for q in quotes], dtype=bool)
+
+    net_a = secondary_bid * (1.0 - secondary_fee) - primary_ask * (1.0 + primary_fee)
+    net_b = primary_bid * (1.0 - primary_fee) - secondary_ask * (1.0 + secondary_fee)
+    net_a = np.where(allow_a & ~np.isnan(net_a), net_a, -np.inf)
+    net_b = np.where(allow_b & ~np.isnan(net_b), net_b, -np.inf)
+    pick_a = net_a >= net_b
+    best = np.where(pick_a, net_a, net_b)
+    buy = np.where(pick_a, primary_ask, secondary_ask)
+    sell = np.where(pick_a, secondary_bid, primary_bid)
+
+    rows = []
+    for idx in range(len(quotes)):
+        if not np.isfinite(best[idx]):
+            rows.append((None, -math.inf, 0.0, 0.0))
+            continue
+        direction = PRIMARY_BUY if pick_a[idx] else SECONDARY_BUY
+        rows.append((direction, float(best[idx]), float(buy[idx]), float(sell[idx])))
+    return rows
+
+
+def _nan_if_none(value: Optional[float]) -> float:
+    return math.nan if value is None else value
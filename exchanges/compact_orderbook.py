@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List, Optional, Tuple, overload
+
+from core.models import OrderBook, OrderBookEntry
+
+
+class CompactBookSide:
+    """One side of a book as parallel price/size arrays with cumulative size and notional.
+
+    Levels are kept in book order (best first). It behaves like a read-only sequence of
+    ``OrderBookEntry`` so code written against ``OrderBook.bids``/``asks`` keeps working, while
+    size-based queries use the prefix sums and a binary search instead of walking the levels.
+    """
+
+    __slots__ = ("prices", "sizes", "cum_size", "cum_notional")
+
+    def __init__(self, levels: Iterable[Tuple[float, float]] = ()):
+        self.prices = array("d")
+        self.sizes = array("d")
+        self.cum_size = array("d")
+        self.cum_notional = array("d")
+        total_size = 0.0
+        total_notional = 0.0
+        for price, size in levels:
+            total_size += size
+            total_notional += price * size
+            self.prices.append(price)
+            self.sizes.append(size)
+            self.cum_size.append(total_size)
+            self.cum_notional.append(total_notional)
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[OrderBookEntry]) -> "CompactBookSide":
+        return cls((entry.price, entry.size) for entry in entries)
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def __bool__(self) -> bool:
+        return len(self.prices) > 0
+
+    @overload
+    def __getitem__(self, index: int) -> OrderBookEntry: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[OrderBookEntry]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [OrderBookEntry(price=p, size=s) for p, s in zip(self.prices[index], self.sizes[index])]
+        return OrderBookEntry(price=self.prices[index], size=self.sizes[index])
+
+    def __iter__(self) -> Iterator[OrderBookEntry]:
+        for price, size in zip(self.prices, self.sizes):
+            yield OrderBookEntry(price=price, size=size)
+
+    def top_price(self) -> Optional[float]:
+        return self.prices[0] if self.prices else None
+
+    def total_size(self) -> float:
+        return self.cum_size[-1] if self.cum_size else 0.0
+
+    def price_for_size(self, size: float) -> Optional[float]:
+        """Price of the level at which cumulative depth first covers ``size``."""
+        index = bisect_left(self.cum_size, size)
+        if index >= len(self.prices):
+            return None
+        return self.prices[index]
+
+    def fill(self, size: float) -> Tuple[float, float]:
+        """Return ``(filled_size, notional)`` for taking ``size`` from the top, capped at depth."""
+        if size <= 0 or not self.prices:
+            return 0.0, 0.0
+        if size >= self.cum_size[-1]:
+            return self.cum_size[-1], self.cum_notional[-1]
+        index = bisect_left(self.cum_size, size)
+        before_size = self.cum_size[index - 1] if index else 0.0
+        before_notional = self.cum_notional[index - 1] if index else 0.0
+        return size, before_notional + (size - before_size) * self.prices[index]
+
+
+@dataclass(slots=True)
+class CompactOrderBook:
+    """Array-backed drop-in for ``OrderBook`` used on hot paths that query depth repeatedly."""
+
+    market_id: str
+    bids: CompactBookSide = field(default_factory=CompactBookSide)
+    asks: CompactBookSide = field(default_factory=CompactBookSide)
+
+    @classmethod
+    def from_orderbook(cls, orderbook: OrderBook) -> "CompactOrderBook":
+        if isinstance(orderbook, CompactOrderBook):
+            return orderbook
+        return cls(
+            market_id=orderbook.market_id,
+            bids=CompactBookSide.from_entries(orderbook.bids),
+            asks=CompactBookSide.from_entries(orderbook.asks),
+        )
+
+    def to_orderbook(self) -> OrderBook:
+        return OrderBook(market_id=self.market_id, bids=list(self.bids), asks=list(self.asks))
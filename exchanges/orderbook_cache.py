@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from core.models import ExchangeName, OrderBook
+from utils.logger import BotLogger
+
+CacheKey = Tuple[ExchangeName, str]
+TopOfBook = Tuple[Optional[float], Optional[float], Optional[float], Optional[float]]
+
+# Refresh intervals an entry may miss (failed or stalled refreshes) before readers refetch it.
+STALE_INTERVALS = 3
+
+
+@dataclass(slots=True)
+class CachedOrderBook:
+    orderbook: OrderBook
+    received_at: float
+    version: int = 0
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.received_at
+
+
+@dataclass(slots=True)
+class _MarketRefresher:
+    client: object
+    refs: int
+    task: Optional[asyncio.Task] = None
+
+
+class OrderbookCache:
+    """Process-wide latest-orderbook store with one refresher per distinct market."""
+
+    def __init__(self, refresh_interval: float = 1.0, logger: BotLogger | None = None):
+        self.refresh_interval = max(0.05, refresh_interval)
+        self.logger = logger or BotLogger(__name__)
+        self._entries: Dict[CacheKey, CachedOrderBook] = {}
+        self._refreshers: Dict[CacheKey, _MarketRefresher] = {}
+        self._inflight: Dict[CacheKey, asyncio.Task] = {}
+        self._watchers: Dict[CacheKey, Set[asyncio.Event]] = {}
+        self._closing = False
+
+    @property
+    def stale_after(self) -> float:
+        return self.refresh_interval * STALE_INTERVALS
+
+    def register(self, exchange: ExchangeName, market_id: str, client) -> None:
+        """Attach a consumer to a market, starting its refresher on first use."""
+        key = (exchange, market_id)
+        refresher = self._refreshers.get(key)
+        if refresher:
+            refresher.refs += 1
+            return
+        refresher = _MarketRefresher(client=client, refs=1)
+        self._refreshers[key] = refresher
+        if not self._closing:
+            refresher.task = asyncio.create_task(self._refresh_loop(key, refresher))
+
+    async def release(self, exchange: ExchangeName, market_id: str) -> None:
+        """Detach a consumer; the refresher stops once no pair reads the market."""
+        key = (exchange, market_id)
+        refresher = self._refreshers.get(key)
+        if not refresher:
+            return
+        refresher.refs -= 1
+        if refresher.refs > 0:
+            return
+        self._refreshers.pop(key, None)
+        self._entries.pop(key, None)
+        await self._stop_refresher(refresher)
+
+    def watch(self, keys: Iterable[CacheKey]) -> asyncio.Event:
+        """Return an event that is set whenever top-of-book changes on any of ``keys``."""
+        event = asyncio.Event()
+        for key in keys:
+            self._watchers.setdefault(key, set()).add(event)
+        return event
+
+    def unwatch(self, keys: Iterable[CacheKey], event: asyncio.Event) -> None:
+        for key in keys:
+            watchers = self._watchers.get(key)
+            if not watchers:
+                continue
+            watchers.discard(event)
+            if not watchers:
+                self._watchers.pop(key, None)
+
+    def get(self, exchange: ExchangeName, market_id: str) -> Optional[CachedOrderBook]:
+        return self._entries.get((exchange, market_id))
+
+    async def get_orderbook(
+        self,
+        exchange: ExchangeName,
+        market_id: str,
+        client=None,
+        max_age: Optional[float] = None,
+    ) -> OrderBook:
+        """Return the cached book, fetching once if missing or older than ``max_age``."""
+        entry = await self.get_entry(exchange, market_id, client=client, max_age=max_age)
+        return entry.orderbook
+
+    async def get_entry(
+        self,
+        exchange: ExchangeName,
+        market_id: str,
+        client=None,
+        max_age: Optional[float] = None,
+    ) -> CachedOrderBook:
+        """Cached entry, fetched once if missing or older than ``max_age``.
+
+        Only registered markets are stored; a read of any other market (e.g. a healthcheck)
+        shares the in-flight fetch but leaves nothing behind to evict.
+        """
+        key = (exchange, market_id)
+        entry = self._entries.get(key)
+        if entry and (max_age is None or entry.age <= max_age):
+            return entry
+        if client is None:
+            refresher = self._refreshers.get(key)
+            client = refresher.client if refresher else None
+        if client is None:
+            raise LookupError(f"no cached orderbook for {exchange.value}:{market_id}")
+        fetch = self._inflight.get(key)
+        if fetch is None:
+            fetch = asyncio.create_task(self._fetch(key, client))
+            self._inflight[key] = fetch
+            fetch.add_done_callback(lambda task, key=key: self._fetch_done(key, task))
+        # A caller timing out must not cancel the fetch other readers are waiting on.
+        return await asyncio.shield(fetch)
+
+    def update(self, exchange: ExchangeName, market_id: str, orderbook: OrderBook) -> CachedOrderBook:
+        key = (exchange, market_id)
+        previous = self._entries.get(key)
+        entry = CachedOrderBook(
+            orderbook=orderbook,
+            received_at=time.monotonic(),
+            version=(previous.version + 1) if previous else 1,
+        )
+        self._entries[key] = entry
+        if previous is None or _top_of_book(previous.orderbook) != _top_of_book(orderbook):
+            for event in self._watchers.get(key, ()):
+                event.set()
+        return entry
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "markets": len(self._entries),
+            "refreshers": len(self._refreshers),
+            "ages": {
+                f"{exchange.value}:{market_id}": round(entry.age, 3)
+                for (exchange, market_id), entry in self._entries.items()
+            },
+        }
+
+    async def close(self) -> None:
+        self._closing = True
+        refreshers = list(self._refreshers.values())
+        self._refreshers.clear()
+        for refresher in refreshers:
+            await self._stop_refresher(refresher)
+
+    async def _refresh_loop(self, key: CacheKey, refresher: _MarketRefresher) -> None:
+        exchange, market_id = key
+        backoff = self.refresh_interval
+        while not self._closing:
+            try:
+                entry = self._entries.get(key)
+                # Skip the REST round-trip when something else (e.g. a stream) updated the book recently.
+                if entry is None or entry.age >= self.refresh_interval:
+                    await self.get_entry(exchange, market_id, client=refresher.client, max_age=self.refresh_interval)
+                backoff = self.refresh_interval
+                await asyncio.sleep(self.refresh_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.logger.warn(
+                    "orderbook refresh failed",
+                    exchange=exchange.value,
+                    market_id=market_id,
+                    error=str(exc),
+                )
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.refresh_interval * 10)
+
+    async def _fetch(self, key: CacheKey, client) -> CachedOrderBook:
+        exchange, market_id = key
+        orderbook = await client.get_orderbook(market_id)
+        if key not in self._refreshers:
+            return CachedOrderBook(orderbook=orderbook, received_at=time.monotonic())
+        return self.update(exchange, market_id, orderbook)
+
+    def _fetch_done(self, key: CacheKey, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every reader gave up waiting
+
+    async def _stop_refresher(self, refresher: _MarketRefresher) -> None:
+        task = refresher.task
+        refresher.task = None
+        if task:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+
+def _top_of_book(orderbook: OrderBook) -> TopOfBook:
+    bid = orderbook.bids[0] if orderbook.bids else None
+    ask = orderbook.asks[0] if orderbook.asks else None
+    return (
+        bid.price if bid else None,
+        bid.size if bid else None,
+        ask.price if ask else None,
+        ask.size if ask else None,
+    )
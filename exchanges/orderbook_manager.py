@@ -1,8 +1,42 @@
 from __future__ import annotations
 
+import asyncio
+import time
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
-from core.models import OrderBook, OrderBookEntry, OrderSide
+from core.models import ExchangeName, OrderBook, OrderBookEntry, OrderSide
+from exchanges.compact_orderbook import CompactBookSide, CompactOrderBook
+from exchanges.orderbook_cache import CachedOrderBook, OrderbookCache
+
+
+@dataclass(slots=True)
+class LegSnapshot:
+    market_id: str
+    orderbook: Optional[OrderBook] = None
+    received_at: Optional[float] = None  # time.monotonic() when the book was received
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class PairSnapshot:
+    primary: LegSnapshot
+    secondary: LegSnapshot
+
+    @property
+    def ok(self) -> bool:
+        return self.primary.orderbook is not None and self.secondary.orderbook is not None
+
+    @property
+    def error(self) -> Optional[str]:
+        return self.primary.error or self.secondary.error
+
+    @property
+    def skew(self) -> Optional[float]:
+        """Seconds between the two legs' receive times."""
+        if self.primary.received_at is None or self.secondary.received_at is None:
+            return None
+        return abs(self.primary.received_at - self.secondary.received_at)
 
 
 class OrderbookManager:
@@ -17,6 +51,53 @@ class OrderbookManager:
     async def combined(self, ob_a: OrderBook, ob_b: OrderBook) -> Dict[str, OrderBook]:
         return {"primary": ob_a, "secondary": ob_b}
 
+    async def fetch_pair_snapshot(
+        self,
+        primary_client,
+        primary_market_id: str,
+        secondary_client,
+        secondary_market_id: str,
+        timeout: Optional[float] = None,
+        orderbook_cache: Optional[OrderbookCache] = None,
+        primary_exchange: Optional[ExchangeName] = None,
+        secondary_exchange: Optional[ExchangeName] = None,
+        max_age: Optional[float] = None,
+    ) -> PairSnapshot:
+        """Fetch both legs concurrently; a failing or slow leg is reported, not raised.
+
+        With ``orderbook_cache`` a cached book is reused unless it is older than ``max_age``.
+        """
+        primary, secondary = await asyncio.gather(
+            self._fetch_leg(primary_client, primary_market_id, timeout, orderbook_cache, primary_exchange, max_age),
+            self._fetch_leg(
+                secondary_client, secondary_market_id, timeout, orderbook_cache, secondary_exchange, max_age
+            ),
+        )
+        return PairSnapshot(primary=primary, secondary=secondary)
+
+    async def _fetch_leg(
+        self,
+        client,
+        market_id: str,
+        timeout: Optional[float],
+        orderbook_cache: Optional[OrderbookCache],
+        exchange: Optional[ExchangeName],
+        max_age: Optional[float] = None,
+    ) -> LegSnapshot:
+        if orderbook_cache is not None and exchange is not None:
+            fetch = orderbook_cache.get_entry(exchange, market_id, client, max_age=max_age)
+        else:
+            fetch = client.get_orderbook(market_id)
+        try:
+            result = await asyncio.wait_for(fetch, timeout) if timeout else await fetch
+        except asyncio.TimeoutError:
+            return LegSnapshot(market_id=market_id, error=f"orderbook fetch timed out after {timeout}s")
+        except Exception as exc:
+            return LegSnapshot(market_id=market_id, error=str(exc))
+        if isinstance(result, CachedOrderBook):
+            return LegSnapshot(market_id=market_id, orderbook=result.orderbook, received_at=result.received_at)
+        return LegSnapshot(market_id=market_id, orderbook=result, received_at=time.monotonic())
+
     def build(
         self,
         market_id: str,
@@ -41,6 +122,22 @@ class OrderbookManager:
             ],
         )
 
+    def build_compact(
+        self,
+        market_id: str,
+        bids: List[Dict[str, float]],
+        asks: List[Dict[str, float]],
+    ) -> CompactOrderBook:
+        return CompactOrderBook(
+            market_id=market_id,
+            bids=CompactBookSide(_level_tuples(bids)),
+            asks=CompactBookSide(_level_tuples(asks)),
+        )
+
+    def compact(self, orderbook: OrderBook) -> CompactOrderBook:
+        """Convert once before running several size queries against the same book."""
+        return CompactOrderBook.from_orderbook(orderbook)
+
     def parse_orderbook(
         self,
         market_id: str,
@@ -56,6 +153,8 @@ class OrderbookManager:
         size: float,
     ) -> Optional[float]:
         depth = orderbook.asks if side == OrderSide.BUY else orderbook.bids
+        if isinstance(depth, CompactBookSide):
+            return depth.price_for_size(size)
         remaining = size
         for level in depth:
             if level.size >= remaining:
@@ -73,6 +172,15 @@ class OrderbookManager:
         if not depth:
             return 0.0, 0.0
 
+        if isinstance(depth, CompactBookSide):
+            accumulated, filled_value = depth.fill(size)
+            if accumulated == 0:
+                return 0.0, 0.0
+            average_price = filled_value / accumulated
+            top_price = depth.prices[0]
+            slippage = average_price - top_price if side == OrderSide.BUY else top_price - average_price
+            return average_price, slippage
+
         remaining = size
         filled_value = 0.0
         accumulated = 0.0
@@ -92,3 +200,49 @@ class OrderbookManager:
         slippage = average_price - top_price if side == OrderSide.BUY else top_price - average_price
         return average_price, slippage
 
+    def max_size_within_slippage(
+        self,
+        orderbook: OrderBook,
+        side: OrderSide,
+        max_slippage: float,
+        size: Optional[float] = None,
+    ) -> float:
+        """Largest size whose VWAP stays within ``max_slippage`` of the top price.
+
+        Walks the depth once: levels priced inside the limit are taken whole, and the first level
+        outside it is taken only up to the point where the running VWAP reaches the limit.
+        The result is capped at ``size`` (when given) and at the visible depth.
+        """
+        depth = orderbook.asks if side == OrderSide.BUY else orderbook.bids
+        if not depth:
+            return 0.0
+        if isinstance(depth, CompactBookSide):
+            levels = zip(depth.prices, depth.sizes)
+        else:
+            levels = ((level.price, level.size) for level in depth)
+        cap = float("inf") if size is None else size
+        buying = side == OrderSide.BUY
+        top_price = depth[0].price
+        limit = top_price + max_slippage if buying else top_price - max_slippage
+        filled = 0.0
+        notional = 0.0
+        for price, level_size in levels:
+            if filled >= cap:
+                break
+            inside = price <= limit if buying else price >= limit
+            if inside:
+                filled += level_size
+                notional += price * level_size
+                continue
+            # VWAP(filled + x) == limit  =>  x = (limit * filled - notional) / (price - limit)
+            headroom = (limit * filled - notional) / (price - limit)
+            if headroom > 0:
+                # Shave a hair off so float rounding cannot push the VWAP just past the limit.
+                filled += min(level_size, headroom * (1 - 1e-9))
+            break
+        return min(filled, cap)
+
+
+def _level_tuples(levels: List[Dict[str, float]]):
+    for level in levels:
+        yield float(level["price"]), float(level.get("size") or level.get("amount") or 0.0)
@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import aiohttp
+
+from core.models import ExchangeName, OrderBook, OrderBookEntry
+from exchanges.orderbook_cache import OrderbookCache
+from exchanges.websocket_manager import WebSocketManager
+from utils.logger import BotLogger
+
+POLYMARKET_MARKET_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+
+BookListener = Callable[[OrderBook], Awaitable[None] | None]
+
+
+@dataclass(slots=True)
+class _LocalBook:
+    bids: Dict[float, float] = field(default_factory=dict)
+    asks: Dict[float, float] = field(default_factory=dict)
+    last_ts: int = 0
+    synced: bool = False
+
+    def replace(self, bids: Iterable[Dict[str, Any]], asks: Iterable[Dict[str, Any]], ts: int) -> None:
+        self.bids = _levels_to_map(bids)
+        self.asks = _levels_to_map(asks)
+        self.last_ts = ts
+        self.synced = True
+
+    def apply(self, side: str, price: float, size: float) -> bool:
+        if side == "BUY":
+            levels = self.bids
+        elif side == "SELL":
+            levels = self.asks
+        else:
+            return False
+        if size <= 0:
+            levels.pop(price, None)
+        else:
+            levels[price] = size
+        return True
+
+    def best_bid(self) -> Optional[float]:
+        return max(self.bids) if self.bids else None
+
+    def best_ask(self) -> Optional[float]:
+        return min(self.asks) if self.asks else None
+
+    def is_crossed(self) -> bool:
+        bid, ask = self.best_bid(), self.best_ask()
+        return bid is not None and ask is not None and bid >= ask
+
+    def to_orderbook(self, market_id: str) -> OrderBook:
+        return OrderBook(
+            market_id=market_id,
+            bids=[OrderBookEntry(price=p, size=s) for p, s in sorted(self.bids.items(), reverse=True)],
+            asks=[OrderBookEntry(price=p, size=s) for p, s in sorted(self.asks.items())],
+        )
+
+
+class PolymarketMarketFeed:
+    """Keeps local Polymarket books from market-channel snapshots plus price_change deltas.
+
+    Books are published through the shared ``OrderbookCache`` and optional listeners. Whenever a
+    delta cannot be applied safely (no base snapshot, out-of-order timestamp, unknown side, crossed
+    book or a best bid/ask that disagrees with the venue) the asset is resynced from the REST ``/book``.
+    Every book is marked unsynced when the socket drops or reconnects, since deltas may have been
+    missed in between.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        rest_client,
+        orderbook_cache: Optional[OrderbookCache] = None,
+        logger: BotLogger | None = None,
+        proxy: str | None = None,
+        url: str = POLYMARKET_MARKET_WS_URL,
+        database=None,
+    ):
+        self.rest_client = rest_client
+        self.db = database
+        self.orderbook_cache = orderbook_cache
+        self.logger = logger or BotLogger(__name__)
+        self.ws = WebSocketManager(url, session, logger=self.logger, proxy=proxy)
+        self.ws.set_handler(self.handle_message)
+        self.ws.set_connection_handler(self._on_connection)
+        self._books: Dict[str, _LocalBook] = {}
+        self._refs: Dict[str, int] = {}
+        self._listeners: List[BookListener] = []
+        self._resyncs: Dict[str, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._incident_task: Optional[asyncio.Task] = None
+        self.metrics = {"snapshots": 0, "deltas": 0, "resyncs": 0}
+
+    def add_listener(self, listener: BookListener) -> None:
+        self._listeners.append(listener)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.ws.listen())
+            self._task.add_done_callback(self._on_listen_done)
+
+    async def subscribe(self, asset_ids: Iterable[str]) -> None:
+        """Stream ``asset_ids``; each call must be paired with an ``unsubscribe`` of the same ids."""
+        counted: List[str] = []
+        new_ids: List[str] = []
+        for asset_id in asset_ids:
+            if not asset_id:
+                continue
+            refs = self._refs.get(asset_id, 0)
+            self._refs[asset_id] = refs + 1
+            counted.append(asset_id)
+            if refs == 0:
+                self._books[asset_id] = _LocalBook()
+                new_ids.append(asset_id)
+        if not new_ids:
+            return
+        if len(new_ids) == len(self._books):
+            payload: Dict[str, Any] = {"type": "market", "assets_ids": new_ids}
+        else:
+            payload = {"assets_ids": new_ids, "operation": "subscribe"}
+        self.ws.set_subscriptions([self._market_payload()])
+        try:
+            await self.ws.send(payload)
+        except BaseException:
+            # Undo the bookkeeping so the caller can retry and a reconnect does not replay it.
+            for asset_id in counted:
+                refs = self._refs.get(asset_id, 0) - 1
+                if refs > 0:
+                    self._refs[asset_id] = refs
+                else:
+                    self._refs.pop(asset_id, None)
+            for asset_id in new_ids:
+                self._books.pop(asset_id, None)
+            self.ws.set_subscriptions([self._market_payload()] if self._books else [])
+            raise
+
+    async def unsubscribe(self, asset_ids: Iterable[str]) -> None:
+        """Stop streaming assets no other subscriber still reads."""
+        removed: List[str] = []
+        for asset_id in asset_ids:
+            refs = self._refs.get(asset_id, 0)
+            if refs > 1:
+                self._refs[asset_id] = refs - 1
+                continue
+            if refs == 0:
+                continue
+            self._refs.pop(asset_id, None)
+            self._books.pop(asset_id, None)
+            resync = self._resyncs.pop(asset_id, None)
+            if resync:
+                resync.cancel()
+            removed.append(asset_id)
+        if not removed:
+            return
+        self.ws.set_subscriptions([self._market_payload()] if self._books else [])
+        await self.ws.send({"assets_ids": removed, "operation": "unsubscribe"})
+
+    def get_orderbook(self, asset_id: str) -> Optional[OrderBook]:
+        book = self._books.get(asset_id)
+        if not book or not book.synced:
+            return None
+        return book.to_orderbook(asset_id)
+
+    async def close(self) -> None:
+        await self.ws.close()
+        tasks = list(self._resyncs.values())
+        if self._task:
+            tasks.append(self._task)
+            self._task = None
+        self._resyncs.clear()
+        for task in tasks:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+    def _on_connection(self, connected: bool) -> None:
+        for book in self._books.values():
+            book.synced = False
+        if self._books:
+            self.logger.info(
+                "polymarket books unsynced",
+                reason="reconnect" if connected else "disconnect",
+                assets=len(self._books),
+            )
+
+    def _on_listen_done(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is None:
+            return
+        if task is self._task:
+            # Let ``start`` bring the feed back up.
+            self._task = None
+        self._on_connection(False)
+        self.logger.error("polymarket market feed stopped", error=str(error))
+        if self.db is not None and hasattr(self.db, "record_incident"):
+            self._incident_task = asyncio.create_task(self._record_stop(error))
+
+    async def _record_stop(self, error: BaseException) -> None:
+        try:
+            await self.db.record_incident("ERROR", "market_feed_stopped", {"error": str(error)})
+        except Exception as exc:
+            self.logger.error("incident not recorded", incident="market_feed_stopped", error=str(exc))
+
+    def _market_payload(self) -> Dict[str, Any]:
+        return {"type": "market", "assets_ids": list(self._books)}
+
+    async def handle_message(self, message: Any) -> None:
+        events = message if isinstance(message, list) else [message]
+        for event in events:
+            if not isinstance(event, dict):
+                continue
+            event_type = event.get("event_type")
+            if event_type == "book":
+                await self._on_book(event)
+            elif event_type == "price_change":
+                await self._on_price_change(event)
+
+    async def _on_book(self, event: Dict[str, Any]) -> None:
+        asset_id = str(event.get("asset_id") or "")
+        book = self._books.get(asset_id)
+        if book is None:
+            return
+        book.replace(
+            event.get("bids") or event.get("buys") or [],
+            event.get("asks") or event.get("sells") or [],
+            _timestamp(event),
+        )
+        self.metrics["snapshots"] += 1
+        await self._publish(asset_id, book)
+
+    async def _on_price_change(self, event: Dict[str, Any]) -> None:
+        ts = _timestamp(event)
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        if "price_changes" in event:
+            for change in event.get("price_changes") or []:
+                grouped.setdefault(str(change.get("asset_id") or ""), []).append(change)
+        else:
+            grouped[str(event.get("asset_id") or "")] = list(event.get("changes") or [])
+
+        for asset_id, changes in grouped.items():
+            book = self._books.get(asset_id)
+            if book is None:
+                continue
+            if not book.synced or ts < book.last_ts:
+                self._schedule_resync(asset_id, "gap")
+                continue
+            applied = True
+            for change in changes:
+                side = str(change.get("side", "")).upper()
+                try:
+                    price = float(change["price"])
+                    size = float(change.get("size") or 0.0)
+                except (KeyError, TypeError, ValueError):
+                    continue
+                # A level we cannot place leaves the book unknown, so it is rebuilt rather than guessed.
+                applied = book.apply(side, price, size) and applied
+            book.last_ts = ts
+            self.metrics["deltas"] += 1
+            if not applied or book.is_crossed() or _disagrees_with_venue(book, changes):
+                self._schedule_resync(asset_id, "inconsistent")
+                continue
+            await self._publish(asset_id, book)
+
+    def _schedule_resync(self, asset_id: str, reason: str) -> None:
+        if asset_id in self._resyncs:
+            return
+        self._books[asset_id].synced = False
+        self.metrics["resyncs"] += 1
+        self.logger.debug("polymarket book resync", asset_id=asset_id, reason=reason)
+        task = asyncio.create_task(self._resync(asset_id))
+        self._resyncs[asset_id] = task
+        task.add_done_callback(lambda _task, key=asset_id: self._resyncs.pop(key, None))
+
+    async def _resync(self, asset_id: str) -> None:
+        try:
+            snapshot = await self.rest_client.get_orderbook(asset_id)
+        except Exception as exc:
+            self.logger.warn("polymarket book resync failed", asset_id=asset_id, error=str(exc))
+            return
+        book = self._books.get(asset_id)
+        if book is None or book.synced:
+            # A websocket snapshot arrived while we were waiting on REST; it is at least as fresh.
+            return
+        book.replace(
+            ({"price": level.price, "size": level.size} for level in snapshot.bids),
+            ({"price": level.price, "size": level.size} for level in snapshot.asks),
+            book.last_ts,
+        )
+        await self._publish(asset_id, book)
+
+    async def _publish(self, asset_id: str, book: _LocalBook) -> None:
+        orderbook = book.to_orderbook(asset_id)
+        if self.orderbook_cache:
+            self.orderbook_cache.update(ExchangeName.POLYMARKET, asset_id, orderbook)
+        for listener in self._listeners:
+            try:
+                result = listener(orderbook)
+                if result and hasattr(result, "__await__"):
+                    await result
+            except Exception as exc:  # pragma: no cover - listener isolation
+                self.logger.warn("polymarket book listener failed", asset_id=asset_id, error=str(exc))
+
+
+def _levels_to_map(levels: Iterable[Dict[str, Any]]) -> Dict[float, float]:
+    mapped: Dict[float, float] = {}
+    for level in levels:
+        try:
+            price = float(level["price"])
+            size = float(level.get("size") or level.get("amount") or 0.0)
+        except (KeyError, TypeError, ValueError):
+            continue
+        if size > 0:
+            mapped[price] = size
+    return mapped
+
+
+def _timestamp(event: Dict[str, Any]) -> int:
+    try:
+        return int(event.get("timestamp") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _disagrees_with_venue(book: _LocalBook, changes: List[Dict[str, Any]]) -> bool:
+    """Compare against the venue's best bid/ask echoed on newer price_change payloads."""
+    if not changes:
+        return False
+    last = changes[-1]
+    for key, local in (("best_bid", book.best_bid()), ("best_ask", book.best_ask())):
+        remote = last.get(key)
+        if remote in (None, ""):
+            continue
+        try:
+            remote_value = float(remote)
+        except (TypeError, ValueError):
+            continue
+        if remote_value == 0 and local is None:
+            continue
+        if local is None or abs(remote_value - local) > 1e-9:
+            return True
+    return False
@@ -2,49 +2,95 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+from dataclasses import dataclass
 from typing import Awaitable, Callable, List, Optional, Tuple
 
-from core.models import Fill
+from core.fill_dedupe import DEFAULT_MAX_ENTRIES, DEFAULT_WINDOW_SEC, FillDedupeStore
+from core.models import ExchangeName, Fill
 from utils.logger import BotLogger
 
 
 FillDecoder = Callable[[object], Awaitable[Optional[Fill]] | Optional[Fill]]
-FillHandler = Callable[[Fill], Awaitable[None]]
+# Handlers may schedule the work and return it (a task or a list of tasks); pollers wait for it
+# before moving their cursor.
+FillHandler = Callable[[Fill], Awaitable[object]]
+BatchFillHandler = Callable[[List[Fill]], Awaitable[object]]
+
+
+@dataclass(slots=True)
+class _PollSource:
+    client: object
+    interval: float
+    exchange: Optional[ExchangeName] = None
+    account_id: Optional[str] = None
+    since: Optional[float] = None
+    last_trade_id: Optional[str] = None
+
+    @property
+    def persistent(self) -> bool:
+        return self.exchange is not None and self.account_id is not None
 
 
 class Reconciler:
     """Cross-check websocket and polling feeds, deduplicate fills, and dispatch them."""
 
-    def __init__(self, database, handler: FillHandler, logger: BotLogger | None = None):
+    def __init__(
+        self,
+        database,
+        handler: FillHandler,
+        logger: BotLogger | None = None,
+        batch_handler: Optional[BatchFillHandler] = None,
+        dedupe_window_sec: float = DEFAULT_WINDOW_SEC,
+        dedupe_max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
         self.db = database
         self.handler = handler
+        self.batch_handler = batch_handler
         self.logger = logger or BotLogger(__name__)
         self._ws_sources: List[Tuple[object, FillDecoder]] = []
-        self._poll_sources: List[Tuple[object, float]] = []
+        self._poll_sources: List[_PollSource] = []
         self._tasks: List[asyncio.Task] = []
         self._stop = asyncio.Event()
-        self._seen: set[str] = set()
+        exists = getattr(database, "fill_exists", None)
+        self._seen = FillDedupeStore(
+            window_sec=dedupe_window_sec,
+            max_entries=dedupe_max_entries,
+            exists=(lambda fill: exists(fill.order_id, fill.timestamp)) if exists else None,
+            logger=self.logger,
+        )
         self.metrics = {
             "ws_events": 0,
             "poll_events": 0,
             "poll_cycles": 0,
             "duplicates": 0,
             "processed": 0,
+            "failed_batches": 0,
         }
 
     def subscribe_ws(self, exchange_client, decoder: FillDecoder) -> None:
         self._ws_sources.append((exchange_client, decoder))
 
-    def register_poller(self, exchange_client, interval_seconds: float) -> None:
-        self._poll_sources.append((exchange_client, interval_seconds))
+    def register_poller(
+        self,
+        exchange_client,
+        interval_seconds: float,
+        exchange: Optional[ExchangeName] = None,
+        account_id: Optional[str] = None,
+    ) -> None:
+        """Poll ``exchange_client`` for trades; with ``exchange`` and ``account_id`` the cursor survives restarts."""
+        self._poll_sources.append(
+            _PollSource(client=exchange_client, interval=interval_seconds, exchange=exchange, account_id=account_id)
+        )
 
     async def start(self) -> None:
-        self._seen = await self.db.fetch_fill_keys()
+        since = self._seen.window_start()
+        self._seen.load(await self.db.fetch_fill_keys(since=since), since=since)
         for client, decoder in self._ws_sources:
             task = asyncio.create_task(self._run_ws(client, decoder))
             self._tasks.append(task)
-        for client, interval in self._poll_sources:
-            task = asyncio.create_task(self._run_poller(client, interval))
+        for source in self._poll_sources:
+            await self._load_cursor(source)
+            task = asyncio.create_task(self._run_poller(source))
             self._tasks.append(task)
 
     async def stop(self) -> None:
@@ -61,17 +107,43 @@ class Reconciler:
 
         await client.listen_fills(handler)
 
-    async def _run_poller(self, client, interval: float) -> None:
+    async def _run_poller(self, source: _PollSource) -> None:
+        interval = source.interval
         backoff = interval
-        since = None
         while not self._stop.is_set():
             try:
-                trades = await client.fetch_user_trades(since=since)
+                trades = await source.client.fetch_user_trades(since=source.since)
                 self.metrics["poll_cycles"] += 1
-                for fill in trades or []:
-                    await self._process_fill(fill, source="poll")
-                    if fill and fill.timestamp:
-                        since = max(since or fill.timestamp.timestamp(), fill.timestamp.timestamp())
+                trades = [fill for fill in trades or [] if self._after_cursor(source, fill)]
+                dispatched: List[object] = []
+                try:
+                    if self.batch_handler:
+                        fresh = [fill for fill in trades if await self._accept(fill, source="poll")]
+                        if len(fresh) > 1:
+                            dispatched.append(await self.batch_handler(fresh))
+                        elif fresh:
+                            dispatched.append(await self.handler(fresh[0]))
+                    else:
+                        for fill in trades:
+                            dispatched.append(await self._process_fill(fill, source="poll"))
+                    errors = await self._wait_dispatched(dispatched)
+                except Exception:
+                    self._forget(trades)
+                    raise
+                if errors:
+                    # Hold the cursor and let the next poll redeliver the batch; handlers skip what
+                    # they already finished.
+                    self._forget(trades)
+                    self.metrics["failed_batches"] += 1
+                    self.logger.warn(
+                        "fill handling failed; poll cursor held",
+                        exchange=source.exchange.value,
+                        account_id=source.account_id,
+                        errors=len(errors),
+                        error=str(errors[0]),
+                    )
+                else:
+                    await self._advance_cursor(source, trades)
                 await asyncio.wait_for(self._stop.wait(), timeout=interval)
                 backoff = interval
             except asyncio.TimeoutError:
@@ -81,29 +153,97 @@ class Reconciler:
                 await asyncio.sleep(backoff)
                 backoff = min(backoff * 2, interval * 5)
 
+    async def _load_cursor(self, source: _PollSource) -> None:
+        if not source.persistent or not hasattr(self.db, "get_poll_cursor"):
+            return
+        try:
+            row = await self.db.get_poll_cursor(source.exchange.value, source.account_id)
+        except Exception as exc:
+            self.logger.warn("poll cursor load failed", account_id=source.account_id, error=str(exc))
+            return
+        if row:
+            source.since = float(row["last_ts"])
+            source.last_trade_id = row.get("last_trade_id")
+            self.logger.info(
+                "poller resuming from cursor",
+                exchange=source.exchange.value,
+                account_id=source.account_id,
+                since=source.since,
+            )
+
+    def _after_cursor(self, source: _PollSource, fill: Optional[Fill]) -> bool:
+        """Drop trades the cursor already covers; equal timestamps are kept unless it is the cursor trade."""
+        if fill is None:
+            return False
+        if source.since is None or fill.timestamp is None:
+            return True
+        ts = fill.timestamp.timestamp()
+        if ts != source.since:
+            return ts > source.since
+        return self._trade_id(fill) != source.last_trade_id
+
+    @staticmethod
+    async def _wait_dispatched(results: List[object]) -> List[BaseException]:
+        """Wait for work the handlers scheduled; returns the exceptions it raised."""
+        pending = []
+        for result in results:
+            for item in result if isinstance(result, (list, tuple)) else (result,):
+                if isinstance(item, asyncio.Future):
+                    pending.append(item)
+        if not pending:
+            return []
+        outcomes = await asyncio.gather(*pending, return_exceptions=True)
+        return [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+
+    def _forget(self, trades: List[Fill]) -> None:
+        for fill in trades:
+            self._seen.discard(self._fill_key(fill))
+
+    async def _advance_cursor(self, source: _PollSource, trades: List[Fill]) -> None:
+        # Only called once the batch has been handled, so a crash mid-batch replays it on restart.
+        newest = max((fill for fill in trades if fill.timestamp), key=lambda fill: fill.timestamp, default=None)
+        if newest is None:
+            return
+        since = newest.timestamp.timestamp()
+        if source.since is not None and since < source.since:
+            return
+        source.since = since
+        source.last_trade_id = self._trade_id(newest)
+        if not source.persistent or not hasattr(self.db, "save_poll_cursor"):
+            return
+        try:
+            await self.db.save_poll_cursor(source.exchange.value, source.account_id, since, source.last_trade_id)
+        except Exception as exc:
+            self.logger.warn("poll cursor save failed", account_id=source.account_id, error=str(exc))
+
     async def _decode(self, decoder: FillDecoder, payload) -> Optional[Fill]:
         result = decoder(payload)
         if asyncio.iscoroutine(result):
             result = await result
         return result
 
-    async def _process_fill(self, fill: Optional[Fill], source: str) -> None:
+    async def _process_fill(self, fill: Optional[Fill], source: str) -> object:
+        if await self._accept(fill, source):
+            return await self.handler(fill)
+        return None
+
+    async def _accept(self, fill: Optional[Fill], source: str) -> bool:
         if fill is None:
-            return
-        key = self._fill_key(fill)
-        if key in self._seen:
+            return False
+        if not await self._seen.check_and_add(self._fill_key(fill), fill):
             self.metrics["duplicates"] += 1
-            return
-        self._seen.add(key)
+            return False
         self.metrics["processed"] += 1
         if source == "ws":
             self.metrics["ws_events"] += 1
         elif source == "poll":
             self.metrics["poll_events"] += 1
-        await self.handler(fill)
+        return True
 
     def _fill_key(self, fill: Fill) -> str:
         ts = fill.timestamp.isoformat() if fill.timestamp else ""
-        key_part = getattr(fill, "fill_id", None) or fill.order_id
-        return f"{fill.exchange.value}:{key_part}:{ts}"
+        return f"{fill.exchange.value}:{self._trade_id(fill)}:{ts}"
+
+    def _trade_id(self, fill: Fill) -> str:
+        return getattr(fill, "fill_id", None) or fill.order_id
 
@@ -3,7 +3,7 @@ from __future__ import annotations
 import asyncio
 import json
 import random
-from typing import Awaitable, Callable, List, Optional
+from typing import Any, Awaitable, Callable, List, Optional
 
 import aiohttp
 
@@ -30,13 +30,19 @@ class WebSocketManager:
         self.max_retries = max_retries
         self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
         self._subscriptions: List[dict] = []
-        self._handler: Optional[Callable[[dict], Awaitable[None]]] = None
+        self._handler: Optional[Callable[[Any], Awaitable[None]]] = None
+        self._connection_handler: Optional[Callable[[bool], None]] = None
         self._running = False
         self._closing = False
 
-    def set_handler(self, handler: Callable[[dict], Awaitable[None]]) -> None:
+    def set_handler(self, handler: Callable[[Any], Awaitable[None]]) -> None:
         self._handler = handler
 
+    def set_connection_handler(self, handler: Callable[[bool], None]) -> None:
+        """Called with ``True`` after each (re)connect, before subscriptions are replayed, and
+        with ``False`` when the connection drops."""
+        self._connection_handler = handler
+
     async def connect(self) -> None:
         backoff = 1.0
         attempt = 0
@@ -44,6 +50,7 @@ class WebSocketManager:
             try:
                 self._ws = await self.session.ws_connect(self.url, proxy=self.proxy)
                 self.logger.info("websocket connected", url=self.url)
+                self._notify_connection(True)
                 for payload in self._subscriptions:
                     await self.subscribe(payload)
                 return
@@ -68,6 +75,17 @@ class WebSocketManager:
         await self._ws.send_json(payload)
         self.logger.debug("websocket subscribed", payload=json.dumps(payload))
 
+    def set_subscriptions(self, payloads: List[dict]) -> None:
+        """Replace the payloads replayed after a reconnect."""
+        self._subscriptions = list(payloads)
+
+    async def send(self, payload: dict) -> None:
+        """Send a one-off message; unlike ``subscribe`` it is not replayed after a reconnect."""
+        if self._ws is None:
+            return
+        await self._ws.send_json(payload)
+        self.logger.debug("websocket sent", payload=json.dumps(payload))
+
     async def listen(self) -> None:
         if self._running:
             return
@@ -78,7 +96,12 @@ class WebSocketManager:
             try:
                 msg = await self._ws.receive(timeout=self.ping_interval)
                 if msg.type == aiohttp.WSMsgType.TEXT:
-                    data = json.loads(msg.data)
+                    try:
+                        data = json.loads(msg.data)
+                    except ValueError:
+                        # Keepalive frames such as "PONG" are plain text; they carry no payload.
+                        self.logger.debug("websocket non-json frame", data=str(msg.data)[:64])
+                        continue
                     if self._handler:
                         await self._handler(data)
                 elif msg.type == aiohttp.WSMsgType.PONG:
@@ -86,6 +109,7 @@ class WebSocketManager:
                 elif msg.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSED):
                     await self._ws.close()
                     self._ws = None
+                    self._notify_connection(False)
                 elif msg.type == aiohttp.WSMsgType.ERROR:
                     raise msg.data
             except asyncio.TimeoutError:
@@ -93,10 +117,19 @@ class WebSocketManager:
                     await self._ws.ping()
             except Exception as exc:  # pragma: no cover - network errors
                 self.logger.warn("websocket listen error", error=str(exc))
+                self._notify_connection(False)
                 await asyncio.sleep(2)
                 self._ws = None
         self._running = False
 
+    def _notify_connection(self, connected: bool) -> None:
+        if not self._connection_handler:
+            return
+        try:
+            self._connection_handler(connected)
+        except Exception as exc:  # pragma: no cover - handler isolation
+            self.logger.warn("websocket connection handler failed", error=str(exc))
+
     async def close(self) -> None:
         self._closing = True
         if self._ws and not self._ws.closed:
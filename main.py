@@ -5,9 +5,11 @@ from contextlib import suppress
 from typing import Dict, List, Optional
 
 from aiohttp import web
+from core.balance_service import BalanceService
 from core.event_discovery.approvals import EventApprovalStore
 from core.event_discovery.registry import EventDiscoveryRegistry
 from core.event_discovery.service import EventDiscoveryService
+from core.exposure_ledger import ExposureLedger
 from core.hedger import Hedger
 from core.healthcheck import HealthcheckService
 from core.market_mapper import MarketMapper
@@ -17,8 +19,10 @@ from core.position_tracker import PositionTracker
 from core.risk_manager import RiskManager
 from core.spread_analyzer import SpreadAnalyzer
 from exchanges.opinion_api import OpinionAPI
+from exchanges.orderbook_cache import OrderbookCache
 from exchanges.orderbook_manager import OrderbookManager
 from exchanges.polymarket_api import PolymarketAPI
+from exchanges.polymarket_ws import PolymarketMarketFeed
 from exchanges.rate_limiter import RateLimiter
 from exchanges.reconciliation import Reconciler
 from telegram.commands import TelegramBotRunner, TelegramCommandRouter
@@ -34,6 +38,7 @@ from utils.db import Database
 from utils.db_migrations import apply_migrations
 from utils.google_sheets import GoogleSheetsClient, GoogleSheetsSync, MarketPairStore
 from utils.logger import BotLogger
+from utils.http_session import SessionFactory
 from utils.proxy_handler import ProxyHandler
 
 
@@ -75,15 +80,21 @@ async def main() -> None:
 
     logger = BotLogger("market_hedge")
     pair_store = MarketPairStore(settings.market_pairs)
-    sheet_sync_for_web = GoogleSheetsSync(settings.google_sheets, logger) if settings.google_sheets.enabled else None
+    session_factory = SessionFactory(settings.http, logger)
+    sheet_sync_for_web = (
+        GoogleSheetsSync(settings.google_sheets, logger, session_factory=session_factory)
+        if settings.google_sheets.enabled
+        else None
+    )
     await apply_migrations(settings.database)
     db = Database(settings.database, logger=logger)
     await db.init()
-    proxy_handler = ProxyHandler(logger)
+    proxy_handler = ProxyHandler(logger, session_factory=session_factory)
     notifier = TelegramNotifier(
         token=settings.telegram.token,
         chat_id=settings.telegram.chat_id,
         enabled=settings.telegram.enabled,
+        session_factory=session_factory,
     )
     approvals_store = EventApprovalStore()
     discovery_registry = EventDiscoveryRegistry(approvals_store)
@@ -92,10 +103,53 @@ async def main() -> None:
         logger.warn("market hedge mode disabled in settings.yaml; exiting")
         return
 
-    risk_manager = RiskManager(settings.market_hedge_mode, logger)
+    balance_service: Optional[BalanceService] = None
+    if settings.balances.cached:
+        balance_service = BalanceService(
+            ttl_sec=settings.balances.ttl_sec,
+            refresh_interval_sec=settings.balances.refresh_interval_sec,
+            logger=logger,
+            reservation_ttl_sec=settings.balances.reservation_ttl_sec,
+        )
+        balance_service.start()
+    sheet_client: Optional[GoogleSheetsClient] = None
+    if settings.google_sheets.enabled:
+        sheet_client = GoogleSheetsClient(settings.google_sheets, logger=logger, session_factory=session_factory)
+        # Load the sheet pairs before rebuilding so their markets resolve to events.
+        try:
+            specs = await sheet_client.fetch_specs()
+            await pair_store.update_pairs([spec.pair_cfg for spec in specs.values()])
+        except Exception as exc:  # pragma: no cover - defensive logging
+            logger.warn("initial sheet fetch failed", error=str(exc))
+    ledger = ExposureLedger(logger)
+    await ledger.rebuild(
+        db,
+        market_events={
+            market_id: pair.event_id
+            for pair in [*settings.market_pairs, *await pair_store.list_pairs()]
+            for market_id in (pair.primary_market_id, pair.secondary_market_id)
+            if market_id and pair.event_id
+        },
+    )
+    risk_manager = RiskManager(settings.market_hedge_mode, logger, balance_service=balance_service, ledger=ledger)
     orderbook_manager = OrderbookManager()
-    spread_analyzer = SpreadAnalyzer()
-    position_tracker = PositionTracker(db, logger)
+    orderbook_cache: Optional[OrderbookCache] = None
+    if settings.market_data.shared_orderbook_cache:
+        orderbook_cache = OrderbookCache(
+            refresh_interval=settings.market_data.refresh_interval_sec,
+            logger=logger,
+        )
+    spread_analyzer = SpreadAnalyzer(
+        depth_aware=settings.market_hedge_mode.depth_aware_sizing,
+        min_size=settings.market_hedge_mode.min_quote_size,
+    )
+    position_tracker = PositionTracker(
+        db,
+        logger,
+        ledger=ledger,
+        flush_interval_sec=settings.positions.flush_interval_sec,
+    )
+    position_tracker.start()
     hedger = Hedger(
         settings.market_hedge_mode,
         risk_manager,
@@ -135,6 +189,25 @@ async def main() -> None:
         if not pool:
             raise RuntimeError(f"at least one account required for {exchange_name.value}")
 
+    market_feed: Optional[PolymarketMarketFeed] = None
+    if settings.market_data.polymarket_ws_enabled:
+        feed_account = account_pools[ExchangeName.POLYMARKET][0]
+        market_feed = PolymarketMarketFeed(
+            session=await session_factory.session(
+                feed_account.exchange.value,
+                feed_account.proxy,
+                ssl=False,
+                websocket=True,
+            ),
+            rest_client=clients_by_id[feed_account.account_id],
+            orderbook_cache=orderbook_cache,
+            logger=logger,
+            proxy=feed_account.proxy,
+            url=settings.market_data.polymarket_ws_url,
+            database=db,
+        )
+        await market_feed.start()
+
     healthcheck = HealthcheckService(
         spread_analyzer=spread_analyzer,
         orderbook_manager=orderbook_manager,
@@ -142,6 +215,11 @@ async def main() -> None:
         clients_by_id=clients_by_id,
         fees=settings.fees,
         logger=logger,
+        leg_timeout=settings.market_data.leg_fetch_timeout_sec or None,
+        max_concurrency=settings.healthcheck.max_concurrency,
+        pair_timeout=settings.healthcheck.per_pair_timeout_sec or None,
+        orderbook_cache=orderbook_cache,
+        cache_freshness=settings.healthcheck.cache_freshness_sec,
     )
     opinion_key: Optional[str] = None
     for acc in account_pools[ExchangeName.OPINION]:
@@ -164,6 +242,8 @@ async def main() -> None:
         notifier=notifier,
         account_pools=account_pools,
         clients_by_id=clients_by_id,
+        orderbook_cache=orderbook_cache,
+        market_feed=market_feed,
     )
     telegram_runner: Optional[TelegramBotRunner] = None
     heartbeat_task: Optional[asyncio.Task] = None
@@ -175,10 +255,8 @@ async def main() -> None:
         if pair.primary_market_id and pair.secondary_market_id:
             await pair_controller.start_pair(pair, source="static")
 
-    sheet_client: Optional[GoogleSheetsClient] = None
     sheet_task: Optional[asyncio.Task] = None
-    if settings.google_sheets.enabled:
-        sheet_client = GoogleSheetsClient(settings.google_sheets, logger=logger)
+    if sheet_client is not None:
         poll_interval = max(5, settings.google_sheets.poll_interval_sec)
 
         async def _sheet_loop():
@@ -211,13 +289,13 @@ async def main() -> None:
             port=settings.webhook.port,
         )
 
-    reconciler = Reconciler(db, pair_controller.dispatch_fill, logger)
+    reconciler = Reconciler(db, pair_controller.dispatch_fill, logger, batch_handler=pair_controller.dispatch_fills)
     connectivity_defaults = ExchangeConnectivity(use_websocket=False, poll_interval=5.0)
 
     for account_id, client in clients_by_id.items():
         exchange = account_index[account_id].exchange
         cfg = settings.connectivity.get(exchange, connectivity_defaults)
-        reconciler.register_poller(client, cfg.poll_interval)
+        reconciler.register_poller(client, cfg.poll_interval, exchange=exchange, account_id=account_id)
 
     await reconciler.start()
 
@@ -228,6 +306,7 @@ async def main() -> None:
         opinion_api_key=opinion_key,
         stop_event=stop_event,
         poll_interval_sec=settings.event_discovery.poll_interval_sec,
+        session_factory=session_factory,
     )
     await event_discovery_service.start()
 
@@ -292,6 +371,13 @@ async def main() -> None:
         logger.info("shutting down...")
     finally:
         await pair_controller.shutdown()
+        await position_tracker.close()
+        if market_feed:
+            await market_feed.close()
+        if orderbook_cache:
+            await orderbook_cache.close()
+        if balance_service:
+            await balance_service.close()
         if heartbeat_task:
             heartbeat_task.cancel()
             with suppress(asyncio.CancelledError):
@@ -314,6 +400,7 @@ async def main() -> None:
                 await close()
         await notifier.close()
         await proxy_handler.close()
+        await session_factory.close()
         await db.close()
 
 
@@ -0,0 +1,8 @@
+CREATE TABLE IF NOT EXISTS poll_cursors (
+    exchange TEXT NOT NULL,
+    account_id TEXT NOT NULL,
+    last_ts DOUBLE PRECISION NOT NULL,
+    last_trade_id TEXT,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (exchange, account_id)
+);
@@ -0,0 +1 @@
+ALTER TABLE fills ADD COLUMN market_id TEXT;
@@ -0,0 +1,13 @@
+-- Lookups by exchange order id or client order id (update_order_status, update_order_fill).
+CREATE INDEX IF NOT EXISTS idx_orders_order_id ON orders(order_id);
+CREATE INDEX IF NOT EXISTS idx_orders_client_order_id ON orders(client_order_id);
+-- get_unhedged_size: SUM(size - filled_size) per market straight from the index.
+CREATE INDEX IF NOT EXISTS idx_orders_market_open ON orders(market_id, size, filled_size);
+
+-- fill_exists (order_id + ts) and time-windowed fill key scans.
+CREATE INDEX IF NOT EXISTS idx_fills_order_ts ON fills(order_id, ts);
+CREATE INDEX IF NOT EXISTS idx_fills_ts ON fills(ts, exchange, fill_id, order_id);
+
+-- get_double_limit_by_order also matches on client order ids.
+CREATE INDEX IF NOT EXISTS idx_double_limits_client_a ON double_limits(client_order_id_a);
+CREATE INDEX IF NOT EXISTS idx_double_limits_client_b ON double_limits(client_order_id_b);
@@ -0,0 +1,8 @@
+CREATE TABLE IF NOT EXISTS poll_cursors (
+    exchange TEXT NOT NULL,
+    account_id TEXT NOT NULL,
+    last_ts REAL NOT NULL,
+    last_trade_id TEXT,
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (exchange, account_id)
+);
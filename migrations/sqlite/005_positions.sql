@@ -0,0 +1,8 @@
+CREATE TABLE IF NOT EXISTS positions (
+    event_id TEXT PRIMARY KEY,
+    net_position NUMERIC NOT NULL,
+    last_price NUMERIC,
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status);
@@ -37,6 +37,7 @@ class Fill:
     price: Decimal
     side: Literal["BUY", "SELL"]
     ts: datetime
+    market_id: Optional[str] = None
 
 
 @dataclass(slots=True)
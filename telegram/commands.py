@@ -73,6 +73,7 @@ class MessageBuilder:
         status: Dict[str, Any],
         poll_intervals: Dict[str, float],
         account_counts: Dict[str, int],
+        exposure: Optional[Dict[str, Any]] = None,
     ) -> str:
         mode = "🧪 Dry-run" if settings.dry_run else "🟢 Live"
         accounts = " | ".join(f"{name}: {count}" for name, count in account_counts.items()) if account_counts else "—"
@@ -109,6 +110,16 @@ class MessageBuilder:
             f"{SUB_BULLET} backend: {db_backend}",
             f"{SUB_BULLET} last_write: {_fmt_time(db_last_write)}",
         ]
+        if exposure:
+            lines.extend(
+                [
+                    "",
+                    "⚖️ Экспозиция:",
+                    f"{SUB_BULLET} events: {exposure.get('events', 0)} | open orders: {exposure.get('open_orders', 0)}",
+                    f"{SUB_BULLET} committed: {exposure.get('committed_total', 0)} | open: {exposure.get('open_size', 0)}",
+                    f"{SUB_BULLET} net: {exposure.get('net_position', 0)} | gross: {exposure.get('gross_position', 0)}",
+                ]
+            )
         return "\n".join(lines)
 
     @staticmethod
@@ -450,9 +461,15 @@ class TelegramCommandRouter:
         if not self.healthcheck:
             await self.notifier.send_message(MessageBuilder.health_unavailable(), chat_id=chat_id)
             return
-        results = await self.healthcheck.run(pairs, size=1.0)
-        table = self._format_health_table(results)
-        await self.notifier.send_message(table, chat_id=chat_id)
+        chunk_size = max(1, self.settings.healthcheck.chunk_size)
+        chunk: List[HealthcheckResult] = []
+        async for result in self.healthcheck.stream(pairs, size=1.0):
+            chunk.append(result)
+            if len(chunk) >= chunk_size:
+                await self.notifier.send_message(self._format_health_table(chunk), chat_id=chat_id)
+                chunk = []
+        if chunk:
+            await self.notifier.send_message(self._format_health_table(chunk), chat_id=chat_id)
 
     async def _handle_simulate(self, chat_id: str, text: str) -> None:
         parts = text.split()
@@ -481,11 +498,20 @@ class TelegramCommandRouter:
         try:
             primary_client = self._resolve_client(primary_exchange, pair.primary_account_id)
             secondary_client = self._resolve_client(secondary_exchange, pair.secondary_account_id)
-            primary_ob = await primary_client.get_orderbook(pair.primary_market_id)
-            secondary_ob = await secondary_client.get_orderbook(pair.secondary_market_id)
+            snapshot = await self.orderbook_manager.fetch_pair_snapshot(
+                primary_client,
+                pair.primary_market_id,
+                secondary_client,
+                pair.secondary_market_id,
+                timeout=self.settings.market_data.leg_fetch_timeout_sec or None,
+            )
+            if not snapshot.ok:
+                raise RuntimeError(snapshot.error)
         except Exception as exc:
             await self.notifier.send_message(MessageBuilder.simulate_orderbook_error(exc), chat_id=chat_id)
             return
+        primary_ob = snapshot.primary.orderbook
+        secondary_ob = snapshot.secondary.orderbook
 
         scenario = await self.spread_analyzer.evaluate_opportunity(
             primary_exchange=primary_exchange,
@@ -593,7 +619,11 @@ class TelegramCommandRouter:
         status = self.db.status_snapshot() if hasattr(self.db, "status_snapshot") else {}
         poll_intervals = {name.value: cfg.poll_interval for name, cfg in self.settings.connectivity.items()}
         account_counts = {ex.value: len(pool) for ex, pool in self.account_pools.items()}
-        return MessageBuilder.status(snapshot, self.settings, orderbook_times, metrics, status, poll_intervals, account_counts)
+        ledger = getattr(getattr(self.pair_controller, "risk_manager", None), "ledger", None)
+        exposure = ledger.snapshot() if ledger else None
+        return MessageBuilder.status(
+            snapshot, self.settings, orderbook_times, metrics, status, poll_intervals, account_counts, exposure
+        )
 
     async def _active_pairs(self) -> List[MarketPairConfig]:
         pairs = await self.pair_controller.list_pairs()
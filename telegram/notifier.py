@@ -2,22 +2,33 @@ from __future__ import annotations
 
 import aiohttp
 
+from utils.http_session import SessionFactory
 from utils.logger import BotLogger
 
 
 class TelegramNotifier:
     """Sends updates via Telegram."""
 
-    def __init__(self, token: str | None, chat_id: str | None, enabled: bool = False):
+    def __init__(
+        self,
+        token: str | None,
+        chat_id: str | None,
+        enabled: bool = False,
+        session_factory: SessionFactory | None = None,
+    ):
         self.token = token
         self.chat_id = chat_id
         self.enabled = enabled and bool(token)
         self.logger = BotLogger(__name__)
+        self.session_factory = session_factory
         self._session: aiohttp.ClientSession | None = None
 
     async def _ensure_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            if self.session_factory:
+                self._session = await self.session_factory.session("api.telegram.org")
+            else:
+                self._session = aiohttp.ClientSession()
         return self._session
 
     async def send_message(
@@ -119,6 +130,6 @@ class TelegramNotifier:
         return result
 
     async def close(self) -> None:
-        if self._session:
+        if self._session and not self.session_factory:
             await self._session.close()
 
@@ -1,3 +1,5 @@
+import asyncio
+import time
 from datetime import datetime, timezone
 
 import pytest
@@ -214,6 +216,175 @@ async def test_cancel_failure_still_triggers_hedge():
     assert any(stage == "hedge" for _, stage, _ in db.events)
 
 
+class SlowCancelExchange(StubExchange):
+    def __init__(self, name: ExchangeName, delay: float):
+        super().__init__(name)
+        self.delay = delay
+        self.cancel_done_at = None
+
+    async def cancel_order(self, order_id):
+        self.cancel_attempts += 1
+        await asyncio.sleep(self.delay)
+        self.cancelled.append(order_id)
+        self.cancel_done_at = time.monotonic()
+        return True
+
+
+class TimedHedger(DummyHedger):
+    def __init__(self):
+        super().__init__()
+        self.called_at = None
+
+    async def hedge(self, *args, **kwargs):
+        self.called_at = time.monotonic()
+        return await super().hedge(*args, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_counter_cancel_and_hedge_run_concurrently():
+    exchanges = {
+        ExchangeName.OPINION: StubExchange(ExchangeName.OPINION),
+        ExchangeName.POLYMARKET: SlowCancelExchange(ExchangeName.POLYMARKET, delay=0.1),
+    }
+    db = SequenceDB()
+    hedger = TimedHedger()
+    manager = OrderManager(
+        exchanges,
+        db,
+        DummyTracker(),
+        hedger,
+        DummyRiskManager(),
+        dry_run=False,
+        event_id="event-dl",
+        market_map={
+            ExchangeName.OPINION: "opinion-token",
+            ExchangeName.POLYMARKET: "poly-market",
+        },
+        double_limit_enabled=True,
+    )
+    manager.set_routing(ExchangeName.OPINION, ExchangeName.POLYMARKET)
+    await manager.place_double_limit(
+        account="acct-1",
+        pair=MarketPairConfig(
+            event_id="event-dl",
+            primary_market_id="opinion-token",
+            secondary_market_id="poly-market",
+        ),
+        price_a=0.5,
+        size_a=5,
+        price_b=0.51,
+        size_b=5,
+        side_a=OrderSide.BUY,
+        side_b=OrderSide.BUY,
+    )
+    fill = Fill(
+        order_id=exchanges[ExchangeName.OPINION].orders[0].order_id,
+        market_id="opinion-token",
+        exchange=ExchangeName.OPINION,
+        side=OrderSide.BUY,
+        price=0.5,
+        size=2,
+        fee=0.0,
+        timestamp=datetime.now(tz=timezone.utc),
+    )
+    await manager.handle_fill(ExchangeName.OPINION, fill)
+
+    slow = exchanges[ExchangeName.POLYMARKET]
+    assert hedger.called_at < slow.cancel_done_at
+    assert slow.cancel_done_at - hedger.called_at > 0.05
+    stages = [stage for _, stage, _ in db.events if stage in {"cancel_result", "hedge"}]
+    assert stages == ["hedge"]
+    record = next(payload for _, stage, payload in db.events if stage == "hedge")
+    assert record["status"] == "success"
+    assert record["cancel"]["success"] is True
+    assert record["cancel"]["order_id"] == slow.orders[0].order_id
+
+
+class ExplodingHedger(DummyHedger):
+    async def hedge(self, *args, **kwargs):
+        raise RuntimeError("venue timeout")
+
+
+async def _filled_double_limit(hedger, counter_exchange):
+    exchanges = {
+        ExchangeName.OPINION: StubExchange(ExchangeName.OPINION),
+        ExchangeName.POLYMARKET: counter_exchange,
+    }
+    db = SequenceDB()
+    manager = OrderManager(
+        exchanges,
+        db,
+        DummyTracker(),
+        hedger,
+        DummyRiskManager(),
+        dry_run=False,
+        event_id="event-dl",
+        market_map={
+            ExchangeName.OPINION: "opinion-token",
+            ExchangeName.POLYMARKET: "poly-market",
+        },
+        double_limit_enabled=True,
+    )
+    manager.set_routing(ExchangeName.OPINION, ExchangeName.POLYMARKET)
+    await manager.place_double_limit(
+        account="acct-1",
+        pair=MarketPairConfig(
+            event_id="event-dl",
+            primary_market_id="opinion-token",
+            secondary_market_id="poly-market",
+        ),
+        price_a=0.5,
+        size_a=5,
+        price_b=0.51,
+        size_b=5,
+        side_a=OrderSide.BUY,
+        side_b=OrderSide.BUY,
+    )
+    fill = Fill(
+        order_id=exchanges[ExchangeName.OPINION].orders[0].order_id,
+        market_id="opinion-token",
+        exchange=ExchangeName.OPINION,
+        side=OrderSide.BUY,
+        price=0.5,
+        size=2,
+        fee=0.0,
+        timestamp=datetime.now(tz=timezone.utc),
+    )
+    return manager, db, fill
+
+
+@pytest.mark.asyncio
+async def test_hedge_error_still_records_cancel_outcome():
+    counter = SlowCancelExchange(ExchangeName.POLYMARKET, delay=0.01)
+    manager, db, fill = await _filled_double_limit(ExplodingHedger(), counter)
+
+    with pytest.raises(RuntimeError):
+        await manager.handle_fill(ExchangeName.OPINION, fill)
+
+    record = next(payload for _, stage, payload in db.events if stage == "hedge")
+    assert record["status"] == "error"
+    assert record["cancel"]["success"] is True
+    assert counter.cancelled == [counter.orders[0].order_id]
+
+
+@pytest.mark.asyncio
+async def test_cancel_error_still_records_hedge_outcome():
+    hedger = DummyHedger()
+    manager, db, fill = await _filled_double_limit(hedger, SlowCancelExchange(ExchangeName.POLYMARKET, delay=0))
+
+    async def broken_cancel(*_args, **_kwargs):
+        raise RuntimeError("cancel bookkeeping failed")
+
+    manager._cancel_with_retry = broken_cancel
+    await manager.handle_fill(ExchangeName.OPINION, fill)
+
+    assert len(hedger.calls) == 1
+    record = next(payload for _, stage, payload in db.events if stage == "hedge")
+    assert record["status"] == "success"
+    assert record["cancel"]["success"] is False
+    assert record["cancel"]["error"] == "cancel bookkeeping failed"
+
+
 class DummyNotifier:
     def __init__(self):
         self.messages = []
@@ -308,3 +479,88 @@ async def test_ultra_safe_slippage_blocks_hedge():
     assert notifier.messages, "ultra-safe skip should send telemetry"
     assert any("Ultra Safe" in msg for msg in notifier.messages)
 
+
+
+class CountingSequenceDB(SequenceDB):
+    def __init__(self):
+        super().__init__()
+        self.lookups = 0
+        self.triggered_at = None
+
+    async def get_double_limit_by_order(self, order_ref):
+        self.lookups += 1
+        return await super().get_double_limit_by_order(order_ref)
+
+    async def update_double_limit_state(self, record_id, state, **kwargs):
+        await asyncio.sleep(0.05)
+        self.triggered_at = time.monotonic()
+        await super().update_double_limit_state(record_id, state, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_latency_first_claims_counter_order_without_db_round_trip():
+    exchanges = {
+        ExchangeName.OPINION: StubExchange(ExchangeName.OPINION),
+        ExchangeName.POLYMARKET: SlowCancelExchange(ExchangeName.POLYMARKET, delay=0),
+    }
+    db = CountingSequenceDB()
+    hedger = TimedHedger()
+    manager = OrderManager(
+        exchanges,
+        db,
+        DummyTracker(),
+        hedger,
+        DummyRiskManager(),
+        dry_run=False,
+        event_id="event-dl",
+        market_map={
+            ExchangeName.OPINION: "opinion-token",
+            ExchangeName.POLYMARKET: "poly-market",
+        },
+        double_limit_enabled=True,
+        latency_first=True,
+    )
+    manager.set_routing(ExchangeName.OPINION, ExchangeName.POLYMARKET)
+    await manager.place_double_limit(
+        account="acct-1",
+        pair=None,
+        price_a=0.5,
+        size_a=5,
+        price_b=0.51,
+        size_b=5,
+    )
+    primary, counter = exchanges[ExchangeName.OPINION].orders[0], exchanges[ExchangeName.POLYMARKET].orders[0]
+    fill = Fill(
+        order_id=primary.order_id,
+        market_id="opinion-token",
+        exchange=ExchangeName.OPINION,
+        side=OrderSide.BUY,
+        price=0.5,
+        size=2,
+        fee=0.0,
+        timestamp=datetime.now(tz=timezone.utc),
+    )
+    await manager.handle_fill(ExchangeName.OPINION, fill)
+    await manager.drain_bookkeeping()
+
+    # The hedge went out while the TRIGGERED row was still being written.
+    assert db.lookups == 0
+    assert hedger.called_at < db.triggered_at
+    assert exchanges[ExchangeName.POLYMARKET].cancelled == [counter.order_id]
+    record = next(iter(db.double_limits.values()))
+    assert record["state"] == "TRIGGERED"
+    assert record["cancelled_order_id"] == counter.order_id
+
+    # The opposite leg filling afterwards finds its double limit already claimed.
+    counter_fill = Fill(
+        order_id=counter.order_id,
+        market_id="poly-market",
+        exchange=ExchangeName.POLYMARKET,
+        side=OrderSide.BUY,
+        price=0.51,
+        size=2,
+        fee=0.0,
+        timestamp=datetime.now(tz=timezone.utc),
+    )
+    await manager.handle_fill(ExchangeName.POLYMARKET, counter_fill)
+    assert exchanges[ExchangeName.OPINION].cancelled == []
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+from utils.config_loader import DatabaseConfig
+from utils.db_migrations import apply_migrations
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Hot-path statements as issued by utils.db.Database, with the index each must use.
+HOT_QUERIES = {
+    "update_order_status": (
+        "UPDATE orders SET status=:status WHERE order_id=:order_id OR client_order_id=:order_id",
+        {"status": "FILLED", "order_id": "o-500"},
+        ("idx_orders_order_id", "idx_orders_client_order_id"),
+    ),
+    "update_order_fill": (
+        "UPDATE orders SET filled_size = filled_size + :inc WHERE (order_id = :order_id OR client_order_id = :order_id)",
+        {"inc": "1", "order_id": "o-500"},
+        ("idx_orders_order_id", "idx_orders_client_order_id"),
+    ),
+    "get_unhedged_size": (
+        "SELECT COALESCE(SUM(size - filled_size), 0) AS remaining FROM orders WHERE market_id = :market_id",
+        {"market_id": "m-5"},
+        ("idx_orders_market_open",),
+    ),
+    "fill_exists": (
+        "SELECT 1 FROM fills WHERE order_id=:order_id AND ts=:ts LIMIT 1",
+        {"order_id": "o-500", "ts": "2024-01-01T00:00:00"},
+        ("idx_fills_order_ts",),
+    ),
+    "recent_fill_keys": (
+        "SELECT exchange, COALESCE(fill_id, order_id) AS key_part, ts FROM fills WHERE ts >= :since",
+        {"since": "2024-01-01T00:00:00"},
+        ("idx_fills_ts",),
+    ),
+    "get_double_limit_by_order": (
+        "SELECT * FROM double_limits WHERE order_a_ref = :order_ref OR order_b_ref = :order_ref "
+        "OR client_order_id_a = :order_ref OR client_order_id_b = :order_ref LIMIT 1",
+        {"order_ref": "o-500"},
+        ("idx_double_limits_client_a", "idx_double_limits_client_b"),
+    ),
+}
+
+
+async def _migrated(tmp_path) -> Path:
+    db_file = tmp_path / "plans.db"
+    config = DatabaseConfig(backend="sqlite", dsn=f"sqlite+aiosqlite:///{db_file}")
+    await apply_migrations(config, base_path=PROJECT_ROOT)
+    return db_file
+
+
+def _plan(conn: sqlite3.Connection, sql: str, params) -> list[str]:
+    return [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def _assert_index_backed(conn: sqlite3.Connection) -> None:
+    for name, (sql, params, indexes) in HOT_QUERIES.items():
+        plan = _plan(conn, sql, params)
+        assert all(any(index in step for step in plan) for index in indexes), f"{name}: {plan}"
+        # a bare "SCAN <table>" step is a full table scan
+        assert not any(step.startswith("SCAN ") and "INDEX" not in step for step in plan), f"{name}: {plan}"
+
+
+@pytest.mark.asyncio
+async def test_hot_queries_are_index_backed(tmp_path):
+    db_file = await _migrated(tmp_path)
+    with sqlite3.connect(db_file) as conn:
+        conn.execute("ANALYZE")
+        _assert_index_backed(conn)
+
+
+@pytest.mark.stress
+@pytest.mark.asyncio
+async def test_hot_queries_stay_fast_with_a_million_rows(tmp_path):
+    db_file = await _migrated(tmp_path)
+    rows = 1_000_000
+    with sqlite3.connect(db_file) as conn:
+        conn.executemany(
+            "INSERT INTO orders (client_order_id, exchange, order_id, market_id, side, price, size, filled_size, status, ts) "
+            "VALUES (?, 'Opinion', ?, ?, 'BUY', 0.5, 10, 0, 'OPEN', '2024-01-01T00:00:00')",
+            ((f"c-{idx}", f"o-{idx}", f"m-{idx % 1000}") for idx in range(rows)),
+        )
+        conn.executemany(
+            "INSERT INTO fills (order_id, exchange, fill_id, size, price, side, ts) "
+            "VALUES (?, 'Opinion', ?, 1, 0.5, 'BUY', ?)",
+            ((f"o-{idx}", f"f-{idx}", f"2024-01-01T00:{idx % 60:02d}:00") for idx in range(rows)),
+        )
+        conn.commit()
+        conn.execute("ANALYZE")
+        _assert_index_backed(conn)
+        for name in ("update_order_status", "update_order_fill", "fill_exists"):
+            sql, params, _ = HOT_QUERIES[name]
+            started = time.perf_counter()
+            for _ in range(100):
+                conn.execute(sql, params)
+            assert (time.perf_counter() - started) / 100 < 0.005, name
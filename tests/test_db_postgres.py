@@ -0,0 +1,130 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from core.models import OrderStatus
+from models import canonical
+from utils.config_loader import DatabaseConfig
+from utils.db import Database
+
+
+class FakeTransaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def start(self):
+        self.conn.log.append("BEGIN")
+
+    async def commit(self):
+        self.conn.log.append("COMMIT")
+
+    async def rollback(self):
+        self.conn.log.append("ROLLBACK")
+
+
+class FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+        self.log = []
+
+    def transaction(self):
+        return FakeTransaction(self)
+
+    async def execute(self, sql, *args):
+        self.pool.active += 1
+        self.pool.peak = max(self.pool.peak, self.pool.active)
+        try:
+            await asyncio.sleep(0.02)
+            self.log.append((sql.split()[0], args))
+        finally:
+            self.pool.active -= 1
+
+
+class FakeAcquire:
+    def __init__(self, pool):
+        self.pool = pool
+        self.conn = None
+
+    def __await__(self):
+        return self.pool.take().__await__()
+
+    async def __aenter__(self):
+        self.conn = await self.pool.take()
+        return self.conn
+
+    async def __aexit__(self, *exc):
+        await self.pool.release(self.conn)
+
+
+class FakePool:
+    def __init__(self, size=4):
+        self.free = [FakeConnection(self) for _ in range(size)]
+        self.active = 0
+        self.peak = 0
+        self.released = 0
+
+    def acquire(self):
+        return FakeAcquire(self)
+
+    async def take(self):
+        return self.free.pop()
+
+    async def release(self, conn):
+        self.released += 1
+        self.free.append(conn)
+
+
+def _db(pool):
+    db = Database(DatabaseConfig(backend="postgres", dsn="postgresql://unused"))
+    db._pool = pool
+    return db
+
+
+@pytest.mark.asyncio
+async def test_postgres_queries_run_concurrently_across_pool():
+    pool = FakePool(size=4)
+    db = _db(pool)
+    await asyncio.gather(*(db.update_order_status(f"o-{idx}", OrderStatus.FILLED) for idx in range(4)))
+    assert pool.peak == 4
+
+
+@pytest.mark.asyncio
+async def test_postgres_transaction_is_per_connection_and_uses_positional_params():
+    pool = FakePool(size=2)
+    db = _db(pool)
+    conn = await db.begin_transaction()
+    await db.save_trade(
+        canonical.Trade(
+            entry_order_id="e",
+            hedge_order_id="h",
+            entry_exchange="Opinion",
+            hedge_exchange="Polymarket",
+            size=1,
+            price_entry=0.5,
+            price_hedge=0.4,
+            fees=0,
+            pnl_estimated=0.1,
+            ts=datetime(2024, 1, 1),
+        ),
+        tx_conn=conn,
+    )
+    await db.rollback_transaction(conn)
+    assert conn.log[0] == "BEGIN"
+    verb, args = conn.log[1]
+    assert verb == "INSERT" and args[0] == "e"
+    assert conn.log[-1] == "ROLLBACK"
+    assert pool.released == 1 and not db._pg_transactions
+
+
+def test_named_params_translation_is_cached():
+    from utils.db import _translate_named
+
+    db = _db(FakePool())
+    sql = "UPDATE t SET a = :a, cast_col = :b::text WHERE id = :id OR ref = :id"
+    _translate_named.cache_clear()
+    formatted, values = db._format_pg(sql, {"a": 1, "b": "x", "id": 7})
+    assert formatted == "UPDATE t SET a = $1, cast_col = $2::text WHERE id = $3 OR ref = $4"
+    assert values == (1, "x", 7, 7)
+    db._format_pg(sql, {"a": 2, "b": "y", "id": 8})
+    assert _translate_named.cache_info().hits == 1
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from core.exposure_ledger import ExposureLedger
+from core.models import ExchangeName, Order, OrderSide, OrderStatus, OrderType
+from core.position_tracker import PositionTracker
+from core.risk_manager import RiskManager
+from tests.test_risk_manager import _cfg
+from utils.config_loader import DatabaseConfig
+from utils.db import Database
+from utils.db_migrations import apply_migrations
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+class PositionDB:
+    def __init__(self):
+        self.upserts = []
+
+    async def upsert_position(self, event_id, net, price):
+        self.upserts.append((event_id, net, price))
+
+    async def get_position(self, event_id):
+        return None
+
+
+def test_ledger_tracks_orders_markets_and_commitments():
+    ledger = ExposureLedger()
+    ledger.commit("evt", 10)
+    ledger.track_order("o-1", "evt", "m-1", 10)
+    assert ledger.market_exposure("m-1") == {"open": 10, "filled": 0.0}
+
+    assert not ledger.record_fill("o-1", 4)
+    assert ledger.remaining("o-1") == 6
+    assert ledger.market_exposure("m-1") == {"open": 6, "filled": 4}
+    assert ledger.record_fill("o-1", 6)
+
+    ledger.track_order("o-2", "evt", "m-1", 5)
+    assert ledger.close_order("o-2") == 5
+    assert ledger.market_exposure("m-1")["open"] == 0
+    assert ledger.release("evt", 20) == 0
+    commitments = ledger.commitments()
+    commitments["evt"] = 99
+    assert ledger.committed("evt") == 0
+
+
+@pytest.mark.asyncio
+async def test_risk_and_positions_share_one_ledger():
+    ledger = ExposureLedger()
+    risk = RiskManager(_cfg(), ledger=ledger)
+    tracker = PositionTracker(PositionDB(), ledger=ledger)
+
+    await risk.check_limits("evt", 30)
+    await tracker.add_fill("evt", 30, 0.4, OrderSide.BUY)
+    await tracker.add_fill("evt", 10, 0.5, OrderSide.SELL)
+    await risk.decrement("evt", 30)
+
+    assert ledger.committed("evt") == 0
+    assert await tracker.get_net_position("evt") == 20
+    snapshot = ledger.snapshot()
+    assert snapshot["net_position"] == 20
+    assert snapshot["committed_total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_ledger_rebuilds_from_database(tmp_path):
+    config = DatabaseConfig(backend="sqlite", dsn=f"sqlite+aiosqlite:///{tmp_path / 'ledger.db'}")
+    await apply_migrations(config, base_path=PROJECT_ROOT)
+    db = Database(config)
+    await db.init()
+    try:
+        for order_id, status, filled in (("o-open", OrderStatus.OPEN, 4.0), ("o-done", OrderStatus.FILLED, 10.0)):
+            await db.save_order(
+                Order(
+                    order_id=order_id,
+                    client_order_id=f"cid-{order_id}",
+                    market_id="m-1",
+                    exchange=ExchangeName.OPINION,
+                    side=OrderSide.BUY,
+                    order_type=OrderType.LIMIT,
+                    price=0.5,
+                    size=10.0,
+                    filled_size=filled,
+                    status=status,
+                    created_at=datetime.now(tz=timezone.utc),
+                )
+            )
+        await db.upsert_position("evt", 5.0, 0.45)
+        await db.upsert_position("evt", 14.0, 0.5)
+        position = await db.get_position("evt")
+        assert position.net_position == 14.0 and position.last_price == 0.5
+
+        ledger = ExposureLedger()
+        await ledger.rebuild(db, market_events={"m-1": "evt"})
+    finally:
+        await db.close()
+
+    assert ledger.net_position("evt") == 14.0
+    assert ledger.remaining("o-open") == 6.0
+    assert ledger.order("o-done") is None
+    assert ledger.committed("evt") == 6.0
+    assert ledger.market_exposure("m-1")["open"] == 6.0
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core.fill_dedupe import FillDedupeStore
+from core.models import ExchangeName, Fill, OrderSide
+
+
+def build_fill(order_id: str, age_sec: float = 0.0) -> Fill:
+    return Fill(
+        order_id=order_id,
+        market_id="m-1",
+        exchange=ExchangeName.OPINION,
+        side=OrderSide.BUY,
+        price=0.5,
+        size=1,
+        fee=0.0,
+        timestamp=datetime.now(tz=timezone.utc) - timedelta(seconds=age_sec),
+    )
+
+
+class PersistedFills:
+    def __init__(self):
+        self.order_ids: set[str] = set()
+        self.lookups = 0
+
+    async def __call__(self, fill: Fill) -> bool:
+        self.lookups += 1
+        return fill.order_id in self.order_ids
+
+
+@pytest.mark.asyncio
+async def test_store_is_bounded_and_falls_back_to_db_for_evicted_keys():
+    persisted = PersistedFills()
+    store = FillDedupeStore(window_sec=3600, max_entries=3, exists=persisted)
+    fills = [build_fill(f"o-{i}", age_sec=10 - i) for i in range(5)]
+    for fill in fills:
+        assert await store.check_and_add(fill.order_id, fill)
+        persisted.order_ids.add(fill.order_id)
+    assert len(store) == 3
+    assert persisted.lookups == 0
+
+    # Evicted keys are no longer in memory; the DB still knows about them.
+    assert not await store.check_and_add("o-0", fills[0])
+    assert persisted.lookups == 1
+    # Recent keys never hit the DB.
+    assert not await store.check_and_add("o-4", fills[4])
+    assert persisted.lookups == 1
+    # A fill newer than anything evicted is new without a lookup.
+    fresh = build_fill("o-new")
+    assert await store.check_and_add("o-new", fresh)
+    assert persisted.lookups == 1
+
+
+@pytest.mark.asyncio
+async def test_store_expires_keys_outside_window():
+    persisted = PersistedFills()
+    store = FillDedupeStore(window_sec=60, exists=persisted)
+    old = build_fill("o-old", age_sec=120)
+    assert await store.check_and_add("o-old", old)
+    assert len(store) == 0
+    persisted.order_ids.add("o-old")
+    assert not await store.check_and_add("o-old", old)
+    assert persisted.lookups == 1
+
+
+@pytest.mark.asyncio
+async def test_loaded_window_defers_older_fills_to_db():
+    persisted = PersistedFills()
+    store = FillDedupeStore(window_sec=60, exists=persisted)
+    store.load({"recent"}, since=store.window_start())
+    assert not await store.check_and_add("recent", build_fill("recent"))
+    assert persisted.lookups == 0
+    assert await store.check_and_add("older", build_fill("older", age_sec=300))
+    assert persisted.lookups == 1
@@ -1,4 +1,5 @@
 import asyncio
+from pathlib import Path
 from types import SimpleNamespace
 
 import pytest
@@ -7,7 +8,9 @@ from core.hedger import Hedger, HedgeLegRequest
 from core.models import ExchangeName, OrderBook, OrderBookEntry, OrderSide, Trade
 from core.risk_manager import RiskManager
 from exchanges.orderbook_manager import OrderbookManager
-from utils.config_loader import MarketHedgeConfig
+from utils.config_loader import DatabaseConfig, MarketHedgeConfig
+from utils.db import Database
+from utils.db_migrations import apply_migrations
 from utils.logger import BotLogger
 
 
@@ -109,3 +112,70 @@ async def test_hedger_reduces_size_on_slippage():
     assert notifier.messages, "notifier should receive update"
     assert db.commit_called and not db.rollback_called
 
+
+
+class SlowExchange(DummyExchange):
+    async def place_market_order(self, market_id: str, side: OrderSide, size: float, client_order_id=None):
+        await asyncio.sleep(0.05)
+        return await super().place_market_order(market_id, side, size, client_order_id)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_hedges_share_sqlite_writer(tmp_path):
+    config = MarketHedgeConfig(
+        enabled=True,
+        hedge_ratio=1.0,
+        max_slippage_market_hedge=0.5,
+        min_spread_for_entry=0.002,
+        max_position_size_per_market=1000,
+        max_position_size_per_event=5000,
+        cancel_unfilled_after_ms=1000,
+        allow_partial_fill_hedge=True,
+        hedge_strategy="FULL",
+    )
+    db_config = DatabaseConfig(backend="sqlite", dsn=f"sqlite+aiosqlite:///{tmp_path / 'hedge.db'}")
+    await apply_migrations(db_config, base_path=Path(__file__).resolve().parent.parent)
+    db = Database(db_config)
+    await db.init()
+    orderbook = OrderBook(market_id="secondary", bids=[], asks=[OrderBookEntry(price=0.5, size=500)])
+    hedger = Hedger(config, RiskManager(config, BotLogger("test")), OrderbookManager(), db, DummyNotifier())
+    try:
+        results = await asyncio.gather(
+            *(
+                hedger.hedge(
+                    legs=[HedgeLegRequest(exchange=ExchangeName.OPINION, client=SlowExchange(orderbook), market_id="secondary")],
+                    event_id="event-1",
+                    side=OrderSide.BUY,
+                    size=10,
+                    reference_price=0.45,
+                    entry_order_id=f"order-{i}",
+                    entry_exchange=ExchangeName.POLYMARKET,
+                )
+                for i in range(3)
+            )
+        )
+        rows = await db._fetchall("SELECT entry_order_id FROM trades", {})
+    finally:
+        await db.close()
+    assert all(results)
+    assert sorted(row["entry_order_id"] for row in rows) == ["order-0", "order-1", "order-2"]
+
+
+@pytest.mark.asyncio
+async def test_writes_from_other_tasks_wait_for_open_transaction(tmp_path):
+    db_config = DatabaseConfig(backend="sqlite", dsn=f"sqlite+aiosqlite:///{tmp_path / 'tx.db'}")
+    await apply_migrations(db_config, base_path=Path(__file__).resolve().parent.parent)
+    db = Database(db_config)
+    await db.init()
+    try:
+        await db.begin_transaction()
+        await db.record_incident("INFO", "inside", {})
+        outside = asyncio.create_task(db.record_incident("INFO", "outside", {}))
+        await asyncio.sleep(0.01)
+        assert not outside.done()
+        await db.rollback_transaction()
+        await outside
+        rows = await db._fetchall("SELECT message FROM incidents", {})
+    finally:
+        await db.close()
+    assert [row["message"] for row in rows] == ["outside"]
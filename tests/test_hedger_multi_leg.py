@@ -144,7 +144,8 @@ async def test_multi_leg_failure_rolls_back_and_incident():
             entry_exchange=ExchangeName.POLYMARKET,
         )
 
-    assert db.rollback_called, "transaction should rollback on failure"
+    assert not db.begin_called, "no transaction is held across the failed exchange call"
+    assert not db.trades
     assert db.incidents, "incident should be recorded"
     assert notifier.messages, "failure notification expected"
 
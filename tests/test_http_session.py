@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import aiohttp
+import pytest
+
+from core.models import AccountCredentials, ExchangeName
+from utils.config_loader import HttpConfig
+from utils.http_session import SessionFactory
+from utils.proxy_handler import ProxyHandler
+
+
+def _account(account_id: str, exchange: ExchangeName, proxy: str | None = None) -> AccountCredentials:
+    return AccountCredentials(account_id=account_id, exchange=exchange, api_key="k", secret_key="s", proxy=proxy)
+
+
+@pytest.mark.asyncio
+async def test_factory_shares_connector_per_host_and_proxy():
+    factory = SessionFactory(HttpConfig(limit_per_host=4, keepalive_timeout_sec=15, ttl_dns_cache_sec=120))
+    try:
+        first = await factory.session("clob.polymarket.com", "http://proxy-a:8080")
+        second = await factory.session("clob.polymarket.com", "http://proxy-a:8080")
+        other_proxy = await factory.session("clob.polymarket.com", "http://proxy-b:8080")
+        other_host = await factory.session("api.telegram.org")
+
+        # Accounts share the pool but never a session, so cookies and headers stay per caller.
+        assert first is not second
+        assert first.connector is second.connector
+        assert isinstance(first.cookie_jar, aiohttp.DummyCookieJar)
+        assert first.connector is not other_proxy.connector
+        assert first.connector is not other_host.connector
+        assert first.connector.limit_per_host == 4
+
+        stats = {(pool["host"], pool["proxy"]): pool for pool in factory.stats()}
+        assert len(stats) == 3
+        assert stats[("clob.polymarket.com", "http://proxy-a:8080")]["users"] == 2
+        assert stats[("api.telegram.org", "none")]["in_use"] == 0
+    finally:
+        await factory.close()
+    assert first.closed and second.closed and first.connector is None
+    assert factory.stats() == []
+
+
+@pytest.mark.asyncio
+async def test_proxy_handler_reuses_pool_for_accounts_behind_same_proxy():
+    factory = SessionFactory()
+    handler = ProxyHandler(session_factory=factory)
+    try:
+        a = await handler.get_session(_account("pm-1", ExchangeName.POLYMARKET, " http://proxy:1 "))
+        b = await handler.get_session(_account("pm-2", ExchangeName.POLYMARKET, "http://proxy:1"))
+        c = await handler.get_session(_account("op-1", ExchangeName.OPINION, "http://proxy:1"))
+        assert a is not b
+        assert a.connector is b.connector
+        assert c.connector is not a.connector
+        assert await handler.get_session(_account("pm-1", ExchangeName.POLYMARKET, "http://proxy:1")) is a
+        assert handler.get_proxy_for_account("pm-1") == "http://proxy:1"
+        await handler.close()
+        # The handler does not own a shared factory, so its pools stay open.
+        assert not a.closed
+    finally:
+        await factory.close()
+    assert a.closed
+
+
+@pytest.mark.asyncio
+async def test_websocket_sessions_do_not_share_rest_pool():
+    factory = SessionFactory(HttpConfig(limit_per_host=2))
+    try:
+        rest = await factory.session("Polymarket", "http://proxy:1", ssl=False)
+        ws = await factory.session("Polymarket", "http://proxy:1", ssl=False, websocket=True)
+        assert ws is not rest
+        assert ws.connector is not rest.connector
+        assert rest.connector.limit_per_host == 2
+        assert ws.connector.limit_per_host == 0
+        assert ws.timeout.total is None
+        assert sorted(pool["websocket"] for pool in factory.stats()) == [False, True]
+    finally:
+        await factory.close()
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+from dataclasses import replace
 from datetime import datetime
 from decimal import Decimal
 from pathlib import Path
@@ -7,6 +9,7 @@ from pathlib import Path
 import aiosqlite
 import pytest
 
+from core.models import DoubleLimitState
 from models import canonical
 from utils.config_loader import DatabaseConfig
 from utils.db import Database
@@ -81,3 +84,192 @@ async def test_migrations_and_crud(tmp_path):
 
     await db.close()
 
+
+
+@pytest.mark.asyncio
+async def test_write_behind_groups_audit_writes_and_flushes_on_close(tmp_path):
+    db_file = tmp_path / "wb.db"
+    config = DatabaseConfig(
+        backend="sqlite",
+        dsn=f"sqlite+aiosqlite:///{db_file}",
+        write_behind=True,
+        write_behind_max_batch=50,
+        write_behind_flush_ms=20,
+    )
+    project_root = Path(__file__).resolve().parent.parent
+    await apply_migrations(config, base_path=project_root)
+    db = Database(config)
+    await db.init()
+
+    for idx in range(120):
+        await db.log_order_event(f"order-{idx}", "placed", {"idx": idx})
+    await db.record_incident("WARN", "queued", {"k": 1})
+    assert db.status_snapshot()["write_queue"] > 0
+
+    await db.flush()
+    assert db.status_snapshot()["write_queue"] == 0
+    async with aiosqlite.connect(db_file) as conn:
+        cursor = await conn.execute("SELECT COUNT(*) FROM order_events")
+        assert (await cursor.fetchone())[0] == 120
+
+    await db.log_order_event("order-last", "placed", {})
+    await db.close()
+    async with aiosqlite.connect(db_file) as conn:
+        cursor = await conn.execute("SELECT COUNT(*) FROM order_events")
+        assert (await cursor.fetchone())[0] == 121
+        cursor = await conn.execute("SELECT COUNT(*) FROM incidents")
+        assert (await cursor.fetchone())[0] == 1
+
+
+@pytest.mark.asyncio
+async def test_sqlite_wal_reads_do_not_wait_for_writer(tmp_path):
+    db_file = tmp_path / "wal.db"
+    config = DatabaseConfig(backend="sqlite", dsn=f"sqlite+aiosqlite:///{db_file}", sqlite_wal=True)
+    project_root = Path(__file__).resolve().parent.parent
+    await apply_migrations(config, base_path=project_root)
+    db = Database(config)
+    await db.init()
+    await db.save_double_limit_pair("dl-1", "pair-1", "a-1", "b-1", "Opinion", "Polymarket", "ca-1", "cb-1")
+
+    async with aiosqlite.connect(db_file) as conn:
+        cursor = await conn.execute("PRAGMA journal_mode")
+        assert (await cursor.fetchone())[0] == "wal"
+
+    # hold the writer lock as an in-flight write would; the read must still complete
+    async with db._lock:
+        record = await asyncio.wait_for(db.get_double_limit_by_order("b-1"), timeout=1.0)
+    assert record["id"] == "dl-1"
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_wal_reads_see_open_transaction(tmp_path):
+    db_file = tmp_path / "wal_tx.db"
+    config = DatabaseConfig(backend="sqlite", dsn=f"sqlite+aiosqlite:///{db_file}", sqlite_wal=True)
+    project_root = Path(__file__).resolve().parent.parent
+    await apply_migrations(config, base_path=project_root)
+    db = Database(config)
+    await db.init()
+    await db.save_double_limit_pair("dl-1", "pair-1", "a-1", "b-1", "Opinion", "Polymarket", "ca-1", "cb-1")
+
+    await db.begin_transaction()
+    await db.update_double_limit_state("dl-1", DoubleLimitState.TRIGGERED, triggered_order_id="a-1")
+    record = await db.get_double_limit_by_order("b-1")
+    assert record["state"] == DoubleLimitState.TRIGGERED.value
+    await db.commit_transaction()
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_in_transaction_leaves_no_rows(tmp_path):
+    db_file = tmp_path / "batch_tx.db"
+    config = DatabaseConfig(backend="sqlite", dsn=f"sqlite+aiosqlite:///{db_file}")
+    project_root = Path(__file__).resolve().parent.parent
+    await apply_migrations(config, base_path=project_root)
+    db = Database(config)
+    await db.init()
+    insert = "INSERT INTO incidents (level, message, details) VALUES (:level, :message, '{}')"
+    try:
+        await db.begin_transaction()
+        await db._execute(insert, {"level": "INFO", "message": "before"})
+        with pytest.raises(Exception):
+            await db._execute_batch(
+                [
+                    (insert, {"level": "INFO", "message": "batched"}),
+                    ("INSERT INTO missing_table (x) VALUES (1)", {}),
+                ]
+            )
+        await db._execute_batch([(insert, {"level": "INFO", "message": "retried"})])
+        await db.commit_transaction()
+        rows = await db._fetchall("SELECT message FROM incidents ORDER BY id", {})
+    finally:
+        await db.close()
+    assert [row["message"] for row in rows] == ["before", "retried"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_inserts_match_single_row_writes(tmp_path):
+    db_file = tmp_path / "bulk.db"
+    config = DatabaseConfig(backend="sqlite", dsn=f"sqlite+aiosqlite:///{db_file}")
+    project_root = Path(__file__).resolve().parent.parent
+    await apply_migrations(config, base_path=project_root)
+    db = Database(config)
+    await db.init()
+    now = datetime.utcnow()
+    await db.save_order(
+        canonical.Order(
+            client_order_id="c-1",
+            exchange="Opinion",
+            order_id="order-1",
+            market_id="m-1",
+            side="BUY",
+            price=Decimal("0.5"),
+            size=Decimal("100"),
+            ts=now,
+        )
+    )
+    fills = [
+        canonical.Fill(
+            order_id="order-1",
+            exchange="Opinion",
+            fill_id=f"fill-{idx}",
+            size=Decimal("10"),
+            price=Decimal("0.5"),
+            side="BUY",
+            ts=now,
+        )
+        for idx in range(3)
+    ]
+    await db.save_fills_bulk(fills)
+    await db.log_order_events_bulk([("order-1", "fill", {"idx": idx}) for idx in range(3)])
+    run_ids = await db.record_simulated_runs_bulk([("pair-1", 1.0, {}, 0.1, None), ("pair-2", 2.0, {}, None, "n")])
+
+    assert len(set(run_ids)) == 2
+    assert await db.get_unhedged_size("m-1") == Decimal("70")
+    async with aiosqlite.connect(db_file) as conn:
+        for table, expected in (("fills", 3), ("order_events", 3), ("simulated_runs", 2)):
+            cursor = await conn.execute(f"SELECT COUNT(*) FROM {table}")
+            assert (await cursor.fetchone())[0] == expected
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_fill_writes_are_idempotent(tmp_path):
+    db_file = tmp_path / "idempotent.db"
+    config = DatabaseConfig(backend="sqlite", dsn=f"sqlite+aiosqlite:///{db_file}")
+    project_root = Path(__file__).resolve().parent.parent
+    await apply_migrations(config, base_path=project_root)
+    db = Database(config)
+    await db.init()
+    now = datetime.utcnow()
+    await db.save_order(
+        canonical.Order(
+            client_order_id="c-1",
+            exchange="Opinion",
+            order_id="order-1",
+            market_id="m-1",
+            side="BUY",
+            price=Decimal("0.5"),
+            size=Decimal("100"),
+            ts=now,
+        )
+    )
+    fill = canonical.Fill(
+        order_id="order-1",
+        exchange="Opinion",
+        fill_id="fill-1",
+        size=Decimal("10"),
+        price=Decimal("0.5"),
+        side="BUY",
+        ts=now,
+    )
+    assert await db.update_order_fill("order-1", Decimal("10"), fill)
+    # A retried or replayed write of the same fill is a no-op, alone or inside a batch.
+    assert not await db.update_order_fill("order-1", Decimal("10"), fill)
+    await db.save_fills_bulk([fill, replace(fill, fill_id="fill-2")])
+
+    assert await db.get_unhedged_size("m-1") == Decimal("80")
+    async with aiosqlite.connect(db_file) as conn:
+        cursor = await conn.execute("SELECT COUNT(*) FROM fills")
+        assert (await cursor.fetchone())[0] == 2
+    await db.close()
@@ -1,3 +1,5 @@
+import asyncio
+import time
 from datetime import datetime, timezone
 
 import pytest
@@ -425,3 +427,246 @@ async def test_double_limit_secondary_fill_cancels_primary_once():
     assert exchanges[ExchangeName.OPINION].cancelled == [primary_order_id]
     assert len(hedger.calls) == 1
 
+
+
+class SlowDB(DummyDB):
+    def __init__(self):
+        super().__init__()
+        self.stored_at = None
+
+    async def update_order_fill(self, order_id, increment, fill):
+        await asyncio.sleep(0.05)
+        await super().update_order_fill(order_id, increment, fill)
+        self.stored_at = time.monotonic()
+
+
+class StampedHedger(DummyHedger):
+    def __init__(self):
+        super().__init__()
+        self.called_at = None
+
+    async def hedge(self, *args, **kwargs):
+        self.called_at = time.monotonic()
+        return await super().hedge(*args, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_latency_first_hedges_before_bookkeeping():
+    db = SlowDB()
+    tracker = DummyTracker()
+    hedger = StampedHedger()
+    manager = OrderManager(
+        {ExchangeName.POLYMARKET: object(), ExchangeName.OPINION: object()},
+        db,
+        tracker,
+        hedger,
+        DummyRiskManager(),
+        event_id="event-fast",
+        market_map={
+            ExchangeName.POLYMARKET: "poly-market",
+            ExchangeName.OPINION: "opinion-token",
+        },
+        mapper=DummyMapper(poly_to_op={"poly-market": "opinion-token"}),
+        latency_first=True,
+    )
+    manager.set_routing(ExchangeName.POLYMARKET, ExchangeName.OPINION)
+    fill = Fill(
+        order_id="fast-1",
+        market_id="poly-market",
+        exchange=ExchangeName.POLYMARKET,
+        side=OrderSide.BUY,
+        price=0.5,
+        size=5,
+        fee=0.0,
+        timestamp=datetime.now(tz=timezone.utc),
+    )
+    await manager.handle_fill(ExchangeName.POLYMARKET, fill)
+
+    assert len(hedger.calls) == 1
+    # The hedge went out while the fill row was still being written; the row is stored by the
+    # time the fill counts as handled.
+    assert hedger.called_at < db.stored_at
+    assert db.updated[0][0] == "fast-1"
+    assert manager.latency_snapshot()["count"] == 1
+
+    await manager.drain_bookkeeping()
+    assert tracker.fills == [("event-fast", 5, 0.5, OrderSide.BUY)]
+    assert [stage for _, stage, _ in db.events] == ["fill", "hedge"]
+    assert "fill_to_hedge_ms" in db.events[-1][2]
+    assert db.events[-1][2]["cancel"]["skipped"]
+
+
+class IncidentDB(DummyDB):
+    def __init__(self):
+        super().__init__()
+        self.incidents = []
+
+    async def record_incident(self, level, message, details):
+        self.incidents.append((level, message, details))
+
+
+class BrokenTracker(DummyTracker):
+    async def add_fill(self, *_args):
+        raise RuntimeError("positions unavailable")
+
+
+@pytest.mark.asyncio
+async def test_failed_deferred_bookkeeping_is_recorded():
+    db = IncidentDB()
+    manager = OrderManager(
+        {ExchangeName.POLYMARKET: object(), ExchangeName.OPINION: object()},
+        db,
+        BrokenTracker(),
+        DummyHedger(),
+        DummyRiskManager(),
+        event_id="event-fast",
+        market_map={
+            ExchangeName.POLYMARKET: "poly-market",
+            ExchangeName.OPINION: "opinion-token",
+        },
+        mapper=DummyMapper(poly_to_op={"poly-market": "opinion-token"}),
+        latency_first=True,
+    )
+    manager._cancel_backoff_base = 0
+    manager.set_routing(ExchangeName.POLYMARKET, ExchangeName.OPINION)
+    fill = Fill(
+        order_id="fast-2",
+        market_id="poly-market",
+        exchange=ExchangeName.POLYMARKET,
+        side=OrderSide.BUY,
+        price=0.5,
+        size=5,
+        fee=0.0,
+        timestamp=datetime.now(tz=timezone.utc),
+    )
+    await manager.handle_fill(ExchangeName.POLYMARKET, fill)
+    await manager.drain_bookkeeping()
+
+    assert db.updated[0][0] == "fast-2"
+    assert [(level, message, details["job"]) for level, message, details in db.incidents] == [
+        ("ERROR", "bookkeeping_failure", "record_fill")
+    ]
+
+
+class SlowPlaceExchange(StubExchange):
+    def __init__(self, name: ExchangeName, delay: float, fail: bool = False):
+        super().__init__(name)
+        self.delay = delay
+        self.fail = fail
+
+    async def place_limit_order(self, market_id, side, price, size, client_order_id=None):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("venue rejected order")
+        return await super().place_limit_order(market_id, side, price, size, client_order_id=client_order_id)
+
+
+def _double_limit_manager(exchanges, db):
+    manager = OrderManager(
+        exchanges,
+        db,
+        DummyTracker(),
+        DummyHedger(),
+        DummyRiskManager(),
+        event_id="event-dl",
+        market_map={
+            ExchangeName.OPINION: "opinion-token",
+            ExchangeName.POLYMARKET: "poly-market",
+        },
+        double_limit_enabled=True,
+    )
+    manager.set_routing(ExchangeName.OPINION, ExchangeName.POLYMARKET)
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_double_limit_legs_are_placed_concurrently():
+    exchanges = {
+        ExchangeName.OPINION: SlowPlaceExchange(ExchangeName.OPINION, delay=0.1),
+        ExchangeName.POLYMARKET: SlowPlaceExchange(ExchangeName.POLYMARKET, delay=0.1),
+    }
+    manager = _double_limit_manager(exchanges, DoubleLimitDB())
+    placed = []
+    manager.log_hooks.register("double_limit_placed", placed.append)
+
+    started = time.monotonic()
+    await manager.place_double_limit(account="acct-1", pair=None, price_a=0.5, size_a=10, price_b=0.51, size_b=10)
+    assert time.monotonic() - started < 0.18
+    assert placed[0]["placement_skew_ms"] < 50
+    assert placed[0]["time_to_quote_ms"] >= 100
+
+
+@pytest.mark.asyncio
+async def test_double_limit_rolls_back_surviving_leg():
+    exchanges = {
+        ExchangeName.OPINION: SlowPlaceExchange(ExchangeName.OPINION, delay=0.0),
+        ExchangeName.POLYMARKET: SlowPlaceExchange(ExchangeName.POLYMARKET, delay=0.02, fail=True),
+    }
+    db = DoubleLimitDB()
+    manager = _double_limit_manager(exchanges, db)
+
+    with pytest.raises(RuntimeError, match="venue rejected order"):
+        await manager.place_double_limit(account="acct-1", pair=None, price_a=0.5, size_a=10, price_b=0.51, size_b=10)
+    assert exchanges[ExchangeName.OPINION].cancelled == [exchanges[ExchangeName.OPINION].orders[0].order_id]
+    assert db.double_limits == {}
+
+
+class FlakyHedger(DummyHedger):
+    def __init__(self, fail_order_ids):
+        super().__init__()
+        self.fail_order_ids = set(fail_order_ids)
+
+    async def hedge(self, *args, **kwargs):
+        if kwargs["entry_order_id"] in self.fail_order_ids:
+            self.fail_order_ids.discard(kwargs["entry_order_id"])
+            raise ConnectionError("hedge venue unreachable")
+        return await super().hedge(*args, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_failed_hedge_does_not_stop_batch_and_is_retried():
+    db = IncidentDB()
+    tracker = DummyTracker()
+    hedger = FlakyHedger({"o1"})
+    manager = OrderManager(
+        {ExchangeName.POLYMARKET: object(), ExchangeName.OPINION: object()},
+        db,
+        tracker,
+        hedger,
+        DummyRiskManager(),
+        event_id="event-batch",
+        market_map={
+            ExchangeName.POLYMARKET: "poly-market",
+            ExchangeName.OPINION: "opinion-token",
+        },
+        mapper=DummyMapper(poly_to_op={"poly-market": "opinion-token"}),
+    )
+    manager.set_routing(ExchangeName.POLYMARKET, ExchangeName.OPINION)
+    fills = [
+        Fill(
+            order_id=order_id,
+            market_id="poly-market",
+            exchange=ExchangeName.POLYMARKET,
+            side=OrderSide.BUY,
+            price=0.5,
+            size=5,
+            fee=0.0,
+            timestamp=datetime.now(tz=timezone.utc),
+        )
+        for order_id in ("o1", "o2", "o3")
+    ]
+
+    with pytest.raises(ConnectionError):
+        await manager.handle_fills(ExchangeName.POLYMARKET, fills)
+
+    assert [call["entry_order_id"] for call in hedger.calls] == ["o2", "o3"]
+    assert [(message, details["order_id"]) for _, message, details in db.incidents] == [
+        ("hedge_step_failure", "o1")
+    ]
+    assert len(tracker.fills) == 3
+
+    # The replay hedges only the failed fill and does not book any fill a second time.
+    await manager.handle_fills(ExchangeName.POLYMARKET, fills)
+    assert [call["entry_order_id"] for call in hedger.calls] == ["o2", "o3", "o1"]
+    assert len(tracker.fills) == 3
+    assert len(db.updated) == 3
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from core.models import ExchangeName, OrderBook, OrderBookEntry
+from exchanges.orderbook_cache import OrderbookCache
+
+
+class CountingClient:
+    def __init__(self, delay: float = 0.0):
+        self.calls = 0
+        self.delay = delay
+
+    async def get_orderbook(self, market_id: str) -> OrderBook:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return OrderBook(
+            market_id=market_id,
+            bids=[OrderBookEntry(price=0.4, size=10)],
+            asks=[OrderBookEntry(price=0.6, size=10)],
+        )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_readers_share_one_fetch():
+    cache = OrderbookCache(refresh_interval=60)
+    client = CountingClient(delay=0.01)
+    books = await asyncio.gather(
+        *(cache.get_orderbook(ExchangeName.POLYMARKET, "tok", client) for _ in range(10))
+    )
+    assert client.calls == 1
+    assert all(book.market_id == "tok" for book in books)
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_refresher_is_shared_and_released():
+    cache = OrderbookCache(refresh_interval=0.05)
+    client = CountingClient()
+    cache.register(ExchangeName.OPINION, "m-1", client)
+    cache.register(ExchangeName.OPINION, "m-1", client)
+    await asyncio.sleep(0.12)
+    assert cache.snapshot()["refreshers"] == 1
+    # two registrations, one refresher: roughly one fetch per interval rather than two
+    assert 1 <= client.calls <= 4
+
+    await cache.release(ExchangeName.OPINION, "m-1")
+    assert cache.get(ExchangeName.OPINION, "m-1") is not None
+    await cache.release(ExchangeName.OPINION, "m-1")
+    assert cache.get(ExchangeName.OPINION, "m-1") is None
+    calls = client.calls
+    await asyncio.sleep(0.1)
+    assert client.calls == calls
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_missing_entry_without_client_raises():
+    cache = OrderbookCache()
+    with pytest.raises(LookupError):
+        await cache.get_orderbook(ExchangeName.OPINION, "unknown")
+
+
+def _book(bid: float, ask: float, depth_size: float = 10) -> OrderBook:
+    return OrderBook(
+        market_id="m-1",
+        bids=[OrderBookEntry(price=bid, size=10), OrderBookEntry(price=bid - 0.01, size=depth_size)],
+        asks=[OrderBookEntry(price=ask, size=10)],
+    )
+
+
+@pytest.mark.asyncio
+async def test_watchers_fire_only_on_top_of_book_change():
+    cache = OrderbookCache()
+    key = (ExchangeName.OPINION, "m-1")
+    event = cache.watch([key])
+    cache.update(*key, _book(0.4, 0.6))
+    assert event.is_set()
+
+    event.clear()
+    cache.update(*key, _book(0.4, 0.6, depth_size=99))
+    assert not event.is_set()
+
+    cache.update(*key, _book(0.41, 0.6))
+    assert event.is_set()
+
+    cache.unwatch([key], event)
+    event.clear()
+    cache.update(*key, _book(0.42, 0.6))
+    assert not event.is_set()
+
+
+@pytest.mark.asyncio
+async def test_unregistered_reads_are_not_cached():
+    cache = OrderbookCache(refresh_interval=60)
+    client = CountingClient()
+    book = await cache.get_orderbook(ExchangeName.OPINION, "probe", client)
+    assert book.market_id == "probe"
+    assert cache.get(ExchangeName.OPINION, "probe") is None
+    assert cache.snapshot()["markets"] == 0
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_refetched():
+    cache = OrderbookCache(refresh_interval=60)
+    client = CountingClient()
+    cache.register(ExchangeName.OPINION, "m-1", client)
+    await asyncio.sleep(0.01)
+    assert client.calls == 1
+    # The refresher is sleeping for a full interval; pretend it stalled long ago.
+    cache.get(ExchangeName.OPINION, "m-1").received_at -= cache.stale_after + 1
+    await cache.get_entry(ExchangeName.OPINION, "m-1", max_age=cache.stale_after)
+    assert client.calls == 2
+    await cache.close()
@@ -1,6 +1,10 @@
+import asyncio
+import time
+
 import pytest
 
-from core.models import OrderSide
+from core.models import ExchangeName, OrderSide
+from core.spread_analyzer import SpreadAnalyzer
 from exchanges.orderbook_manager import OrderbookManager
 
 
@@ -29,3 +33,96 @@ def test_get_best_price_for_size():
     price = manager.get_best_price_for_size(orderbook, OrderSide.BUY, 8)
     assert price == 0.54
 
+
+def test_compact_book_matches_list_book():
+    manager = OrderbookManager()
+    bids = [{"price": 0.48, "size": 10}, {"price": 0.46, "size": 20}, {"price": 0.40, "size": 5}]
+    asks = [{"price": 0.52, "size": 5}, {"price": 0.54, "size": 10}, {"price": 0.60, "size": 30}]
+    book = manager.parse_orderbook("m", bids, asks)
+    compact = manager.build_compact("m", bids, asks)
+    assert compact.bids[0].price == 0.48
+    assert [level.size for level in compact.asks] == [5, 10, 30]
+    for side in (OrderSide.BUY, OrderSide.SELL):
+        for size in (0, 3, 5, 12, 15, 40, 100):
+            assert manager.estimate_slippage(compact, side, size) == pytest.approx(
+                manager.estimate_slippage(book, side, size)
+            )
+            assert manager.get_best_price_for_size(compact, side, size) == manager.get_best_price_for_size(
+                book, side, size
+            )
+    assert manager.compact(book).to_orderbook() == book
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_max_size_within_slippage_is_exact(compact):
+    manager = OrderbookManager()
+    build = manager.build_compact if compact else manager.parse_orderbook
+    orderbook = build(
+        "m",
+        bids=[{"price": 0.50, "size": 10}, {"price": 0.45, "size": 10}, {"price": 0.30, "size": 50}],
+        asks=[{"price": 0.50, "size": 10}, {"price": 0.55, "size": 10}, {"price": 0.70, "size": 50}],
+    )
+    # buying: 10 @ 0.50 + 10 @ 0.55 + x @ 0.70 has VWAP 0.56 at x = 5
+    size = manager.max_size_within_slippage(orderbook, OrderSide.BUY, 0.06, size=100)
+    assert size == pytest.approx(25, rel=1e-6)
+    _, slippage = manager.estimate_slippage(orderbook, OrderSide.BUY, size)
+    assert slippage <= 0.06
+    _, slippage = manager.estimate_slippage(orderbook, OrderSide.BUY, size * 1.001)
+    assert slippage > 0.06
+
+    size = manager.max_size_within_slippage(orderbook, OrderSide.SELL, 0.06, size=100)
+    _, slippage = manager.estimate_slippage(orderbook, OrderSide.SELL, size)
+    assert slippage <= 0.06
+    assert size == pytest.approx(25, rel=1e-6)
+
+    assert manager.max_size_within_slippage(orderbook, OrderSide.BUY, 0.06, size=5) == 5
+    assert manager.max_size_within_slippage(orderbook, OrderSide.BUY, 1.0) == pytest.approx(70)
+
+
+class SlowClient:
+    def __init__(self, delay: float, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+
+    async def get_orderbook(self, market_id: str):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("boom")
+        return OrderbookManager().parse_orderbook(
+            market_id,
+            bids=[{"price": 0.55, "size": 10}],
+            asks=[{"price": 0.45, "size": 10}],
+        )
+
+
+@pytest.mark.asyncio
+async def test_fetch_pair_snapshot_is_concurrent_and_isolates_failures():
+    manager = OrderbookManager()
+    started = time.monotonic()
+    snapshot = await manager.fetch_pair_snapshot(SlowClient(0.05), "a", SlowClient(0.05), "b")
+    assert time.monotonic() - started < 0.09
+    assert snapshot.ok
+    assert snapshot.skew is not None and snapshot.skew < 0.02
+
+    snapshot = await manager.fetch_pair_snapshot(SlowClient(0.0, fail=True), "a", SlowClient(1.0), "b", timeout=0.05)
+    assert not snapshot.ok
+    assert snapshot.primary.error == "boom"
+    assert "timed out" in snapshot.secondary.error
+
+
+@pytest.mark.asyncio
+async def test_evaluate_snapshot_rejects_skewed_legs():
+    manager = OrderbookManager()
+    analyzer = SpreadAnalyzer()
+    snapshot = await manager.fetch_pair_snapshot(SlowClient(0.0), "a", SlowClient(0.0), "b")
+    kwargs = dict(
+        primary_exchange=ExchangeName.OPINION,
+        secondary_exchange=ExchangeName.POLYMARKET,
+        primary_fees=None,
+        secondary_fees=None,
+        size=1.0,
+    )
+    assert await analyzer.evaluate_snapshot(snapshot, max_leg_skew=0.5, **kwargs)
+    snapshot.secondary.received_at = snapshot.primary.received_at + 1.0
+    assert await analyzer.evaluate_snapshot(snapshot, max_leg_skew=0.5, **kwargs) is None
+    assert analyzer.last_sample["rejected"] == "leg_skew"
@@ -0,0 +1,130 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from core.models import ExchangeName, Fill, OrderSide
+from core.pair_controller import PairController, PairRuntime
+from tests.test_pair_controller_accounts import _build_settings
+from utils.logger import BotLogger
+
+
+class SlowOrderManager:
+    def __init__(self, market_map, delays):
+        self.market_map = market_map
+        self.delays = delays
+        self.events = []
+
+    async def handle_fill(self, exchange, fill):
+        self.events.append(("start", fill.order_id, fill.size))
+        await asyncio.sleep(self.delays.get(fill.order_id, 0.0))
+        self.events.append(("end", fill.order_id, fill.size))
+
+    async def handle_fills(self, exchange, fills):
+        for fill in fills:
+            await self.handle_fill(exchange, fill)
+
+
+def build_fill(order_id: str, market_id: str, size: float = 1.0) -> Fill:
+    return Fill(
+        order_id=order_id,
+        market_id=market_id,
+        exchange=ExchangeName.OPINION,
+        side=OrderSide.BUY,
+        price=0.5,
+        size=size,
+        fee=0.0,
+        timestamp=datetime.now(tz=timezone.utc),
+    )
+
+
+def build_controller(managers) -> PairController:
+    controller = PairController(
+        settings=_build_settings(),
+        db=object(),
+        position_tracker=object(),
+        hedger=object(),
+        risk_manager=object(),
+        logger=BotLogger("pair_controller_test"),
+        stop_event=asyncio.Event(),
+        spread_analyzer=object(),
+        orderbook_manager=object(),
+        mapper=None,
+        notifier=None,
+        account_pools={},
+        clients_by_id={},
+    )
+    for pair_id, manager in managers.items():
+        controller._pairs[pair_id] = PairRuntime(
+            pair_id=pair_id,
+            config=None,
+            order_manager=manager,
+            stop_event=asyncio.Event(),
+            task=None,
+            source="static",
+            size_override=None,
+            fingerprint="",
+        )
+    controller._reindex()
+    return controller
+
+
+@pytest.mark.asyncio
+async def test_dispatch_runs_pairs_concurrently_and_orders_serially():
+    slow = SlowOrderManager({ExchangeName.OPINION: "m-slow"}, {"slow-order": 0.2})
+    fast = SlowOrderManager({ExchangeName.OPINION: "m-fast"}, {})
+    controller = build_controller({"slow": slow, "fast": fast})
+
+    await controller.dispatch_fill(build_fill("slow-order", "m-slow", size=1))
+    await controller.dispatch_fill(build_fill("slow-order", "m-slow", size=2))
+    await controller.dispatch_fill(build_fill("fast-order", "m-fast"))
+    await asyncio.sleep(0.05)
+    # The fast pair finished while the slow hedge is still in flight.
+    assert fast.events == [("start", "fast-order", 1), ("end", "fast-order", 1)]
+    assert slow.events == [("start", "slow-order", 1)]
+
+    await controller.drain_fills()
+    assert slow.events == [
+        ("start", "slow-order", 1),
+        ("end", "slow-order", 1),
+        ("start", "slow-order", 2),
+        ("end", "slow-order", 2),
+    ]
+    assert controller._order_tails == {}
+
+
+@pytest.mark.asyncio
+async def test_dispatch_ignores_unrouted_fills():
+    manager = SlowOrderManager({ExchangeName.OPINION: "m-1"}, {})
+    controller = build_controller({"pair": manager})
+    await controller.dispatch_fills([build_fill("a", "m-unknown"), build_fill("b", "m-1")])
+    await controller.drain_fills()
+    assert manager.events == [("start", "b", 1), ("end", "b", 1)]
+
+
+class OwningOrderManager(SlowOrderManager):
+    def __init__(self, market_map, order_ids):
+        super().__init__(market_map, {})
+        self.order_ids = set(order_ids)
+
+    def owns_order(self, order_id):
+        return order_id in self.order_ids
+
+
+@pytest.mark.asyncio
+async def test_shared_market_routes_fills_to_order_owner():
+    first = OwningOrderManager({ExchangeName.OPINION: "m-shared"}, {"a-1"})
+    second = OwningOrderManager({ExchangeName.OPINION: "m-shared"}, {"b-1"})
+    controller = build_controller({"first": first, "second": second})
+
+    await controller.dispatch_fills([build_fill("b-1", "m-shared"), build_fill("a-1", "m-shared")])
+    await controller.dispatch_fill(build_fill("b-1", "m-shared", size=2))
+    await controller.drain_fills()
+
+    assert first.events == [("start", "a-1", 1), ("end", "a-1", 1)]
+    assert second.events == [
+        ("start", "b-1", 1),
+        ("end", "b-1", 1),
+        ("start", "b-1", 2),
+        ("end", "b-1", 2),
+    ]
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from core.models import ExchangeName, OrderBook, OrderBookEntry
+from core.pair_controller import PairController, PairRuntime
+from core.spread_analyzer import SpreadAnalyzer
+from exchanges.orderbook_cache import OrderbookCache
+from tests.test_pair_controller_accounts import _build_settings
+from utils.config_loader import MarketPairConfig
+from utils.logger import BotLogger
+
+
+def _book(market_id: str, bid: float, ask: float) -> OrderBook:
+    return OrderBook(
+        market_id=market_id,
+        bids=[OrderBookEntry(price=bid, size=10)],
+        asks=[OrderBookEntry(price=ask, size=10)],
+    )
+
+
+def build_controller(cache: OrderbookCache, pair_ids, batch_scan: bool = True) -> PairController:
+    settings = _build_settings()
+    settings.market_data.batch_scan = batch_scan
+    controller = PairController(
+        settings=settings,
+        db=object(),
+        position_tracker=object(),
+        hedger=object(),
+        risk_manager=object(),
+        logger=BotLogger("pair_controller_test"),
+        stop_event=asyncio.Event(),
+        spread_analyzer=SpreadAnalyzer(),
+        orderbook_manager=object(),
+        mapper=None,
+        notifier=None,
+        account_pools={},
+        clients_by_id={},
+        orderbook_cache=cache,
+    )
+    for pair_id in pair_ids:
+        controller._pairs[pair_id] = PairRuntime(
+            pair_id=pair_id,
+            config=MarketPairConfig(
+                event_id=pair_id,
+                primary_market_id=f"{pair_id}-op",
+                secondary_market_id=f"{pair_id}-pm",
+            ),
+            order_manager=None,
+            stop_event=asyncio.Event(),
+            task=None,
+            source="static",
+            size_override=None,
+            fingerprint="",
+            wake=asyncio.Event(),
+        )
+    return controller
+
+
+@pytest.mark.asyncio
+async def test_scan_tick_wakes_only_actionable_or_unquoted_pairs():
+    cache = OrderbookCache(refresh_interval=60)
+    controller = build_controller(cache, ["edge", "flat", "cold"])
+    assert controller._batch_scan
+
+    cache.update(ExchangeName.OPINION, "edge-op", _book("edge-op", 0.40, 0.42))
+    cache.update(ExchangeName.POLYMARKET, "edge-pm", _book("edge-pm", 0.50, 0.52))
+    cache.update(ExchangeName.OPINION, "flat-op", _book("flat-op", 0.49, 0.51))
+    cache.update(ExchangeName.POLYMARKET, "flat-pm", _book("flat-pm", 0.49, 0.51))
+    # "cold" has no cached books yet, so its own loop has to fetch them.
+
+    woken = await controller.scan_tick()
+
+    assert woken == ["edge", "cold"]
+    assert controller._pairs["edge"].wake.is_set()
+    assert controller._pairs["cold"].wake.is_set()
+    assert not controller._pairs["flat"].wake.is_set()
+    assert [entry.pair_id for entry in await controller.scan_opportunities()] == ["edge"]
+
+
+def test_batch_scan_is_off_unless_configured():
+    controller = build_controller(OrderbookCache(refresh_interval=60), ["edge"], batch_scan=False)
+    assert not controller._batch_scan
@@ -0,0 +1,205 @@
+import asyncio
+
+import pytest
+
+from core.models import ExchangeName, OrderBook, OrderBookEntry
+from exchanges.orderbook_cache import OrderbookCache
+from exchanges.polymarket_ws import PolymarketMarketFeed
+
+
+class RestStub:
+    def __init__(self):
+        self.calls = []
+
+    async def get_orderbook(self, market_id: str) -> OrderBook:
+        self.calls.append(market_id)
+        return OrderBook(
+            market_id=market_id,
+            bids=[OrderBookEntry(price=0.47, size=30)],
+            asks=[OrderBookEntry(price=0.49, size=30)],
+        )
+
+
+def _snapshot(ts: int = 100):
+    return {
+        "event_type": "book",
+        "asset_id": "tok",
+        "timestamp": str(ts),
+        "bids": [{"price": "0.45", "size": "10"}, {"price": "0.44", "size": "5"}],
+        "asks": [{"price": "0.50", "size": "20"}],
+    }
+
+
+@pytest.mark.asyncio
+async def test_snapshot_and_deltas_update_cache():
+    cache = OrderbookCache()
+    feed = PolymarketMarketFeed(session=None, rest_client=RestStub(), orderbook_cache=cache)
+    await feed.subscribe(["tok"])
+    updates = []
+    feed.add_listener(lambda book: updates.append(book))
+
+    await feed.handle_message([_snapshot()])
+    await feed.handle_message(
+        {
+            "event_type": "price_change",
+            "asset_id": "tok",
+            "timestamp": "101",
+            "changes": [
+                {"price": "0.46", "side": "BUY", "size": "7"},
+                {"price": "0.50", "side": "SELL", "size": "0"},
+                {"price": "0.52", "side": "SELL", "size": "4"},
+            ],
+        }
+    )
+
+    book = cache.get(ExchangeName.POLYMARKET, "tok").orderbook
+    assert [level.price for level in book.bids] == [0.46, 0.45, 0.44]
+    assert [(level.price, level.size) for level in book.asks] == [(0.52, 4.0)]
+    assert len(updates) == 2
+
+
+@pytest.mark.asyncio
+async def test_gap_falls_back_to_rest_snapshot():
+    rest = RestStub()
+    feed = PolymarketMarketFeed(session=None, rest_client=rest)
+    await feed.subscribe(["tok"])
+
+    # delta without a base snapshot
+    await feed.handle_message(
+        {"event_type": "price_change", "asset_id": "tok", "timestamp": "5", "changes": []}
+    )
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert rest.calls == ["tok"]
+    assert feed.get_orderbook("tok").bids[0].price == 0.47
+
+    # out-of-order delta after a newer snapshot
+    await feed.handle_message(_snapshot(ts=200))
+    await feed.handle_message(
+        {"event_type": "price_change", "asset_id": "tok", "timestamp": "150", "changes": []}
+    )
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert rest.calls == ["tok", "tok"]
+    assert feed.metrics["resyncs"] == 2
+
+
+@pytest.mark.asyncio
+async def test_venue_best_price_mismatch_triggers_resync():
+    rest = RestStub()
+    feed = PolymarketMarketFeed(session=None, rest_client=rest)
+    await feed.subscribe(["tok"])
+    await feed.handle_message(_snapshot())
+    await feed.handle_message(
+        {
+            "event_type": "price_change",
+            "market": "0xcond",
+            "timestamp": "101",
+            "price_changes": [
+                {"asset_id": "tok", "price": "0.46", "side": "BUY", "size": "1", "best_bid": "0.48", "best_ask": "0.5"}
+            ],
+        }
+    )
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert rest.calls == ["tok"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_side_is_not_applied_to_asks():
+    rest = RestStub()
+    feed = PolymarketMarketFeed(session=None, rest_client=rest)
+    await feed.subscribe(["tok"])
+    await feed.handle_message(_snapshot())
+    await feed.handle_message(
+        {
+            "event_type": "price_change",
+            "asset_id": "tok",
+            "timestamp": "101",
+            "changes": [{"price": "0.50", "side": "", "size": "0"}],
+        }
+    )
+    assert feed.get_orderbook("tok") is None
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert rest.calls == ["tok"]
+    assert feed.get_orderbook("tok").asks[0].price == 0.49
+
+
+@pytest.mark.asyncio
+async def test_unsubscribe_is_reference_counted():
+    feed = PolymarketMarketFeed(session=None, rest_client=RestStub())
+    sent = []
+
+    async def record(payload):
+        sent.append(payload)
+
+    feed.ws.send = record
+    await feed.subscribe(["tok", "other"])
+    await feed.subscribe(["tok"])
+    await feed.unsubscribe(["tok", "other"])
+    assert sent[-1] == {"assets_ids": ["other"], "operation": "unsubscribe"}
+    assert feed.ws._subscriptions == [{"type": "market", "assets_ids": ["tok"]}]
+
+    await feed.handle_message(_snapshot())
+    assert feed.get_orderbook("tok") is not None
+    await feed.unsubscribe(["tok"])
+    assert sent[-1] == {"assets_ids": ["tok"], "operation": "unsubscribe"}
+    assert feed.get_orderbook("tok") is None
+    assert feed.ws._subscriptions == []
+    assert len(sent) == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_subscribe_send_is_rolled_back():
+    feed = PolymarketMarketFeed(session=None, rest_client=RestStub())
+
+    async def broken_send(payload):
+        raise ConnectionError("socket closed")
+
+    await feed.subscribe(["tok"])
+    feed.ws.send = broken_send
+    with pytest.raises(ConnectionError):
+        await feed.subscribe(["tok", "other"])
+
+    assert feed._refs == {"tok": 1}
+    assert list(feed._books) == ["tok"]
+    assert feed.ws._subscriptions == [{"type": "market", "assets_ids": ["tok"]}]
+
+
+@pytest.mark.asyncio
+async def test_reconnect_marks_books_unsynced():
+    feed = PolymarketMarketFeed(session=None, rest_client=RestStub())
+    await feed.subscribe(["tok"])
+    await feed.handle_message(_snapshot())
+    assert feed.get_orderbook("tok") is not None
+
+    feed.ws._notify_connection(False)
+    assert feed.get_orderbook("tok") is None
+    await feed.handle_message(_snapshot(ts=200))
+    assert feed.get_orderbook("tok") is not None
+
+
+class IncidentDB:
+    def __init__(self):
+        self.incidents = []
+
+    async def record_incident(self, level, message, details):
+        self.incidents.append((level, message, details))
+
+
+@pytest.mark.asyncio
+async def test_dead_listen_task_is_recorded_as_incident():
+    db = IncidentDB()
+    feed = PolymarketMarketFeed(session=None, rest_client=RestStub(), database=db)
+
+    async def broken_listen():
+        raise ConnectionError("websocket retries exhausted")
+
+    feed.ws.listen = broken_listen
+    await feed.start()
+    await asyncio.sleep(0.01)
+
+    assert db.incidents == [("ERROR", "market_feed_stopped", {"error": "websocket retries exhausted"})]
+    assert feed._task is None
+    await feed.close()
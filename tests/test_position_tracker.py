@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from core.exposure_ledger import ExposureLedger
+from core.models import ExchangeName, Fill, Order, OrderSide, OrderStatus, OrderType
+from core.position_tracker import PositionTracker
+from utils.config_loader import DatabaseConfig
+from utils.db import Database
+from utils.db_migrations import apply_migrations
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def build_fill(order_id: str, market_id: str, side: OrderSide, size: float, ts: datetime) -> Fill:
+    return Fill(
+        order_id=order_id,
+        market_id=market_id,
+        exchange=ExchangeName.OPINION,
+        side=side,
+        price=0.5,
+        size=size,
+        fee=0.0,
+        timestamp=ts,
+    )
+
+
+class RecordingDB:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.writes = []
+
+    async def upsert_position(self, event_id, net, price):
+        if self.fail:
+            raise RuntimeError("db down")
+        self.writes.append((event_id, net, price))
+
+    async def upsert_positions_bulk(self, rows):
+        for row in rows:
+            await self.upsert_position(*row)
+
+    async def get_position(self, event_id):
+        return None
+
+
+@pytest.mark.asyncio
+async def test_fill_burst_is_coalesced_into_one_write_per_event():
+    db = RecordingDB()
+    tracker = PositionTracker(db, flush_interval_sec=60)
+    for _ in range(5):
+        await tracker.add_fill("evt-a", 2, 0.4, OrderSide.BUY)
+    await tracker.add_fill("evt-b", 3, 0.6, OrderSide.SELL)
+
+    assert db.writes == []
+    assert await tracker.get_net_position("evt-a") == 10
+    assert tracker.pending() == 2
+
+    assert await tracker.flush() == 2
+    assert sorted(db.writes) == [("evt-a", 10, 0.4), ("evt-b", -3, 0.6)]
+    assert await tracker.flush() == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_events_dirty_until_close():
+    db = RecordingDB(fail=True)
+    tracker = PositionTracker(db, flush_interval_sec=60)
+    await tracker.add_fill("evt", 4, 0.5, OrderSide.BUY)
+    assert await tracker.flush() == 0
+    assert tracker.pending() == 1
+
+    db.fail = False
+    await tracker.add_fill("evt", 1, 0.55, OrderSide.BUY)
+    await tracker.close()
+    assert db.writes == [("evt", 5, 0.55)]
+    assert tracker.metrics["flush_failures"] == 1
+
+
+
+class BlockingDB(RecordingDB):
+    def __init__(self):
+        super().__init__()
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def upsert_position(self, event_id, net, price):
+        self.started.set()
+        await self.release.wait()
+        await super().upsert_position(event_id, net, price)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_flush_keeps_events_dirty():
+    db = BlockingDB()
+    tracker = PositionTracker(db, flush_interval_sec=60)
+    await tracker.add_fill("evt", 4, 0.5, OrderSide.BUY)
+    flushing = asyncio.create_task(tracker.flush())
+    await db.started.wait()
+    flushing.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await flushing
+    assert tracker.pending() == 1
+
+    db.release.set()
+    assert await tracker.flush() == 1
+    assert db.writes == [("evt", 4, 0.5)]
+
+
+@pytest.mark.asyncio
+async def test_close_waits_for_in_flight_loop_flush():
+    db = BlockingDB()
+    tracker = PositionTracker(db, flush_interval_sec=0.01)
+    tracker.start()
+    await tracker.add_fill("evt", 4, 0.5, OrderSide.BUY)
+    await db.started.wait()
+
+    closing = asyncio.create_task(tracker.close())
+    await asyncio.sleep(0.02)
+    assert not closing.done()
+    db.release.set()
+    await closing
+
+    assert db.writes == [("evt", 4, 0.5)]
+    assert tracker.pending() == 0
+
+@pytest.mark.asyncio
+async def test_positions_recovered_from_fills_after_crash(tmp_path):
+    config = DatabaseConfig(backend="sqlite", dsn=f"sqlite+aiosqlite:///{tmp_path / 'positions.db'}")
+    await apply_migrations(config, base_path=PROJECT_ROOT)
+    db = Database(config)
+    await db.init()
+    now = datetime.now(tz=timezone.utc)
+    try:
+        for order_id, market_id, side in (("o-1", "m-1", OrderSide.BUY), ("o-2", "m-2", OrderSide.SELL)):
+            await db.save_order(
+                Order(
+                    order_id=order_id,
+                    client_order_id=f"cid-{order_id}",
+                    market_id=market_id,
+                    exchange=ExchangeName.OPINION,
+                    side=side,
+                    order_type=OrderType.LIMIT,
+                    price=0.5,
+                    size=10.0,
+                    filled_size=0.0,
+                    status=OrderStatus.OPEN,
+                    created_at=now,
+                )
+            )
+        await db.save_fills_bulk(
+            [
+                build_fill("o-1", "m-1", OrderSide.BUY, 6.0, now),
+                build_fill("o-1", "m-1", OrderSide.BUY, 2.0, now + timedelta(seconds=1)),
+                build_fill("o-2", "m-2", OrderSide.SELL, 3.0, now),
+                # Hedge market orders are not saved to ``orders``; the fill carries its market.
+                build_fill("h-1", "m-2", OrderSide.SELL, 1.0, now),
+            ]
+        )
+        # Only the first fill was flushed before the crash.
+        await db.upsert_position("evt", 6.0, 0.5)
+
+        ledger = ExposureLedger()
+        await ledger.rebuild(db, market_events={"m-1": "evt", "m-2": "evt"})
+    finally:
+        await db.close()
+
+    assert ledger.net_position("evt") == 4.0
+
+
+@pytest.mark.asyncio
+async def test_unattributed_fills_keep_stored_positions(tmp_path):
+    config = DatabaseConfig(backend="sqlite", dsn=f"sqlite+aiosqlite:///{tmp_path / 'positions.db'}")
+    await apply_migrations(config, base_path=PROJECT_ROOT)
+    db = Database(config)
+    await db.init()
+    now = datetime.now(tz=timezone.utc)
+    try:
+        await db.save_fills_bulk([build_fill("h-1", "m-1", OrderSide.BUY, 2.0, now)])
+        # A row written before fills carried their market, for an order that was never saved.
+        await db._execute(
+            "INSERT INTO fills (order_id, exchange, fill_id, size, price, side, ts) "
+            "VALUES ('h-0', 'OPINION', NULL, '3', '0.5', 'BUY', :ts)",
+            {"ts": now.isoformat()},
+        )
+        await db.upsert_position("evt", 5.0, 0.5)
+
+        ledger = ExposureLedger()
+        await ledger.rebuild(db, market_events={"m-1": "evt"})
+    finally:
+        await db.close()
+
+    assert ledger.net_position("evt") == 5.0
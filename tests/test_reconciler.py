@@ -1,16 +1,20 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 
 import pytest
 
 from core.models import ExchangeName, Fill, OrderSide
 from exchanges.reconciliation import Reconciler
+from utils.config_loader import DatabaseConfig
+from utils.db import Database
+from utils.db_migrations import apply_migrations
 
 
 class DummyDB:
-    async def fetch_fill_keys(self):
+    async def fetch_fill_keys(self, since=None):
         return set()
 
 
@@ -83,3 +87,146 @@ async def test_reconciler_skips_duplicates():
     await reconciler.stop()
 
     assert processed == ["dup"]
+
+
+@pytest.mark.asyncio
+async def test_poll_cycle_is_dispatched_as_one_batch():
+    fills = [build_fill(f"ord-{idx}", ExchangeName.POLYMARKET) for idx in range(3)]
+    batches = []
+    singles = []
+
+    async def consumer(f):
+        singles.append(f.order_id)
+
+    async def batch_consumer(batch):
+        batches.append([f.order_id for f in batch])
+
+    reconciler = Reconciler(DummyDB(), consumer, batch_handler=batch_consumer)
+    reconciler.register_poller(DummyPollClient([fills + [fills[0]]]), 0.05)
+    await reconciler.start()
+    await asyncio.sleep(0.02)
+    await reconciler.stop()
+
+    assert batches == [["ord-0", "ord-1", "ord-2"]]
+    assert singles == []
+    assert reconciler.metrics["duplicates"] == 1
+
+
+class CursorDB(DummyDB):
+    def __init__(self, cursor=None):
+        self.cursor = cursor
+        self.saved = []
+
+    async def get_poll_cursor(self, exchange, account_id):
+        return self.cursor
+
+    async def save_poll_cursor(self, exchange, account_id, last_ts, last_trade_id=None):
+        self.saved.append((exchange, account_id, last_ts, last_trade_id))
+
+
+class RecordingPollClient(DummyPollClient):
+    def __init__(self, batches):
+        super().__init__(batches)
+        self.since_values = []
+
+    async def fetch_user_trades(self, since=None):
+        self.since_values.append(since)
+        return await super().fetch_user_trades(since=since)
+
+
+@pytest.mark.asyncio
+async def test_poller_resumes_from_persisted_cursor():
+    old = build_fill("ord-old", ExchangeName.POLYMARKET)
+    new = build_fill("ord-new", ExchangeName.POLYMARKET)
+    new.timestamp = old.timestamp.replace(microsecond=0) + timedelta(seconds=5)
+    cursor_ts = old.timestamp.timestamp()
+    db = CursorDB({"last_ts": cursor_ts, "last_trade_id": "ord-old"})
+    processed = []
+
+    async def consumer(f):
+        processed.append(f.order_id)
+
+    client = RecordingPollClient([[old, new]])
+    reconciler = Reconciler(db, consumer)
+    reconciler.register_poller(client, 0.05, exchange=ExchangeName.POLYMARKET, account_id="acc-1")
+    await reconciler.start()
+    await asyncio.sleep(0.08)
+    await reconciler.stop()
+
+    assert processed == ["ord-new"]
+    assert client.since_values[0] == cursor_ts
+    assert client.since_values[1] == new.timestamp.timestamp()
+    assert db.saved == [("Polymarket", "acc-1", new.timestamp.timestamp(), "ord-new")]
+
+
+@pytest.mark.asyncio
+async def test_cursor_waits_for_scheduled_fill_work():
+    fills = [build_fill(f"ord-{idx}", ExchangeName.POLYMARKET) for idx in range(2)]
+    db = CursorDB()
+    release = asyncio.Event()
+    handled = []
+
+    async def work(batch):
+        await release.wait()
+        handled.extend(f.order_id for f in batch)
+
+    async def batch_consumer(batch):
+        # Like PairController.dispatch_fills: schedule the work and return the tasks.
+        return [asyncio.create_task(work(batch))]
+
+    reconciler = Reconciler(db, batch_consumer, batch_handler=batch_consumer)
+    reconciler.register_poller(DummyPollClient([fills]), 0.05, exchange=ExchangeName.POLYMARKET, account_id="acc-1")
+    await reconciler.start()
+    await asyncio.sleep(0.02)
+    assert handled == []
+    assert db.saved == []
+
+    release.set()
+    await asyncio.sleep(0.02)
+    await reconciler.stop()
+    assert handled == ["ord-0", "ord-1"]
+    assert len(db.saved) == 1
+
+
+
+@pytest.mark.asyncio
+async def test_failed_fill_work_holds_cursor_and_is_redelivered():
+    fills = [build_fill(f"ord-{idx}", ExchangeName.POLYMARKET) for idx in range(2)]
+    db = CursorDB()
+    attempts = []
+
+    async def work(batch):
+        attempts.append([f.order_id for f in batch])
+        if len(attempts) == 1:
+            raise ConnectionError("hedge venue unreachable")
+
+    async def batch_consumer(batch):
+        return [asyncio.create_task(work(batch))]
+
+    client = RecordingPollClient([fills, fills])
+    reconciler = Reconciler(db, batch_consumer, batch_handler=batch_consumer)
+    reconciler.register_poller(client, 0.02, exchange=ExchangeName.POLYMARKET, account_id="acc-1")
+    await reconciler.start()
+    await asyncio.sleep(0.1)
+    await reconciler.stop()
+
+    assert attempts == [["ord-0", "ord-1"], ["ord-0", "ord-1"]]
+    assert client.since_values[:2] == [None, None]
+    assert reconciler.metrics["failed_batches"] == 1
+    assert len(db.saved) == 1
+
+@pytest.mark.asyncio
+async def test_poll_cursor_roundtrip_sqlite(tmp_path):
+    config = DatabaseConfig(backend="sqlite", dsn=f"sqlite+aiosqlite:///{tmp_path / 'cursor.db'}")
+    await apply_migrations(config, base_path=Path(__file__).resolve().parent.parent)
+    db = Database(config)
+    await db.init()
+    try:
+        assert await db.get_poll_cursor("Polymarket", "acc-1") is None
+        await db.save_poll_cursor("Polymarket", "acc-1", 100.5, "t-1")
+        await db.save_poll_cursor("Polymarket", "acc-1", 200.25, "t-2")
+        row = await db.get_poll_cursor("Polymarket", "acc-1")
+        assert row["last_ts"] == 200.25
+        assert row["last_trade_id"] == "t-2"
+    finally:
+        await db.close()
@@ -1,5 +1,7 @@
 import pytest
 
+from core.balance_service import BalanceService
+from core.exceptions import RiskCheckError
 from core.risk_manager import RiskManager
 from utils.config_loader import MarketHedgeConfig
 
@@ -29,3 +31,68 @@ async def test_exposure_increment_and_decrement():
 
 
 
+
+
+class CountingExchange:
+    def __init__(self, usdc: float):
+        self.usdc = usdc
+        self.calls = 0
+
+    async def get_balances(self):
+        self.calls += 1
+        return {"USDC": self.usdc}
+
+
+@pytest.mark.asyncio
+async def test_balance_service_caches_and_reserves():
+    service = BalanceService(ttl_sec=60)
+    rm = RiskManager(_cfg(), balance_service=service)
+    exchange = CountingExchange(100)
+
+    await rm.reserve_balance(exchange, "cid-1", 60)
+    await rm.check_balance(exchange, 40)
+    assert exchange.calls == 1
+    # A second pair on the same account cannot commit the same USDC.
+    with pytest.raises(RiskCheckError):
+        await rm.reserve_balance(exchange, "cid-2", 50)
+
+    rm.rekey_reservation("cid-1", "ord-1")
+    rm.release_balance("ord-1")
+    await rm.reserve_balance(exchange, "cid-2", 50)
+    assert exchange.calls == 1
+    assert service.reserved(exchange) == 50
+
+
+@pytest.mark.asyncio
+async def test_fill_consumes_reservation_and_forces_refresh():
+    service = BalanceService(ttl_sec=60)
+    rm = RiskManager(_cfg(), balance_service=service)
+    exchange = CountingExchange(100)
+    await rm.reserve_balance(exchange, "ord-1", 50)
+
+    exchange.usdc = 80  # venue debited a 20 USDC fill
+    rm.consume_balance("ord-1", 20)
+    assert service.reserved(exchange) == 30
+    assert await service.available(exchange) == 50
+    assert exchange.calls == 2
+
+    rm.consume_balance("ord-1", 29.5, final=True)
+    assert service.reserved(exchange) == 0
+
+
+@pytest.mark.asyncio
+async def test_unreleased_reservation_expires():
+    service = BalanceService(ttl_sec=60, reservation_ttl_sec=30)
+    rm = RiskManager(_cfg(), balance_service=service)
+    exchange = CountingExchange(100)
+    await rm.reserve_balance(exchange, "ord-lost", 60)
+    await rm.reserve_balance(exchange, "ord-live", 20)
+
+    # The cancel for ord-lost raised, so nothing ever released it; ord-live keeps filling.
+    for key in ("ord-lost", "ord-live"):
+        service._reservations[key].touched_at -= 31
+    rm.consume_balance("ord-live", 5)
+
+    assert service.reserved(exchange) == 15
+    assert service.snapshot()["expired_reservations"] == 1
+    await rm.reserve_balance(exchange, "ord-next", 80)
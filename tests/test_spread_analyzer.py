@@ -113,3 +113,103 @@ async def test_forced_direction_respected():
     assert scenario
     assert scenario["direction"] == "primary_buy_secondary_sell"
 
+
+
+def _scan_quotes():
+    from core.spread_analyzer import PairQuote
+
+    return [
+        PairQuote("flat", 0.49, 0.51, 0.49, 0.51, size=10),
+        PairQuote("a_to_b", 0.40, 0.45, 0.52, 0.55, size=10, primary_fee=0.01),
+        PairQuote("b_to_a", 0.60, 0.62, 0.40, 0.50, size=5),
+        PairQuote("forced_away", 0.60, 0.62, 0.40, 0.50, size=5, forced_direction=StrategyDirection.A_TO_B),
+        PairQuote("empty_side", None, 0.45, 0.52, None, size=100),
+    ]
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_scan_ranks_pairs_like_evaluate_opportunity(monkeypatch, use_numpy):
+    import core.spread_analyzer as module
+
+    if use_numpy:
+        pytest.importorskip("numpy")
+    monkeypatch.setattr(module, "NUMPY_AVAILABLE", use_numpy)
+    ranked = SpreadAnalyzer().scan(_scan_quotes(), min_spread=0.01)
+
+    assert [entry.pair_id for entry in ranked] == ["empty_side", "a_to_b", "b_to_a"]
+    by_id = {entry.pair_id: entry for entry in ranked}
+    assert by_id["a_to_b"].direction == "primary_buy_secondary_sell"
+    assert by_id["a_to_b"].net_per_unit == pytest.approx(0.52 - 0.45 * 1.01)
+    assert by_id["b_to_a"].direction == "secondary_buy_primary_sell"
+    assert by_id["b_to_a"].net_total == pytest.approx(0.5)
+    assert (by_id["empty_side"].buy_price, by_id["empty_side"].sell_price) == (0.45, 0.52)
+
+
+@pytest.mark.asyncio
+async def test_depth_aware_sizing_stops_where_edge_runs_out():
+    analyzer = SpreadAnalyzer(depth_aware=True)
+    primary = OrderBook(
+        market_id="primary",
+        bids=[OrderBookEntry(price=0.30, size=100)],
+        asks=[OrderBookEntry(price=0.40, size=5), OrderBookEntry(price=0.45, size=10), OrderBookEntry(price=0.60, size=50)],
+    )
+    secondary = OrderBook(
+        market_id="secondary",
+        bids=[OrderBookEntry(price=0.55, size=8), OrderBookEntry(price=0.50, size=20)],
+        asks=[OrderBookEntry(price=0.70, size=100)],
+    )
+    scenario = await analyzer.evaluate_opportunity(
+        primary_exchange=ExchangeName.OPINION,
+        secondary_exchange=ExchangeName.POLYMARKET,
+        primary_book=primary,
+        secondary_book=secondary,
+        primary_fees=None,
+        secondary_fees=None,
+        size=100,
+    )
+    # 5 @ 0.40 and 10 @ 0.45 are bought below the 0.55/0.50 bids; the 0.60 asks are not
+    assert scenario["direction"] == "primary_buy_secondary_sell"
+    assert scenario["size"] == pytest.approx(15)
+    buy_leg = scenario["legs"][ExchangeName.OPINION]
+    sell_leg = scenario["legs"][ExchangeName.POLYMARKET]
+    assert buy_leg["price"] == 0.45 and sell_leg["price"] == 0.50
+    assert buy_leg["vwap"] == pytest.approx((5 * 0.40 + 10 * 0.45) / 15)
+    assert sell_leg["vwap"] == pytest.approx((8 * 0.55 + 7 * 0.50) / 15)
+    assert scenario["net_total"] == pytest.approx(8 * 0.55 + 7 * 0.50 - (5 * 0.40 + 10 * 0.45))
+
+    capped = await analyzer.evaluate_opportunity(
+        primary_exchange=ExchangeName.OPINION,
+        secondary_exchange=ExchangeName.POLYMARKET,
+        primary_book=primary,
+        secondary_book=secondary,
+        primary_fees=None,
+        secondary_fees=None,
+        size=3,
+    )
+    assert capped["size"] == pytest.approx(3)
+
+
+@pytest.mark.asyncio
+async def test_depth_aware_sizing_skips_dust():
+    primary = OrderBook(
+        market_id="primary",
+        bids=[OrderBookEntry(price=0.30, size=100)],
+        asks=[OrderBookEntry(price=0.40, size=0.5), OrderBookEntry(price=0.60, size=50)],
+    )
+    secondary = OrderBook(
+        market_id="secondary",
+        bids=[OrderBookEntry(price=0.55, size=100)],
+        asks=[OrderBookEntry(price=0.70, size=100)],
+    )
+    kwargs = dict(
+        primary_exchange=ExchangeName.OPINION,
+        secondary_exchange=ExchangeName.POLYMARKET,
+        primary_book=primary,
+        secondary_book=secondary,
+        primary_fees=None,
+        secondary_fees=None,
+    )
+    assert await SpreadAnalyzer(depth_aware=True, min_size=5).evaluate_opportunity(size=100, **kwargs) is None
+    # A pair limit below the minimum is still honoured in full.
+    small = await SpreadAnalyzer(depth_aware=True, min_size=5).evaluate_opportunity(size=0.5, **kwargs)
+    assert small["size"] == pytest.approx(0.5)
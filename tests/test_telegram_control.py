@@ -187,6 +187,64 @@ async def test_healthcheck_handles_failures():
     assert results[0].secondary_status in {"OK", "FAIL"}
 
 
+class SlowPassingClient(PassingClient):
+    def __init__(self, delays):
+        super().__init__()
+        self.delays = delays
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_orderbook(self, market_id: str):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(market_id, 0.0))
+            return self.orderbook
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.asyncio
+async def test_healthcheck_fans_out_and_streams_in_pair_order():
+    settings = _settings()
+    pairs = [
+        MarketPairConfig(
+            event_id=f"pair-{idx}",
+            primary_market_id=f"p{idx}",
+            secondary_market_id=f"s{idx}",
+            primary_exchange=ExchangeName.OPINION,
+            secondary_exchange=ExchangeName.POLYMARKET,
+        )
+        for idx in range(6)
+    ]
+    # the first pair is the slowest; later pairs must still be reported after it
+    primary = SlowPassingClient({"p0": 0.1, **{f"p{idx}": 0.02 for idx in range(1, 6)}})
+    primary.rate_limit = type("Limiter", (), {"burst": 2})()
+    secondary = SlowPassingClient({})
+    account_pools = {
+        ExchangeName.OPINION: [type("A", (), {"account_id": "acc-a", "exchange": ExchangeName.OPINION})()],
+        ExchangeName.POLYMARKET: [type("B", (), {"account_id": "acc-b", "exchange": ExchangeName.POLYMARKET})()],
+    }
+    service = HealthcheckService(
+        spread_analyzer=SpreadAnalyzer(),
+        orderbook_manager=OrderbookManager(),
+        account_pools=account_pools,
+        clients_by_id={"acc-a": primary, "acc-b": secondary},
+        fees=settings.fees,
+        logger=BotLogger("healthcheck_test"),
+        max_concurrency=4,
+        pair_timeout=1.0,
+    )
+    started = asyncio.get_running_loop().time()
+    results = [result async for result in service.stream(pairs)]
+    elapsed = asyncio.get_running_loop().time() - started
+
+    assert [result.pair_id for result in results] == [pair.event_id for pair in pairs]
+    assert all(result.primary_status == "OK" for result in results)
+    assert primary.max_in_flight <= 2
+    assert elapsed < 0.1 + 5 * 0.02
+
+
 @pytest.mark.asyncio
 async def test_record_simulated_runs_persists(tmp_path):
     db_file = tmp_path / "sim.db"
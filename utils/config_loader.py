@@ -25,6 +25,8 @@ class MarketHedgeConfig:
     min_quote_size: float = 0.0
     exposure_tolerance: float = 0.0
     ultra_safe: bool = False
+    depth_aware_sizing: bool = False
+    latency_first_hedging: bool = False
 
 
 @dataclass(slots=True)
@@ -43,6 +45,16 @@ class FeeConfig:
 class DatabaseConfig:
     backend: str
     dsn: str
+    write_behind: bool = False
+    write_behind_max_batch: int = 200
+    write_behind_flush_ms: int = 50
+    sqlite_wal: bool = False
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_readers: int = 2
+    pg_pool_min_size: int = 1
+    pg_pool_max_size: int = 10
+    pg_statement_timeout_ms: int = 0
+    pg_statement_cache_size: int = 256
 
 
 @dataclass(slots=True)
@@ -66,6 +78,49 @@ class ExchangeConnectivity:
     poll_interval: float
 
 
+@dataclass(slots=True)
+class MarketDataConfig:
+    shared_orderbook_cache: bool = True
+    refresh_interval_sec: float = 1.0
+    polymarket_ws_enabled: bool = False
+    polymarket_ws_url: str = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+    event_driven: bool = False
+    batch_scan: bool = False
+    min_evaluation_interval_ms: int = 100
+    leg_fetch_timeout_sec: float = 2.0
+    max_leg_skew_ms: int = 2000
+
+
+@dataclass(slots=True)
+class HealthcheckConfig:
+    max_concurrency: int = 8
+    per_pair_timeout_sec: float = 5.0
+    cache_freshness_sec: float = 2.0
+    chunk_size: int = 10
+
+
+@dataclass(slots=True)
+class BalanceConfig:
+    cached: bool = False
+    ttl_sec: float = 5.0
+    refresh_interval_sec: float = 2.0
+    reservation_ttl_sec: float = 300.0
+
+
+@dataclass(slots=True)
+class HttpConfig:
+    limit: int = 100
+    limit_per_host: int = 8
+    keepalive_timeout_sec: float = 60.0
+    ttl_dns_cache_sec: int = 300
+    request_timeout_sec: float = 30.0
+
+
+@dataclass(slots=True)
+class PositionsConfig:
+    flush_interval_sec: float = 1.0
+
+
 @dataclass(slots=True)
 class GoogleSheetsConfig:
     enabled: bool = False
@@ -134,6 +189,11 @@ class Settings:
     market_pairs: List[MarketPairConfig]
     connectivity: Dict[ExchangeName, ExchangeConnectivity]
     event_discovery: EventDiscoveryConfig = field(default_factory=EventDiscoveryConfig)
+    market_data: MarketDataConfig = field(default_factory=MarketDataConfig)
+    healthcheck: HealthcheckConfig = field(default_factory=HealthcheckConfig)
+    balances: BalanceConfig = field(default_factory=BalanceConfig)
+    positions: PositionsConfig = field(default_factory=PositionsConfig)
+    http: HttpConfig = field(default_factory=HttpConfig)
 
 
 class ConfigLoader:
@@ -220,6 +280,8 @@ class ConfigLoader:
             min_quote_size=float(market_cfg.get("min_quote_size", 0.0)),
             exposure_tolerance=float(market_cfg.get("exposure_tolerance", 0.0)),
             ultra_safe=bool(market_cfg.get("ultra_safe", False)),
+            depth_aware_sizing=bool(market_cfg.get("depth_aware_sizing", False)),
+            latency_first_hedging=bool(market_cfg.get("latency_first_hedging", False)),
         )
 
         exchanges = ExchangeRoutingConfig(
@@ -238,6 +300,16 @@ class ConfigLoader:
         database = DatabaseConfig(
             backend=db_cfg.get("backend", "sqlite"),
             dsn=db_cfg.get("dsn", "sqlite+aiosqlite:///market_hedge.db"),
+            write_behind=bool(db_cfg.get("write_behind", False)),
+            write_behind_max_batch=int(db_cfg.get("write_behind_max_batch", 200)),
+            write_behind_flush_ms=int(db_cfg.get("write_behind_flush_ms", 50)),
+            sqlite_wal=bool(db_cfg.get("sqlite_wal", False)),
+            sqlite_synchronous=str(db_cfg.get("sqlite_synchronous", "NORMAL")),
+            sqlite_readers=int(db_cfg.get("sqlite_readers", 2)),
+            pg_pool_min_size=int(db_cfg.get("pg_pool_min_size", 1)),
+            pg_pool_max_size=int(db_cfg.get("pg_pool_max_size", 10)),
+            pg_statement_timeout_ms=int(db_cfg.get("pg_statement_timeout_ms", 0)),
+            pg_statement_cache_size=int(db_cfg.get("pg_statement_cache_size", 256)),
         )
 
         rate_limits: Dict[str, RateLimitConfig] = {}
@@ -339,6 +411,52 @@ class ConfigLoader:
             poll_interval_sec=int(event_cfg.get("poll_interval_sec", 300)),
         )
 
+        market_data_cfg = raw.get("market_data", {})
+        market_data = MarketDataConfig(
+            shared_orderbook_cache=bool(market_data_cfg.get("shared_orderbook_cache", True)),
+            refresh_interval_sec=float(market_data_cfg.get("refresh_interval_sec", 1.0)),
+            polymarket_ws_enabled=bool(market_data_cfg.get("polymarket_ws_enabled", False)),
+            polymarket_ws_url=str(
+                market_data_cfg.get(
+                    "polymarket_ws_url",
+                    "wss://ws-subscriptions-clob.polymarket.com/ws/market",
+                )
+            ),
+            event_driven=bool(market_data_cfg.get("event_driven", False)),
+            batch_scan=bool(market_data_cfg.get("batch_scan", False)),
+            min_evaluation_interval_ms=int(market_data_cfg.get("min_evaluation_interval_ms", 100)),
+            leg_fetch_timeout_sec=float(market_data_cfg.get("leg_fetch_timeout_sec", 2.0)),
+            max_leg_skew_ms=int(market_data_cfg.get("max_leg_skew_ms", 2000)),
+        )
+
+        healthcheck_cfg = raw.get("healthcheck", {})
+        healthcheck = HealthcheckConfig(
+            max_concurrency=int(healthcheck_cfg.get("max_concurrency", 8)),
+            per_pair_timeout_sec=float(healthcheck_cfg.get("per_pair_timeout_sec", 5.0)),
+            cache_freshness_sec=float(healthcheck_cfg.get("cache_freshness_sec", 2.0)),
+            chunk_size=int(healthcheck_cfg.get("chunk_size", 10)),
+        )
+
+        balances_cfg = raw.get("balances", {})
+        balances = BalanceConfig(
+            cached=bool(balances_cfg.get("cached", False)),
+            ttl_sec=float(balances_cfg.get("ttl_sec", 5.0)),
+            refresh_interval_sec=float(balances_cfg.get("refresh_interval_sec", 2.0)),
+            reservation_ttl_sec=float(balances_cfg.get("reservation_ttl_sec", 300.0)),
+        )
+        positions_cfg = raw.get("positions", {})
+        positions = PositionsConfig(
+            flush_interval_sec=float(positions_cfg.get("flush_interval_sec", 1.0)),
+        )
+        http_cfg = raw.get("http", {})
+        http = HttpConfig(
+            limit=int(http_cfg.get("limit", 100)),
+            limit_per_host=int(http_cfg.get("limit_per_host", 8)),
+            keepalive_timeout_sec=float(http_cfg.get("keepalive_timeout_sec", 60.0)),
+            ttl_dns_cache_sec=int(http_cfg.get("ttl_dns_cache_sec", 300)),
+            request_timeout_sec=float(http_cfg.get("request_timeout_sec", 30.0)),
+        )
+
         return Settings(
             market_hedge_mode=market,
             double_limit_enabled=bool(raw.get("double_limit_enabled", True)),
@@ -354,5 +472,10 @@ class ConfigLoader:
             connectivity=connectivity,
             scheduler_policy=str(raw.get("scheduler", {}).get("policy", "round_robin")).lower(),
             event_discovery=event_discovery,
+            market_data=market_data,
+            healthcheck=healthcheck,
+            balances=balances,
+            positions=positions,
+            http=http,
         )
 
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import asyncio
 import json
+import re
 from datetime import datetime, timezone
 import uuid
 from decimal import Decimal
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple, List
+from contextlib import asynccontextmanager, suppress
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple, List
 from urllib.parse import urlparse
 
 import aiosqlite
@@ -16,6 +19,7 @@ from core.models import (
     DoubleLimitState,
     Order as LegacyOrder,
     OrderStatus,
+    Position,
     Trade as LegacyTrade,
     Fill as LegacyFill,
 )
@@ -34,7 +38,14 @@ class Database:
         self._conn: Optional[aiosqlite.Connection] = None
         self._pool: Optional[asyncpg.Pool] = None
         self._lock = asyncio.Lock()
-        self._in_transaction = False
+        self._in_transaction = False  # SQLite only: the single writer connection is inside BEGIN
+        self._tx_lock = asyncio.Lock()  # SQLite only: one open transaction at a time
+        self._tx_owner: Optional[asyncio.Task] = None
+        self._pg_transactions: Dict[int, Any] = {}
+        self._write_queue: Optional[asyncio.Queue[Tuple[str, Dict[str, Any]]]] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._readers: Optional[asyncio.Queue[aiosqlite.Connection]] = None
+        self._reader_conns: List[aiosqlite.Connection] = []
         self.last_write_ts: Optional[datetime] = None
         self.connected: bool = False
 
@@ -44,14 +55,45 @@ class Database:
             Path(path).parent.mkdir(parents=True, exist_ok=True)
             self._conn = await aiosqlite.connect(path)
             self._conn.row_factory = aiosqlite.Row
+            if self.config.sqlite_wal and path != ":memory:":
+                await self._enable_wal(path)
         elif self.backend in {"postgres", "postgresql"}:
-            self._pool = await asyncpg.create_pool(self.config.dsn)
+            server_settings = {}
+            if self.config.pg_statement_timeout_ms > 0:
+                server_settings["statement_timeout"] = str(self.config.pg_statement_timeout_ms)
+            max_size = max(1, self.config.pg_pool_max_size)
+            self._pool = await asyncpg.create_pool(
+                self.config.dsn,
+                min_size=min(max(0, self.config.pg_pool_min_size), max_size),
+                max_size=max_size,
+                server_settings=server_settings or None,
+                statement_cache_size=max(0, self.config.pg_statement_cache_size),
+            )
         else:
             raise ValueError(f"Unsupported database backend {self.backend}")
-        self.logger.info("database initialized", backend=self.backend)
+        if self.config.write_behind:
+            self._write_queue = asyncio.Queue(maxsize=max(1000, self.config.write_behind_max_batch * 50))
+            self._writer_task = asyncio.create_task(self._write_behind_loop())
+        self.logger.info("database initialized", backend=self.backend, write_behind=self.config.write_behind)
         self.connected = True
 
+    async def flush(self) -> None:
+        """Wait until every queued write-behind statement has been committed."""
+        if self._write_queue is not None:
+            await self._write_queue.join()
+
     async def close(self) -> None:
+        if self._writer_task:
+            await self.flush()
+            self._writer_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._writer_task
+            self._writer_task = None
+            self._write_queue = None
+        for reader in self._reader_conns:
+            await reader.close()
+        self._reader_conns = []
+        self._readers = None
         if self._conn:
             await self._conn.close()
         if self._pool:
@@ -91,17 +133,28 @@ class Database:
         payload: Dict[str, Any] | None = None,
     ) -> None:
         payload = payload or {}
-        await self._execute(
-            """
-            INSERT INTO order_events (order_id, stage, payload)
-            VALUES (:order_id, :stage, :payload)
-            """,
+        await self._execute_deferred(
+            _INSERT_ORDER_EVENT_SQL,
             {
                 "order_id": order_id,
                 "stage": stage,
                 "payload": json.dumps(payload, default=str),
             },
         )
+
+    async def log_order_events_bulk(self, events: Iterable[Tuple[str, str, Dict[str, Any] | None]]) -> None:
+        rows = [
+            {"order_id": order_id, "stage": stage, "payload": json.dumps(payload or {}, default=str)}
+            for order_id, stage, payload in events
+        ]
+        if not rows:
+            return
+        if self._write_queue is not None:
+            for row in rows:
+                await self._write_queue.put((_INSERT_ORDER_EVENT_SQL, row))
+            return
+        await self._executemany([(_INSERT_ORDER_EVENT_SQL, rows)])
+
     async def save_double_limit_pair(
         self,
         record_id: str,
@@ -211,66 +264,123 @@ class Database:
         order_id: str,
         filled_increment: Decimal,
         fill_record: canon.Fill | LegacyFill,
-    ) -> None:
+    ) -> bool:
+        """Store the fill and add ``filled_increment`` to its order in one atomic write.
+
+        A fill that is already stored (same exchange, order, fill id and timestamp) is skipped, so
+        retries and replays never count it twice. Returns whether the fill was new.
+        """
         fill = _coerce_fill(fill_record)
-        await self._execute(
-            """
-            UPDATE orders
-            SET filled_size = filled_size + :inc
-            WHERE (order_id = :order_id OR client_order_id = :order_id)
-            """,
-            {"inc": str(filled_increment), "order_id": order_id},
-        )
-        await self._execute(
-            """
-            INSERT INTO fills (
-                order_id, exchange, fill_id, size, price, side, ts
-            ) VALUES (
-                :order_id, :exchange, :fill_id, :size, :price, :side, :ts
-            )
-            """,
-            {
-                "order_id": fill.order_id,
-                "exchange": fill.exchange,
-                "fill_id": fill.fill_id,
-                "size": str(fill.size),
-                "price": str(fill.price),
-                "side": fill.side,
-                "ts": fill.ts.isoformat(),
-            },
-        )
+        return await self._store_new_fills([(fill, order_id, filled_increment)]) > 0
+
+    async def save_fills_bulk(self, fills: Sequence[canon.Fill | LegacyFill]) -> None:
+        """Same writes as ``update_order_fill`` for each fill, in one transaction."""
+        records = [_coerce_fill(fill) for fill in fills]
+        if not records:
+            return
+        await self._store_new_fills([(fill, fill.order_id, fill.size) for fill in records])
 
     async def begin_transaction(self):
         if self.backend.startswith("sqlite"):
             assert self._conn is not None
-            await self._conn.execute("BEGIN")
+            # The writer connection is shared, so a second BEGIN waits for the open transaction to end.
+            await self._tx_lock.acquire()
+            try:
+                async with self._lock:
+                    await self._conn.execute("BEGIN")
+            except BaseException:
+                self._tx_lock.release()
+                raise
             self._in_transaction = True
+            self._tx_owner = asyncio.current_task()
             return None
         else:
             assert self._pool is not None
             conn = await self._pool.acquire()
-            await conn.execute("BEGIN")
+            transaction = conn.transaction()
+            await transaction.start()
+            self._pg_transactions[id(conn)] = transaction
             return conn
 
     async def commit_transaction(self, conn=None):
         if self.backend.startswith("sqlite"):
             assert self._conn is not None
-            await self._conn.commit()
-            self._in_transaction = False
+            try:
+                async with self._lock:
+                    try:
+                        await self._conn.commit()
+                    except Exception:
+                        await self._conn.rollback()
+                        raise
+            finally:
+                self._end_transaction()
         else:
             assert conn is not None
-            await conn.execute("COMMIT")
-            await self._pool.release(conn)
+            try:
+                await self._pg_transactions.pop(id(conn)).commit()
+            finally:
+                await self._pool.release(conn)
 
     async def rollback_transaction(self, conn=None):
         if self.backend.startswith("sqlite"):
             assert self._conn is not None
-            await self._conn.rollback()
-            self._in_transaction = False
+            try:
+                async with self._lock:
+                    await self._conn.rollback()
+            finally:
+                self._end_transaction()
         else:
             assert conn is not None
-            await conn.execute("ROLLBACK")
-            await self._pool.release(conn)
+            try:
+                transaction = self._pg_transactions.pop(id(conn), None)
+                if transaction is not None:
+                    await transaction.rollback()
+            finally:
+                await self._pool.release(conn)
+
+    def _end_transaction(self) -> None:
+        if not self._in_transaction:
+            return
+        self._in_transaction = False
+        self._tx_owner = None
+        self._tx_lock.release()
+
+    @asynccontextmanager
+    async def _writer(self):
+        """SQLite writer connection; waits out another task's open transaction so writes never join it."""
+        if self._in_transaction and self._tx_owner is asyncio.current_task():
+            async with self._lock:
+                yield self._conn
+            return
+        async with self._tx_lock:
+            async with self._lock:
+                yield self._conn
+
+    @asynccontextmanager
+    async def _atomic(self):
+        """SQLite writer scope whose statements apply all-or-nothing.
+
+        Outside a transaction the scope commits or rolls back; inside the owner's transaction a
+        savepoint undoes a failed scope without touching the transaction's earlier writes.
+        """
+        async with self._writer() as conn:
+            assert conn is not None
+            if self._in_transaction:
+                await conn.execute("SAVEPOINT atomic_write")
+                try:
+                    yield conn
+                except BaseException:
+                    await conn.execute("ROLLBACK TO SAVEPOINT atomic_write")
+                    await conn.execute("RELEASE SAVEPOINT atomic_write")
+                    raise
+                await conn.execute("RELEASE SAVEPOINT atomic_write")
+                return
+            try:
+                yield conn
+            except BaseException:
+                await conn.rollback()
+                raise
+            await conn.commit()
 
     async def save_trade(self, trade: canon.Trade | LegacyTrade, tx_conn=None) -> None:
         trade = _coerce_trade(trade)
@@ -296,7 +406,9 @@ class Database:
             "ts": trade.ts.isoformat(),
         }
         if tx_conn:
-            await tx_conn.execute(sql, params)
+            formatted, values = self._format_pg(sql, params)
+            await tx_conn.execute(formatted, *values)
+            self.last_write_ts = datetime.now(tz=timezone.utc)
         else:
             await self._execute(sql, params)
 
@@ -314,6 +426,69 @@ class Database:
         )
         return row is not None
 
+    async def upsert_position(self, event_id: str, net_position: float, last_price: Optional[float]) -> None:
+        await self._execute(_UPSERT_POSITION_SQL, _position_params(event_id, net_position, last_price))
+
+    async def upsert_positions_bulk(self, positions: Sequence[Tuple[str, float, Optional[float]]]) -> None:
+        """Same writes as ``upsert_position`` for each ``(event_id, net, last_price)``, in one transaction."""
+        if not positions:
+            return
+        await self._executemany(
+            [(_UPSERT_POSITION_SQL, [_position_params(*position) for position in positions])]
+        )
+
+    async def fill_positions_by_market(self) -> Dict[Optional[str], float]:
+        """Signed filled size per market from the fills table, the durable source for positions.
+
+        Fills stored without a market (older rows) fall back to their order's market; the net of
+        fills that resolve to neither is returned under ``None``.
+        """
+        rows = await self._fetchall(
+            """
+            SELECT COALESCE(f.market_id, o.market_id) AS market_id,
+                   SUM(CASE WHEN f.side = 'SELL' THEN -f.size ELSE f.size END) AS net
+            FROM fills f
+            LEFT JOIN orders o
+              ON o.exchange = f.exchange
+             AND COALESCE(o.order_id, o.client_order_id) = f.order_id
+            GROUP BY COALESCE(f.market_id, o.market_id)
+            """,
+            {},
+        )
+        return {
+            (str(row["market_id"]) if row["market_id"] is not None else None): float(row["net"] or 0.0)
+            for row in rows
+        }
+
+    async def get_position(self, event_id: str) -> Optional[Position]:
+        row = await self._fetchone(
+            "SELECT event_id, net_position, last_price, updated_at FROM positions WHERE event_id = :event_id",
+            {"event_id": event_id},
+        )
+        if not row:
+            return None
+        return Position(
+            event_id=row["event_id"],
+            net_position=float(row["net_position"]),
+            last_price=float(row["last_price"]) if row.get("last_price") is not None else None,
+            updated_at=_parse_ts(row.get("updated_at")),
+        )
+
+    async def list_positions(self) -> Dict[str, float]:
+        rows = await self._fetchall("SELECT event_id, net_position FROM positions", {})
+        return {row["event_id"]: float(row["net_position"]) for row in rows}
+
+    async def list_open_orders(self) -> List[Dict[str, Any]]:
+        """Orders still resting on a venue, for rebuilding exposure after a restart."""
+        return await self._fetchall(
+            """
+            SELECT COALESCE(order_id, client_order_id) AS order_ref, market_id, size, filled_size
+            FROM orders
+            WHERE status IN ('PENDING', 'OPEN', 'PARTIALLY_FILLED')
+            """,
+            {},
+        )
+
     async def list_fill_records(self):
         return await self._fetchall("SELECT order_id, fill_id, ts, size FROM fills", {})
 
@@ -324,7 +499,7 @@ class Database:
         )
 
     async def record_incident(self, level: str, message: str, details: Dict[str, Any]) -> None:
-        await self._execute(
+        await self._execute_deferred(
             """
             INSERT INTO incidents (level, message, details)
             VALUES (:level, :message, :details)
@@ -340,39 +515,58 @@ class Database:
         expected_pnl: Optional[float],
         notes: str | None = None,
     ) -> str:
-        record_id = uuid.uuid4().hex
-        await self._execute(
-            """
-            INSERT INTO simulated_runs (id, ts, pair_id, size, plan_json, expected_pnl, notes)
-            VALUES (:id, :ts, :pair_id, :size, :plan_json, :expected_pnl, :notes)
-            """,
+        return (await self.record_simulated_runs_bulk([(pair_id, size, plan, expected_pnl, notes)]))[0]
+
+    async def record_simulated_runs_bulk(
+        self,
+        runs: Iterable[Tuple[str, float, Dict[str, Any], Optional[float], str | None]],
+    ) -> List[str]:
+        now = datetime.now(tz=timezone.utc).isoformat()
+        rows = [
             {
-                "id": record_id,
-                "ts": datetime.now(tz=timezone.utc).isoformat(),
+                "id": uuid.uuid4().hex,
+                "ts": now,
                 "pair_id": pair_id,
                 "size": size,
                 "plan_json": json.dumps(plan, default=str),
                 "expected_pnl": expected_pnl,
                 "notes": notes,
-            },
-        )
-        return record_id
+            }
+            for pair_id, size, plan, expected_pnl, notes in runs
+        ]
+        if len(rows) == 1:
+            await self._execute(_INSERT_SIMULATED_RUN_SQL, rows[0])
+        elif rows:
+            await self._executemany([(_INSERT_SIMULATED_RUN_SQL, rows)])
+        return [row["id"] for row in rows]
 
     def status_snapshot(self) -> Dict[str, Any]:
         return {
             "backend": self.backend,
             "connected": self.connected,
             "last_write": self.last_write_ts.isoformat() if self.last_write_ts else None,
+            "write_queue": self._write_queue.qsize() if self._write_queue is not None else 0,
         }
 
-    async def fetch_fill_keys(self) -> set[str]:
-        rows = await self._fetchall(
-            """
-            SELECT exchange, COALESCE(fill_id, order_id) AS key_part, ts
-            FROM fills
-            """,
-            {},
-        )
+    async def fetch_fill_keys(self, since: Optional[datetime] = None) -> set[str]:
+        """Reconciler dedupe keys, optionally only for fills at or after ``since`` (uses ``idx_fills_ts``)."""
+        if since is None:
+            rows = await self._fetchall(
+                """
+                SELECT exchange, COALESCE(fill_id, order_id) AS key_part, ts
+                FROM fills
+                """,
+                {},
+            )
+        else:
+            rows = await self._fetchall(
+                """
+                SELECT exchange, COALESCE(fill_id, order_id) AS key_part, ts
+                FROM fills
+                WHERE ts >= :since
+                """,
+                {"since": since.isoformat()},
+            )
         keys: set[str] = set()
         for row in rows:
             exchange = row.get("exchange") or ""
@@ -381,69 +575,224 @@ class Database:
             keys.add(f"{exchange}:{key_part}:{ts}")
         return keys
 
+    async def get_poll_cursor(self, exchange: str, account_id: str) -> Optional[Dict[str, Any]]:
+        return await self._fetchone(
+            """
+            SELECT last_ts, last_trade_id
+            FROM poll_cursors
+            WHERE exchange = :exchange AND account_id = :account_id
+            """,
+            {"exchange": exchange, "account_id": account_id},
+        )
+
+    async def save_poll_cursor(
+        self,
+        exchange: str,
+        account_id: str,
+        last_ts: float,
+        last_trade_id: Optional[str] = None,
+    ) -> None:
+        await self._execute(
+            """
+            INSERT INTO poll_cursors (exchange, account_id, last_ts, last_trade_id, updated_at)
+            VALUES (:exchange, :account_id, :last_ts, :last_trade_id, CURRENT_TIMESTAMP)
+            ON CONFLICT (exchange, account_id) DO UPDATE
+            SET last_ts = excluded.last_ts,
+                last_trade_id = excluded.last_trade_id,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            {
+                "exchange": exchange,
+                "account_id": account_id,
+                "last_ts": float(last_ts),
+                "last_trade_id": last_trade_id,
+            },
+        )
+
     async def _execute(self, sql: str, params: Dict[str, Any]) -> None:
-        async with self._lock:
-            if self.backend.startswith("sqlite"):
+        if self.backend.startswith("sqlite"):
+            async with self._writer():
                 assert self._conn is not None
                 await self._conn.execute(sql, params)
                 if not self._in_transaction:
                     await self._conn.commit()
                 self.last_write_ts = datetime.now(tz=timezone.utc)
-            else:
-                assert self._pool is not None
-                formatted, values = self._format_pg(sql, params)
-                async with self._pool.acquire() as conn:
-                    await conn.execute(formatted, *values)
-                self.last_write_ts = datetime.now(tz=timezone.utc)
+        else:
+            # asyncpg's pool already serializes per connection; no process-wide lock.
+            assert self._pool is not None
+            formatted, values = self._format_pg(sql, params)
+            async with self._pool.acquire() as conn:
+                await conn.execute(formatted, *values)
+            self.last_write_ts = datetime.now(tz=timezone.utc)
+
+    async def _executemany(self, statements: Sequence[Tuple[str, Sequence[Dict[str, Any]]]]) -> None:
+        """Run each statement over its rows with executemany, all in a single transaction."""
+        if self.backend.startswith("sqlite"):
+            async with self._atomic() as conn:
+                for sql, rows in statements:
+                    await conn.executemany(sql, rows)
+        else:
+            assert self._pool is not None
+            async with self._pool.acquire() as conn:
+                async with conn.transaction():
+                    for sql, rows in statements:
+                        formatted, mapping = _translate_named(sql)
+                        await conn.executemany(formatted, [tuple(row.get(key) for key in mapping) for row in rows])
+        self.last_write_ts = datetime.now(tz=timezone.utc)
+
+    async def _store_new_fills(self, entries: Sequence[Tuple[canon.Fill, str, Decimal]]) -> int:
+        """Insert each ``(fill, order_id, increment)`` not stored yet and bump its order; returns the count."""
+        stored = 0
+        if self.backend.startswith("sqlite"):
+            async with self._atomic() as conn:
+                for fill, order_id, increment in entries:
+                    params = _fill_params(fill)
+                    cursor = await conn.execute(_FILL_STORED_SQL, params)
+                    exists = await cursor.fetchone() is not None
+                    await cursor.close()
+                    if exists:
+                        continue
+                    await conn.execute(_UPDATE_ORDER_FILL_SQL, {"inc": str(increment), "order_id": order_id})
+                    await conn.execute(_INSERT_FILL_SQL, params)
+                    stored += 1
+        else:
+            assert self._pool is not None
+            async with self._pool.acquire() as conn:
+                async with conn.transaction():
+                    for fill, order_id, increment in entries:
+                        params = _fill_params(fill)
+                        formatted, values = self._format_pg(_FILL_STORED_SQL, params)
+                        if await conn.fetchrow(formatted, *values):
+                            continue
+                        for sql, sql_params in (
+                            (_UPDATE_ORDER_FILL_SQL, {"inc": str(increment), "order_id": order_id}),
+                            (_INSERT_FILL_SQL, params),
+                        ):
+                            formatted, values = self._format_pg(sql, sql_params)
+                            await conn.execute(formatted, *values)
+                        stored += 1
+        self.last_write_ts = datetime.now(tz=timezone.utc)
+        return stored
+
+    async def _execute_deferred(self, sql: str, params: Dict[str, Any]) -> None:
+        """Audit-only writes: queued for a grouped commit when write-behind is on."""
+        if self._write_queue is None:
+            await self._execute(sql, params)
+            return
+        await self._write_queue.put((sql, params))
+
+    async def _write_behind_loop(self) -> None:
+        assert self._write_queue is not None
+        queue = self._write_queue
+        max_batch = max(1, self.config.write_behind_max_batch)
+        window = max(0.0, self.config.write_behind_flush_ms / 1000)
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + window
+            while len(batch) < max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._execute_batch(batch)
+            except Exception as exc:
+                self.logger.warn("write-behind batch failed, retrying row by row", size=len(batch), error=str(exc))
+                for sql, params in batch:
+                    try:
+                        await self._execute(sql, params)
+                    except Exception as row_exc:
+                        self.logger.error("write-behind statement dropped", error=str(row_exc))
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _execute_batch(self, statements: List[Tuple[str, Dict[str, Any]]]) -> None:
+        if self.backend.startswith("sqlite"):
+            # All or nothing, so the row-by-row retry after a failure never re-applies a row.
+            async with self._atomic() as conn:
+                for sql, params in statements:
+                    await conn.execute(sql, params)
+        else:
+            assert self._pool is not None
+            async with self._pool.acquire() as conn:
+                async with conn.transaction():
+                    for sql, params in statements:
+                        formatted, values = self._format_pg(sql, params)
+                        await conn.execute(formatted, *values)
+        self.last_write_ts = datetime.now(tz=timezone.utc)
+
+    async def _enable_wal(self, path: str) -> None:
+        """WAL lets readers run alongside the single writer; reads get their own connections."""
+        assert self._conn is not None
+        synchronous = self.config.sqlite_synchronous.upper()
+        if synchronous not in {"OFF", "NORMAL", "FULL", "EXTRA"}:
+            synchronous = "NORMAL"
+        await self._conn.execute("PRAGMA journal_mode=WAL")
+        await self._conn.execute(f"PRAGMA synchronous={synchronous}")
+        await self._conn.commit()
+        readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        for _ in range(max(0, self.config.sqlite_readers)):
+            reader = await aiosqlite.connect(path)
+            reader.row_factory = aiosqlite.Row
+            await reader.execute("PRAGMA query_only=1")
+            self._reader_conns.append(reader)
+            readers.put_nowait(reader)
+        self._readers = readers if self._reader_conns else None
+
+    async def _read(self, sql: str, params: Dict[str, Any], one: bool):
+        assert self._readers is not None
+        reader = await self._readers.get()
+        try:
+            cursor = await reader.execute(sql, params)
+            try:
+                if one:
+                    row = await cursor.fetchone()
+                    return dict(row) if row else None
+                return [dict(row) for row in await cursor.fetchall()]
+            finally:
+                await cursor.close()
+        finally:
+            self._readers.put_nowait(reader)
 
     async def _fetchone(self, sql: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        async with self._lock:
-            if self.backend.startswith("sqlite"):
+        if self.backend.startswith("sqlite"):
+            # Pool readers cannot see writes inside the writer's open transaction; read through it instead.
+            if self._readers is not None and not self._in_transaction:
+                return await self._read(sql, params, one=True)
+            async with self._lock:
                 assert self._conn is not None
                 cursor = await self._conn.execute(sql, params)
                 row = await cursor.fetchone()
                 return dict(row) if row else None
-            else:
-                assert self._pool is not None
-                formatted, values = self._format_pg(sql, params)
-                async with self._pool.acquire() as conn:
-                    row = await conn.fetchrow(formatted, *values)
-                    return dict(row) if row else None
+        assert self._pool is not None
+        formatted, values = self._format_pg(sql, params)
+        async with self._pool.acquire() as conn:
+            row = await conn.fetchrow(formatted, *values)
+            return dict(row) if row else None
 
     async def _fetchall(self, sql: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
-        async with self._lock:
-            if self.backend.startswith("sqlite"):
+        if self.backend.startswith("sqlite"):
+            if self._readers is not None and not self._in_transaction:
+                return await self._read(sql, params, one=False)
+            async with self._lock:
                 assert self._conn is not None
                 cursor = await self._conn.execute(sql, params)
                 rows = await cursor.fetchall()
                 return [dict(row) for row in rows]
-            else:
-                assert self._pool is not None
-                formatted, values = self._format_pg(sql, params)
-                async with self._pool.acquire() as conn:
-                    rows = await conn.fetch(formatted, *values)
-                    return [dict(row) for row in rows]
+        assert self._pool is not None
+        formatted, values = self._format_pg(sql, params)
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(formatted, *values)
+            return [dict(row) for row in rows]
 
     def _format_pg(self, sql: str, params: Dict[str, Any]) -> Tuple[str, Tuple[Any, ...]]:
-        mapping = []
-        formatted = ""
-        idx = 1
-        i = 0
-        while i < len(sql):
-            if sql[i] == ":":
-                j = i + 1
-                while j < len(sql) and (sql[j].isalnum() or sql[j] == "_"):
-                    j += 1
-                key = sql[i + 1 : j]
-                formatted += f"${idx}"
-                mapping.append(key)
-                idx += 1
-                i = j
-            else:
-                formatted += sql[i]
-                i += 1
-        values = tuple(params.get(key) for key in mapping)
-        return formatted, values
+        formatted, mapping = _translate_named(sql)
+        return formatted, tuple(params.get(key) for key in mapping)
 
     def _sqlite_path(self, dsn: str) -> str:
         if dsn.startswith("sqlite"):
@@ -455,6 +804,64 @@ class Database:
         return dsn
 
 
+_UPDATE_ORDER_FILL_SQL = """
+UPDATE orders
+SET filled_size = filled_size + :inc
+WHERE (order_id = :order_id OR client_order_id = :order_id)
+"""
+
+_INSERT_FILL_SQL = """
+INSERT INTO fills (
+    order_id, exchange, fill_id, size, price, side, ts, market_id
+) VALUES (
+    :order_id, :exchange, :fill_id, :size, :price, :side, :ts, :market_id
+)
+"""
+
+_FILL_STORED_SQL = """
+SELECT 1
+FROM fills
+WHERE order_id = :order_id
+  AND exchange = :exchange
+  AND ts = :ts
+  AND COALESCE(fill_id, '') = COALESCE(:fill_id, '')
+LIMIT 1
+"""
+
+_UPSERT_POSITION_SQL = """
+INSERT INTO positions (event_id, net_position, last_price, updated_at)
+VALUES (:event_id, :net_position, :last_price, CURRENT_TIMESTAMP)
+ON CONFLICT (event_id) DO UPDATE
+SET net_position = excluded.net_position,
+    last_price = excluded.last_price,
+    updated_at = CURRENT_TIMESTAMP
+"""
+
+_INSERT_ORDER_EVENT_SQL = """
+INSERT INTO order_events (order_id, stage, payload)
+VALUES (:order_id, :stage, :payload)
+"""
+
+_INSERT_SIMULATED_RUN_SQL = """
+INSERT INTO simulated_runs (id, ts, pair_id, size, plan_json, expected_pnl, notes)
+VALUES (:id, :ts, :pair_id, :size, :plan_json, :expected_pnl, :notes)
+"""
+
+_NAMED_PARAM = re.compile(r"(?<!:):([A-Za-z0-9_]+)")
+
+
+@lru_cache(maxsize=512)
+def _translate_named(sql: str) -> Tuple[str, Tuple[str, ...]]:
+    """Rewrite ``:name`` placeholders to ``$1..$n`` once per distinct SQL text."""
+    mapping: List[str] = []
+
+    def _replace(match: re.Match) -> str:
+        mapping.append(match.group(1))
+        return f"${len(mapping)}"
+
+    return _NAMED_PARAM.sub(_replace, sql), tuple(mapping)
+
+
 def _coerce_order(order: canon.Order | LegacyOrder) -> canon.Order:
     if isinstance(order, canon.Order):
         return order
@@ -483,6 +890,7 @@ def _coerce_fill(fill: canon.Fill | LegacyFill) -> canon.Fill:
         price=Decimal(str(fill.price)),
         side=fill.side.value,
         ts=fill.timestamp,
+        market_id=fill.market_id,
     )
 
 
@@ -503,8 +911,42 @@ def _coerce_trade(trade: canon.Trade | LegacyTrade) -> canon.Trade:
     )
 
 
+def _fill_params(fill: canon.Fill) -> Dict[str, Any]:
+    return {
+        "order_id": fill.order_id,
+        "exchange": fill.exchange,
+        "fill_id": fill.fill_id,
+        "size": str(fill.size),
+        "price": str(fill.price),
+        "side": fill.side,
+        "ts": fill.ts.isoformat(),
+        "market_id": fill.market_id,
+    }
+
+
+def _position_params(event_id: str, net_position: float, last_price: Optional[float]) -> Dict[str, Any]:
+    return {
+        "event_id": event_id,
+        "net_position": str(net_position),
+        "last_price": _decimal_or_none(last_price),
+    }
+
+
 def _decimal_or_none(value: Optional[Decimal]) -> Optional[str]:
     if value is None:
         return None
     return str(value)
 
+
+
+def _parse_ts(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    if value:
+        try:
+            parsed = datetime.fromisoformat(str(value))
+        except ValueError:
+            parsed = None
+        if parsed is not None:
+            return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    return datetime.now(tz=timezone.utc)
@@ -9,6 +9,7 @@ import aiohttp
 
 from core.models import ContractType, ExchangeName, StrategyDirection
 from utils.config_loader import GoogleSheetsConfig, MarketPairConfig
+from utils.http_session import SessionFactory
 from utils.logger import BotLogger
 
 
@@ -62,8 +63,9 @@ class GoogleSheetsClient:
         config: GoogleSheetsConfig,
         logger: BotLogger | None = None,
         session: aiohttp.ClientSession | None = None,
+        session_factory: SessionFactory | None = None,
     ):
-        self.sync = GoogleSheetsSync(config, logger=logger, session=session)
+        self.sync = GoogleSheetsSync(config, logger=logger, session=session, session_factory=session_factory)
 
     async def fetch_rows(self) -> List[List[str]]:
         return await self.sync._fetch_rows()  # noqa: SLF001 - internal reuse is intentional
@@ -84,9 +86,11 @@ class GoogleSheetsSync:
         config: GoogleSheetsConfig,
         logger: BotLogger | None = None,
         session: aiohttp.ClientSession | None = None,
+        session_factory: SessionFactory | None = None,
     ):
         self.config = config
         self.logger = logger or BotLogger(__name__)
+        self.session_factory = session_factory
         self._session = session
         self._session_owner = session is None
 
@@ -115,10 +119,14 @@ class GoogleSheetsSync:
         if not self.config.sheet_id or not self.config.range:
             raise ValueError("google_sheets requires sheet_id and range")
         session = self._session
-        if session is None:
-            session = aiohttp.ClientSession()
+        if session is None or session.closed:
+            if self.session_factory:
+                session = await self.session_factory.session("sheets.googleapis.com")
+                self._session_owner = False
+            else:
+                session = aiohttp.ClientSession()
+                self._session_owner = True
             self._session = session
-            self._session_owner = True
         url = f"https://sheets.googleapis.com/v4/spreadsheets/{self.config.sheet_id}/values/{self.config.range}"
         headers: Dict[str, str] = {}
         params: Dict[str, str] = {}
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+from utils.config_loader import HttpConfig
+from utils.logger import BotLogger
+
+_SessionKey = Tuple[str, str, bool, bool]
+
+
+class SessionFactory:
+    """Hands out ``aiohttp`` sessions that share one ``TCPConnector`` per (host, proxy).
+
+    Accounts routed through the same proxy to the same venue reuse one warm pool instead of
+    holding their own idle sockets, and keep-alive plus the DNS cache spare repeated TLS
+    handshakes and lookups. Only the pool is shared: every call returns a new session with no
+    cookie jar, so cookies and default headers never leak between accounts. Callers keep the
+    session they were given. Websockets get pools of their own: each holds a socket for its
+    whole life and would otherwise sit on one of the REST pool's ``limit_per_host`` slots.
+    Sessions and pools are owned by the factory: ``close`` releases everything.
+    """
+
+    def __init__(self, config: HttpConfig | None = None, logger: BotLogger | None = None):
+        self.config = config or HttpConfig()
+        self.logger = logger or BotLogger(__name__)
+        self._connectors: Dict[_SessionKey, aiohttp.TCPConnector] = {}
+        self._sessions: Dict[_SessionKey, List[aiohttp.ClientSession]] = {}
+        self._lock = asyncio.Lock()
+
+    async def session(
+        self,
+        host: str,
+        proxy: Optional[str] = None,
+        ssl: bool = True,
+        websocket: bool = False,
+    ) -> aiohttp.ClientSession:
+        """New session for ``host`` (a hostname or venue label) behind ``proxy``, on the shared pool.
+
+        The proxy is still passed per request; it is part of the key so each proxy gets its
+        own pool and ``limit_per_host`` budget. ``websocket`` sessions use a separate pool
+        without a per-host cap or total request timeout.
+        """
+        key: _SessionKey = (host, proxy or "", ssl, websocket)
+        async with self._lock:
+            session = aiohttp.ClientSession(
+                connector=self._connector(key),
+                connector_owner=False,
+                cookie_jar=aiohttp.DummyCookieJar(),
+                timeout=aiohttp.ClientTimeout(total=None if websocket else self.config.request_timeout_sec),
+                trust_env=False,
+            )
+            self._sessions.setdefault(key, []).append(session)
+            self.logger.debug(
+                "created pooled session",
+                host=host,
+                proxy=proxy or "none",
+                websocket=websocket,
+            )
+            return session
+
+    def stats(self) -> List[Dict[str, object]]:
+        """Per-pool connection counts: sockets in use, idle keep-alive sockets and open sessions."""
+        pools: List[Dict[str, object]] = []
+        for key, connector in self._connectors.items():
+            host, proxy, _, websocket = key
+            # aiohttp does not expose pool sizes publicly; read them defensively.
+            idle = sum(len(conns) for conns in getattr(connector, "_conns", {}).values())
+            pools.append(
+                {
+                    "host": host,
+                    "proxy": proxy or "none",
+                    "websocket": websocket,
+                    "users": sum(not session.closed for session in self._sessions.get(key, ())),
+                    "in_use": len(getattr(connector, "_acquired", ())),
+                    "idle": idle,
+                    "limit": connector.limit,
+                    "limit_per_host": connector.limit_per_host,
+                    "closed": connector.closed,
+                }
+            )
+        return pools
+
+    async def close(self) -> None:
+        stats = self.stats()
+        sessions = [session for group in self._sessions.values() for session in group]
+        await asyncio.gather(*(session.close() for session in sessions), return_exceptions=True)
+        await asyncio.gather(*(connector.close() for connector in self._connectors.values()), return_exceptions=True)
+        if stats:
+            self.logger.info(
+                "http pools closed",
+                pools=len(stats),
+                users=sum(int(pool["users"]) for pool in stats),
+                in_use=sum(int(pool["in_use"]) for pool in stats),
+                idle=sum(int(pool["idle"]) for pool in stats),
+            )
+        self._sessions.clear()
+        self._connectors.clear()
+
+    def _connector(self, key: _SessionKey) -> aiohttp.TCPConnector:
+        connector = self._connectors.get(key)
+        if connector is None or connector.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.config.limit,
+                limit_per_host=0 if key[3] else self.config.limit_per_host,
+                keepalive_timeout=self.config.keepalive_timeout_sec,
+                ttl_dns_cache=self.config.ttl_dns_cache_sec,
+                use_dns_cache=True,
+                ssl=key[2],
+            )
+            self._connectors[key] = connector
+        return connector
@@ -7,6 +7,7 @@ import aiohttp
 from yarl import URL
 
 from core.models import AccountCredentials
+from utils.http_session import SessionFactory
 from utils.logger import BotLogger
 
 
@@ -27,10 +28,16 @@ def sanitize_proxy(proxy: Optional[str], logger: BotLogger | None = None) -> Opt
 
 
 class ProxyHandler:
-    """Manages per-account HTTP sessions with optional proxy routing."""
+    """Manages per-account HTTP sessions with optional proxy routing.
 
-    def __init__(self, logger: BotLogger | None = None):
+    Accounts on the same venue behind the same proxy share one connection pool from the
+    ``SessionFactory``; each account keeps its own session on it.
+    """
+
+    def __init__(self, logger: BotLogger | None = None, session_factory: SessionFactory | None = None):
         self.logger = logger or BotLogger(__name__)
+        self.session_factory = session_factory or SessionFactory(logger=self.logger)
+        self._owns_factory = session_factory is None
         self._sessions: Dict[str, aiohttp.ClientSession] = {}
         self._proxies: Dict[str, Optional[str]] = {}
         self._locks: Dict[str, asyncio.Lock] = {}
@@ -41,15 +48,9 @@ class ProxyHandler:
             session = self._sessions.get(account.account_id)
             if session and not session.closed:
                 return session
-            timeout = aiohttp.ClientTimeout(total=30)
-            connector = aiohttp.TCPConnector(limit=100, ssl=False)
-            session = aiohttp.ClientSession(
-                timeout=timeout,
-                connector=connector,
-                trust_env=False,
-            )
             proxy_value = sanitize_proxy(account.proxy, self.logger)
             account.proxy = proxy_value
+            session = await self.session_factory.session(account.exchange.value, proxy_value, ssl=False)
             self._sessions[account.account_id] = session
             self._proxies[account.account_id] = proxy_value
             self.logger.debug(
@@ -63,7 +64,8 @@ class ProxyHandler:
         return self._proxies.get(account_id)
 
     async def close(self) -> None:
-        await asyncio.gather(*(session.close() for session in self._sessions.values()), return_exceptions=True)
+        if self._owns_factory:
+            await self.session_factory.close()
         self._sessions.clear()
         self._proxies.clear()
         self._locks.clear()